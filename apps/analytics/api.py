@@ -0,0 +1,37 @@
+from ninja import Router, Query
+from typing import Dict, List, Optional
+from datetime import date
+from pydantic import BaseModel
+
+from apps.core.auth import AuthBearer
+from .services import AnalyticsService
+
+router = Router()
+
+
+class AnalyticsReportSchema(BaseModel):
+    start_date: date
+    end_date: date
+    dates: List[date]
+    series: Dict[str, List[Optional[float]]]
+    summary: Dict[str, Optional[float]]
+
+
+@router.get("/trends", response=AnalyticsReportSchema, auth=AuthBearer())
+def get_trends(request, days: int = Query(AnalyticsService.DEFAULT_REPORT_DAYS['trends'], ge=7, le=1825)):
+    return AnalyticsService.get_report(request.auth, 'trends', days)
+
+
+@router.get("/weight", response=AnalyticsReportSchema, auth=AuthBearer())
+def get_weight_trend(request, days: int = Query(AnalyticsService.DEFAULT_REPORT_DAYS['weight'], ge=7, le=1825)):
+    return AnalyticsService.get_report(request.auth, 'weight', days)
+
+
+@router.get("/balance", response=AnalyticsReportSchema, auth=AuthBearer())
+def get_calorie_balance(request, days: int = Query(AnalyticsService.DEFAULT_REPORT_DAYS['balance'], ge=7, le=1825)):
+    return AnalyticsService.get_report(request.auth, 'balance', days)
+
+
+@router.get("/correlations", response=AnalyticsReportSchema, auth=AuthBearer())
+def get_correlations(request, days: int = Query(AnalyticsService.DEFAULT_REPORT_DAYS['correlations'], ge=14, le=1825)):
+    return AnalyticsService.get_report(request.auth, 'correlations', days)
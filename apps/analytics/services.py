@@ -0,0 +1,284 @@
+import math
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from django.core.cache import cache
+from django.db.models import Q, Sum
+from django.utils import timezone
+import numpy as np
+import orjson
+import structlog
+
+from apps.core.metrics import CacheMetrics
+
+from apps.food.models import DailySummary
+from apps.sleep.models import SleepLog
+from apps.users.models import User, UserProfile
+from apps.workouts.models import WorkoutLog
+
+logger = structlog.get_logger(__name__)
+
+
+class AnalyticsService:
+    
+    ROLLING_WINDOW = 7
+    # Weight smoothing factor used by classic trend-line diet trackers
+    WEIGHT_ALPHA = 0.1
+    MIN_CORRELATION_POINTS = 5
+    REPORT_CACHE_TTL = 24 * 3600
+    # Windows the API serves when no days are given; the nightly batch precomputes exactly these
+    DEFAULT_REPORT_DAYS = {'trends': 90, 'weight': 180, 'balance': 30, 'correlations': 90}
+    
+    @staticmethod
+    def get_report(user: User, report: str, days: int) -> Dict:
+        start_date, end_date = AnalyticsService._report_range(days)
+        cache_key = AnalyticsService._cache_key(user.id, report, end_date, days)
+        
+        cached = cache.get(cache_key)
+        if cached is not None:
+            CacheMetrics.hit('analytics')
+            return orjson.loads(cached)
+        
+        CacheMetrics.miss('analytics')
+        series = AnalyticsService.load_series(user, start_date, end_date)
+        tdee = AnalyticsService.get_tdee(user) if report == 'balance' else None
+        result = AnalyticsService._build_report(report, series, start_date, end_date, tdee)
+        
+        cache.set(cache_key, orjson.dumps(result), AnalyticsService.REPORT_CACHE_TTL)
+        
+        return result
+    
+    @staticmethod
+    def warm_reports(user_ids: List[int]) -> int:
+        # One batch load over the longest default window; every shorter report is a tail slice of it
+        start_date, end_date = AnalyticsService._report_range(max(AnalyticsService.DEFAULT_REPORT_DAYS.values()))
+        series = AnalyticsService.load_series_many(user_ids, start_date, end_date)
+        tdees = dict(UserProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'tdee'))
+        
+        entries = {}
+        for user_id, user_series in series.items():
+            tdee = float(tdees[user_id]) if tdees.get(user_id) else None
+            for report, days in AnalyticsService.DEFAULT_REPORT_DAYS.items():
+                window = {name: values[-days:] for name, values in user_series.items()}
+                window_start = end_date - timedelta(days=days - 1)
+                result = AnalyticsService._build_report(report, window, window_start, end_date, tdee)
+                entries[AnalyticsService._cache_key(user_id, report, end_date, days)] = orjson.dumps(result)
+        
+        cache.set_many(entries, AnalyticsService.REPORT_CACHE_TTL)
+        return len(entries)
+    
+    @staticmethod
+    def _report_range(days: int):
+        # Reports stop at yesterday, so one computation per user per day stays correct all day
+        end_date = timezone.now().date() - timedelta(days=1)
+        return end_date - timedelta(days=days - 1), end_date
+    
+    @staticmethod
+    def _cache_key(user_id: int, report: str, end_date: date, days: int) -> str:
+        return f"analytics:{report}:{user_id}:{end_date}:{days}"
+    
+    @staticmethod
+    def _build_report(
+        report: str, series: Dict[str, np.ndarray], start_date: date, end_date: date, tdee: Optional[float],
+    ) -> Dict:
+        result = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'dates': [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)],
+            'series': {},
+            'summary': {},
+        }
+        getattr(AnalyticsService, f'_{report}_report')(series, result, tdee)
+        return result
+    
+    @staticmethod
+    def _trends_report(series: Dict[str, np.ndarray], result: Dict, tdee: Optional[float]) -> None:
+        for name in ('calories', 'protein', 'carbs', 'fat', 'water_ml'):
+            result['series'][name] = _to_list(series[name])
+            result['series'][f'{name}_avg_{AnalyticsService.ROLLING_WINDOW}d'] = _to_list(
+                AnalyticsService.rolling_mean(series[name])
+            )
+    
+    @staticmethod
+    def _weight_report(series: Dict[str, np.ndarray], result: Dict, tdee: Optional[float]) -> None:
+        trend = AnalyticsService.weight_trend(series['weight'])
+        observed = trend[~np.isnan(trend)]
+        
+        result['series']['weight'] = _to_list(series['weight'])
+        result['series']['weight_trend'] = _to_list(trend)
+        result['summary']['trend_change'] = round(float(observed[-1] - observed[0]), 2) if len(observed) else None
+    
+    @staticmethod
+    def _balance_report(series: Dict[str, np.ndarray], result: Dict, tdee: Optional[float]) -> None:
+        balance = AnalyticsService.calorie_balance(series, tdee)
+        logged = balance[~np.isnan(balance)]
+        
+        result['series']['calorie_balance'] = _to_list(balance)
+        result['summary']['tdee'] = tdee
+        result['summary']['avg_balance'] = round(float(logged.mean()), 2) if len(logged) else None
+        result['summary']['total_balance'] = round(float(logged.sum()), 2) if len(logged) else None
+    
+    @staticmethod
+    def _correlations_report(series: Dict[str, np.ndarray], result: Dict, tdee: Optional[float]) -> None:
+        correlation = AnalyticsService.correlation
+        
+        # Coefficients only; the daily series are already available from the other reports
+        result['dates'] = []
+        result['summary'] = {
+            'sleep_hours_vs_calories': correlation(series['sleep_hours'], series['calories']),
+            'sleep_hours_vs_next_day_calories': correlation(series['sleep_hours'][:-1], series['calories'][1:]),
+            'sleep_quality_vs_calories': correlation(series['sleep_quality'], series['calories']),
+            'burned_vs_calories': correlation(np.where(series['burned'] > 0, series['burned'], np.nan), series['calories']),
+        }
+    
+    @staticmethod
+    def load_series(user: User, start_date: date, end_date: date) -> Dict[str, np.ndarray]:
+        return AnalyticsService.load_series_many([user.id], start_date, end_date)[user.id]
+    
+    @staticmethod
+    def load_series_many(user_ids: List[int], start_date: date, end_date: date) -> Dict[int, Dict[str, np.ndarray]]:
+        days = (end_date - start_date).days + 1
+        series = {
+            user_id: {
+                'calories': np.full(days, np.nan),
+                'protein': np.full(days, np.nan),
+                'carbs': np.full(days, np.nan),
+                'fat': np.full(days, np.nan),
+                'water_ml': np.full(days, np.nan),
+                'weight': np.full(days, np.nan),
+                'sleep_hours': np.full(days, np.nan),
+                'sleep_quality': np.full(days, np.nan),
+                'burned': np.zeros(days),
+            }
+            for user_id in user_ids
+        }
+        
+        # One flat projection per table for the whole batch; rows land in their user's day slot by index
+        summaries = AnalyticsService._fetch(
+            DailySummary.objects.filter(user_id__in=user_ids, date__range=(start_date, end_date))
+            .filter(Q(total_calories__gt=0) | Q(weight__isnull=False))
+            .order_by('user_id')
+            .values_list(
+                'user_id', 'date', 'total_calories', 'total_protein', 'total_carbs', 'total_fat',
+                'water_intake_ml', 'weight',
+            )
+        )
+        for user_id, rows in AnalyticsService._by_user(summaries):
+            index = AnalyticsService._day_index(rows[:, 1], start_date)
+            logged = rows[:, 2].astype(float) > 0
+            for column, name in enumerate(('calories', 'protein', 'carbs', 'fat', 'water_ml'), 2):
+                series[user_id][name][index[logged]] = rows[logged, column].astype(float)
+            
+            # Weight is nullable, so a day can carry a weigh-in without any food logged or vice versa
+            weighed = np.array([weight is not None for weight in rows[:, 7].tolist()], dtype=bool)
+            series[user_id]['weight'][index[weighed]] = rows[weighed, 7].astype(float)
+        
+        sleep = AnalyticsService._fetch(
+            SleepLog.objects.filter(user_id__in=user_ids, date__range=(start_date, end_date))
+            .order_by('user_id')
+            .values_list('user_id', 'date', 'duration_hours', 'quality')
+        )
+        for user_id, rows in AnalyticsService._by_user(sleep):
+            index = AnalyticsService._day_index(rows[:, 1], start_date)
+            series[user_id]['sleep_hours'][index] = rows[:, 2].astype(float)
+            series[user_id]['sleep_quality'][index] = rows[:, 3].astype(float)
+        
+        burned = AnalyticsService._fetch(
+            WorkoutLog.objects.filter(user_id__in=user_ids, date__range=(start_date, end_date))
+            .values('user_id', 'date')
+            .annotate(burned=Sum('calories_burned'))
+            .order_by('user_id')
+            .values_list('user_id', 'date', 'burned')
+        )
+        for user_id, rows in AnalyticsService._by_user(burned):
+            series[user_id]['burned'][AnalyticsService._day_index(rows[:, 1], start_date)] = rows[:, 2].astype(float)
+        
+        return series
+    
+    @staticmethod
+    def rolling_mean(values: np.ndarray, window: int = ROLLING_WINDOW) -> np.ndarray:
+        # NaN-aware trailing mean via cumulative sums: missing days shrink the window instead of zeroing it
+        observed = ~np.isnan(values)
+        sums = np.cumsum(np.where(observed, values, 0.0))
+        counts = np.cumsum(observed)
+        
+        sums[window:] = sums[window:] - sums[:-window]
+        counts[window:] = counts[window:] - counts[:-window]
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
+    
+    @staticmethod
+    def weight_trend(weights: np.ndarray, alpha: float = WEIGHT_ALPHA) -> np.ndarray:
+        trend = np.full(len(weights), np.nan)
+        observed = np.flatnonzero(~np.isnan(weights))
+        if not len(observed):
+            return trend
+        
+        # Carry the last weigh-in forward so gaps do not drag the trend towards zero
+        start = observed[0]
+        last_seen = np.maximum.accumulate(np.where(~np.isnan(weights[start:]), np.arange(len(weights) - start), 0))
+        filled = weights[start:][last_seen]
+        
+        trend[start:] = AnalyticsService._ewma(filled, alpha)
+        return trend
+    
+    @staticmethod
+    def calorie_balance(series: Dict[str, np.ndarray], tdee: Optional[float]) -> np.ndarray:
+        if not tdee:
+            return np.full(len(series['calories']), np.nan)
+        return series['calories'] - tdee - series['burned']
+    
+    @staticmethod
+    def correlation(x: np.ndarray, y: np.ndarray) -> Optional[float]:
+        paired = ~np.isnan(x) & ~np.isnan(y)
+        if paired.sum() < AnalyticsService.MIN_CORRELATION_POINTS:
+            return None
+        
+        x, y = x[paired], y[paired]
+        if x.std() == 0 or y.std() == 0:
+            return None
+        
+        return float(np.corrcoef(x, y)[0, 1])
+    
+    @staticmethod
+    def get_tdee(user: User) -> Optional[float]:
+        tdee = UserProfile.objects.filter(user=user).values_list('tdee', flat=True).first()
+        return float(tdee) if tdee else None
+    
+    @staticmethod
+    def _ewma(values: np.ndarray, alpha: float) -> np.ndarray:
+        # Closed form y_t = (1-a)^t * (y_0 + sum a*(1-a)^-k * x_k), evaluated in blocks short enough
+        # that (1-a)^-k stays well inside float64 range
+        decay = 1.0 - alpha
+        block = max(1, int(600 / -math.log(decay))) if decay > 0 else 1
+        
+        result = np.empty(len(values))
+        level = values[0]
+        for offset in range(0, len(values), block):
+            chunk = values[offset:offset + block]
+            powers = decay ** np.arange(1, len(chunk) + 1)
+            result[offset:offset + len(chunk)] = powers * (level + np.cumsum(alpha * chunk / powers))
+            level = result[offset + len(chunk) - 1]
+        
+        return result
+    
+    @staticmethod
+    def _fetch(rows) -> np.ndarray:
+        rows = list(rows)
+        return np.array(rows, dtype=object).reshape(len(rows), -1) if rows else np.empty((0, 0), dtype=object)
+    
+    @staticmethod
+    def _by_user(rows: np.ndarray):
+        if not len(rows):
+            return []
+        # Rows arrive ordered by user_id, so each user's rows are one contiguous block
+        user_ids, starts = np.unique(rows[:, 0].astype(int), return_index=True)
+        return zip(user_ids.tolist(), np.split(rows, starts[1:]))
+    
+    @staticmethod
+    def _day_index(dates: np.ndarray, start_date: date) -> np.ndarray:
+        return (dates.astype('datetime64[D]') - np.datetime64(start_date, 'D')).astype(int)
+
+
+def _to_list(values: np.ndarray) -> list:
+    return [None if math.isnan(value) else round(value, 2) for value in values.tolist()]
@@ -0,0 +1,35 @@
+from celery import shared_task
+import structlog
+
+from apps.core.fanout import FanOutService, chunk_task
+from apps.users.models import User
+from .services import AnalyticsService
+
+logger = structlog.get_logger(__name__)
+
+WARM_CHUNK_SIZE = 1000  # users per load_series_many batch, keeps the series arrays of a chunk in the tens of MB
+
+
+@shared_task(bind=True, max_retries=3)
+def warm_analytics_reports(self):
+    try:
+        return FanOutService.dispatch(
+            'warm_analytics_reports',
+            User.objects.filter(is_active=True),
+            warm_analytics_reports_chunk,
+            chunk_size=WARM_CHUNK_SIZE,
+        )
+    except Exception as e:
+        logger.error("warm_analytics_reports_failed", error=str(e))
+        raise self.retry(exc=e, countdown=300)
+
+
+@chunk_task()
+def warm_analytics_reports_chunk(lower, upper):
+    user_ids = list(
+        FanOutService.in_range(User.objects.filter(is_active=True), lower, upper).values_list('id', flat=True)
+    )
+    reports = AnalyticsService.warm_reports(user_ids)
+    
+    logger.info("analytics_reports_warmed", users=len(user_ids), reports=reports)
+    return {'users': len(user_ids), 'reports': reports}
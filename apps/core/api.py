@@ -2,8 +2,12 @@ from ninja import Router
 from django.http import JsonResponse
 from django.db import connection
 from django.core.cache import cache
+from redis.exceptions import RedisError
 import structlog
 
+from .auth import StaffAuthBearer
+from .metrics import CacheMetrics
+
 router = Router()
 logger = structlog.get_logger(__name__)
 
@@ -51,3 +55,12 @@ def version(request):
         'api': 'LifeMetrics',
         'environment': 'production',
     }
+
+
+@router.get("/metrics/cache", auth=StaffAuthBearer())
+def cache_metrics(request):
+    try:
+        return CacheMetrics.snapshot()
+    except RedisError as e:
+        logger.error("cache_metrics_unavailable", error=str(e))
+        return JsonResponse({'error': 'Metrics store unavailable'}, status=503)
@@ -3,7 +3,7 @@ from django.contrib.auth.models import AnonymousUser
 from typing import Optional
 import structlog
 
-from apps.users.services import AuthService
+from apps.users.services import AuthService, UserCacheService
 from apps.users.models import User
 
 logger = structlog.get_logger(__name__)
@@ -21,9 +21,22 @@ class AuthBearer(HttpBearer):
         if not user_id:
             return None
         
+        user = UserCacheService.get_cached_user(user_id)
+        if user is not None:
+            return user if user.is_active else None
+        
         try:
             user = User.objects.get(id=user_id, is_active=True)
-            return user
         except User.DoesNotExist:
             logger.warning("user_not_found", user_id=user_id)
             return None
+        
+        UserCacheService.cache_user(user)
+        return user
+
+
+class StaffAuthBearer(AuthBearer):
+    
+    def authenticate(self, request, token: str) -> Optional[User]:
+        user = super().authenticate(request, token)
+        return user if user is not None and user.is_staff else None
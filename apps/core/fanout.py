@@ -0,0 +1,123 @@
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+from celery import chord, shared_task
+from django.core.cache import cache
+from django.db.models import Max, QuerySet
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+PROGRESS_TTL = 24 * 3600
+
+
+class FanOutService:
+    
+    @staticmethod
+    def key_ranges(queryset: QuerySet, chunk_size: int = DEFAULT_CHUNK_SIZE, key: str = 'pk') -> List[Tuple[Any, Any]]:
+        # Keyset pagination: each range is (lower, upper], lower=None meaning unbounded
+        ranges = []
+        lower = None
+        
+        while True:
+            remaining = FanOutService.in_range(queryset, lower, None, key).order_by(key)
+            boundary = remaining.values_list(key, flat=True)[chunk_size - 1:chunk_size]
+            upper = next(iter(boundary), None)
+            
+            if upper is None:
+                upper = remaining.aggregate(last=Max(key))['last']
+                if upper is not None:
+                    ranges.append((lower, upper))
+                return ranges
+            
+            ranges.append((lower, upper))
+            lower = upper
+    
+    @staticmethod
+    def in_range(queryset: QuerySet, lower: Any, upper: Any, key: str = 'pk') -> QuerySet:
+        if lower is not None:
+            queryset = queryset.filter(**{f'{key}__gt': lower})
+        if upper is not None:
+            queryset = queryset.filter(**{f'{key}__lte': upper})
+        return queryset
+    
+    @staticmethod
+    def dispatch(
+        job_name: str,
+        queryset: QuerySet,
+        chunk_task,
+        *args,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        key: str = 'pk',
+    ) -> Dict:
+        from apps.core.tasks import aggregate_fanout_results
+        
+        run_id = f"{job_name}:{uuid4().hex[:12]}"
+        ranges = FanOutService.key_ranges(queryset, chunk_size, key)
+        
+        cache.set_many(
+            {f"fanout:{run_id}:total": len(ranges), f"fanout:{run_id}:done": 0},
+            PROGRESS_TTL,
+        )
+        
+        if ranges:
+            chord(
+                chunk_task.si(run_id, lower, upper, *args) for lower, upper in ranges
+            )(aggregate_fanout_results.s(run_id))
+        
+        logger.info("fanout_dispatched", run_id=run_id, chunks=len(ranges))
+        
+        return {'run_id': run_id, 'chunks': len(ranges)}
+    
+    @staticmethod
+    def mark_chunk_done(run_id: str) -> None:
+        try:
+            cache.incr(f"fanout:{run_id}:done")
+        except ValueError:
+            pass
+    
+    @staticmethod
+    def get_progress(run_id: str) -> Dict:
+        values = cache.get_many([f"fanout:{run_id}:total", f"fanout:{run_id}:done", f"fanout:{run_id}:result"])
+        return {
+            'total': values.get(f"fanout:{run_id}:total"),
+            'done': values.get(f"fanout:{run_id}:done"),
+            'result': values.get(f"fanout:{run_id}:result"),
+        }
+    
+    @staticmethod
+    def finish(run_id: str, results: List[Optional[Dict]]) -> Dict:
+        totals = Counter()
+        for result in results:
+            totals.update(result or {})
+        
+        totals = dict(totals)
+        cache.set(f"fanout:{run_id}:result", totals, PROGRESS_TTL)
+        
+        logger.info("fanout_completed", run_id=run_id, **totals)
+        
+        return totals
+
+
+def chunk_task(max_retries: int = 3, countdown: int = 60) -> Callable:
+    def decorator(func: Callable):
+        
+        @shared_task(bind=True, max_retries=max_retries, name=f'{func.__module__}.{func.__name__}')
+        def task(self, run_id: str, lower: Any, upper: Any, *args):
+            try:
+                result = func(lower, upper, *args)
+            except Exception as e:
+                if self.request.retries < self.max_retries:
+                    raise self.retry(exc=e, countdown=countdown)
+                
+                # Out of retries: report the chunk as failed rather than breaking the chord
+                logger.error("fanout_chunk_failed", run_id=run_id, lower=lower, upper=upper, error=str(e))
+                result = {'failed_chunks': 1}
+            
+            FanOutService.mark_chunk_done(run_id)
+            return result
+        
+        return task
+    
+    return decorator
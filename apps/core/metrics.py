@@ -0,0 +1,132 @@
+import os
+import socket
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+import orjson
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+COUNTERS_KEY = 'cache_metrics:counters'
+GAUGES_KEY = 'cache_metrics:gauges'
+FLUSH_SECONDS = 10
+GAUGES_TTL = 300
+
+# Deltas since the last flush; the hot path only touches process memory
+_counters = Counter()
+_gauges = {}
+_lock = threading.Lock()
+_flusher_pid = None
+
+
+def process_label() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class CacheMetrics:
+    
+    @staticmethod
+    def hit(cache_name: str) -> None:
+        CacheMetrics._count(cache_name, 'hits')
+    
+    @staticmethod
+    def miss(cache_name: str) -> None:
+        CacheMetrics._count(cache_name, 'misses')
+    
+    @staticmethod
+    def set_gauge(cache_name: str, field: str, value) -> None:
+        CacheMetrics._ensure_flusher()
+        with _lock:
+            _gauges[(cache_name, field)] = value
+    
+    @staticmethod
+    def flush() -> None:
+        with _lock:
+            counters = dict(_counters)
+            gauges = dict(_gauges)
+            _counters.clear()
+        
+        if not counters and not gauges:
+            return
+        
+        gauges_key = f"{GAUGES_KEY}:{process_label()}"
+        try:
+            with get_redis_connection('default').pipeline(transaction=False) as pipe:
+                for (name, field), delta in counters.items():
+                    pipe.hincrby(COUNTERS_KEY, f"{name}:{field}", delta)
+                if gauges:
+                    pipe.hset(gauges_key, mapping={
+                        f"{name}:{field}": orjson.dumps(value) for (name, field), value in gauges.items()
+                    })
+                    pipe.expire(gauges_key, GAUGES_TTL)
+                pipe.execute()
+        except RedisError as e:
+            # Put the deltas back so they go out with the next flush
+            with _lock:
+                _counters.update(counters)
+            logger.warning("cache_metrics_flush_failed", error=str(e))
+    
+    @staticmethod
+    def snapshot() -> Dict[str, Dict]:
+        CacheMetrics.flush()
+        
+        redis_client = get_redis_connection('default')
+        counters = Counter()
+        for key, value in redis_client.hgetall(COUNTERS_KEY).items():
+            name, field = key.decode().rsplit(':', 1)
+            counters[(name, field)] = int(value)
+        
+        # Gauges describe one process (e.g. its in-memory index size), so they stay labelled by process
+        gauges = defaultdict(dict)
+        for gauges_key in redis_client.scan_iter(match=f"{GAUGES_KEY}:*"):
+            process = gauges_key.decode().split(':', 2)[2]
+            for key, value in redis_client.hgetall(gauges_key).items():
+                name, field = key.decode().rsplit(':', 1)
+                gauges[name].setdefault(process, {})[field] = orjson.loads(value)
+        
+        stats = {}
+        for name in sorted({name for name, _ in counters} | set(gauges)):
+            hits = counters[(name, 'hits')]
+            misses = counters[(name, 'misses')]
+            total = hits + misses
+            stats[name] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / total, 4) if total else 0.0,
+                'processes': gauges.get(name, {}),
+            }
+        return stats
+    
+    @staticmethod
+    def _count(cache_name: str, field: str) -> None:
+        CacheMetrics._ensure_flusher()
+        with _lock:
+            _counters[(cache_name, field)] += 1
+    
+    @staticmethod
+    def _ensure_flusher() -> None:
+        global _flusher_pid
+        
+        # Checked by pid so a forked worker starts its own flusher, dropping deltas its parent will report
+        if _flusher_pid == os.getpid():
+            return
+        with _lock:
+            if _flusher_pid == os.getpid():
+                return
+            _flusher_pid = os.getpid()
+            _counters.clear()
+        
+        threading.Thread(target=_flush_forever, name='cache-metrics-flusher', daemon=True).start()
+
+
+def _flush_forever() -> None:
+    while True:
+        time.sleep(FLUSH_SECONDS)
+        try:
+            CacheMetrics.flush()
+        except Exception as e:
+            logger.warning("cache_metrics_flush_failed", error=str(e))
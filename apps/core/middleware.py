@@ -1,29 +1,54 @@
 import time
+from typing import List, Optional
+import jwt
 import structlog
-from django.core.cache import cache
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.http import JsonResponse
 from django.conf import settings
 
+from .ratelimit import Limit, RateLimiter, retry_after_header
+
 logger = structlog.get_logger(__name__)
 
 
 class RequestLoggingMiddleware:
+    sync_capable = True
+    async_capable = True
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        start_time = time.time()
+        if self.is_async:
+            return self.__acall__(request)
+        
+        start_time = self.log_started(request)
+        response = self.get_response(request)
+        self.log_finished(request, response, start_time)
         
+        return response
+
+    async def __acall__(self, request):
+        start_time = self.log_started(request)
+        response = await self.get_response(request)
+        self.log_finished(request, response, start_time)
+        
+        return response
+
+    def log_started(self, request) -> float:
         logger.info(
             "request_started",
             method=request.method,
             path=request.path,
             ip=self.get_client_ip(request),
         )
-        
-        response = self.get_response(request)
-        
+        return time.time()
+
+    @staticmethod
+    def log_finished(request, response, start_time: float) -> None:
         duration = time.time() - start_time
         logger.info(
             "request_finished",
@@ -32,8 +57,6 @@ class RequestLoggingMiddleware:
             status=response.status_code,
             duration=f"{duration:.3f}s",
         )
-        
-        return response
 
     @staticmethod
     def get_client_ip(request):
@@ -46,41 +69,86 @@ class RequestLoggingMiddleware:
 
 
 class RateLimitMiddleware:
+    sync_capable = True
+    async_capable = True
+    
+    EXEMPT_PREFIXES = ('/static/', '/admin/')
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self.limiter = RateLimiter()
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        if not self.check_rate_limit(request):
-            return JsonResponse(
-                {'error': 'Rate limit exceeded. Please try again later.'},
-                status=429
-            )
+        if self.is_async:
+            return self.__acall__(request)
+        
+        if not request.path.startswith(self.EXEMPT_PREFIXES):
+            rejected = self.rejection(*self.limiter.hit(self.get_limits(request)))
+            if rejected:
+                return rejected
         
         return self.get_response(request)
 
-    def check_rate_limit(self, request):
-        if request.path.startswith('/static/') or request.path.startswith('/admin/'):
-            return True
+    async def __acall__(self, request):
+        if not request.path.startswith(self.EXEMPT_PREFIXES):
+            rejected = self.rejection(*await self.limiter.ahit(self.get_limits(request)))
+            if rejected:
+                return rejected
+        
+        return await self.get_response(request)
+
+    @staticmethod
+    def rejection(allowed: bool, limit: Optional[Limit], retry_after: float) -> Optional[JsonResponse]:
+        if allowed:
+            return None
         
-        ip = self.get_client_ip(request)
-        minute_key = f"rate_limit:minute:{ip}"
-        hour_key = f"rate_limit:hour:{ip}"
+        logger.warning("rate_limit_exceeded", key=limit.key, period=limit.period)
+        return JsonResponse(
+            {'error': 'Rate limit exceeded. Please try again later.'},
+            status=429,
+            headers={'Retry-After': retry_after_header(retry_after)},
+        )
+
+    def get_limits(self, request) -> List[Limit]:
+        user_id = self.get_token_user_id(request)
+        if user_id:
+            identity = f"user:{user_id}"
+            limits = [
+                Limit(f"{identity}:minute", settings.RATE_LIMIT_USER_PER_MINUTE, 60),
+                Limit(f"{identity}:hour", settings.RATE_LIMIT_USER_PER_HOUR, 3600),
+            ]
+        else:
+            identity = f"ip:{self.get_client_ip(request)}"
+            limits = [
+                Limit(f"{identity}:minute", settings.RATE_LIMIT_PER_MINUTE, 60),
+                Limit(f"{identity}:hour", settings.RATE_LIMIT_PER_HOUR, 3600),
+            ]
         
-        minute_count = cache.get(minute_key, 0)
-        if minute_count >= settings.RATE_LIMIT_PER_MINUTE:
-            logger.warning("rate_limit_exceeded", ip=ip, window="minute")
-            return False
+        for prefix, route_limits in settings.RATE_LIMIT_ROUTES.items():
+            if request.path.startswith(prefix):
+                limits += [
+                    Limit(f"{identity}:{prefix}:{period}", limit, period)
+                    for period, limit in route_limits.items()
+                ]
         
-        hour_count = cache.get(hour_key, 0)
-        if hour_count >= settings.RATE_LIMIT_PER_HOUR:
-            logger.warning("rate_limit_exceeded", ip=ip, window="hour")
-            return False
+        return limits
+
+    @staticmethod
+    def get_token_user_id(request) -> Optional[int]:
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        if not header.startswith('Bearer '):
+            return None
         
-        cache.set(minute_key, minute_count + 1, 60)
-        cache.set(hour_key, hour_count + 1, 3600)
+        # Signature is checked so forged tokens can't borrow another user's budget; errors fall back to IP
+        try:
+            payload = jwt.decode(header[7:], settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        except jwt.InvalidTokenError:
+            return None
         
-        return True
+        return payload.get('user_id')
 
     @staticmethod
     def get_client_ip(request):
@@ -0,0 +1,153 @@
+import math
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+import redis.asyncio as aioredis
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+KEY_PREFIX = 'lifemetrics:ratelimit'
+DEGRADED_RETRY_SECONDS = 5
+REDIS_TIMEOUT_SECONDS = 5
+
+# One pool per process with the same timeouts as the django-redis cache, so a stalled Redis degrades instead of hanging
+async_redis = aioredis.from_url(
+    settings.REDIS_URL,
+    socket_timeout=REDIS_TIMEOUT_SECONDS,
+    socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+)
+
+# GCRA over every limit at once: nothing is written unless all limits allow the hit,
+# and each key expires exactly when its theoretical arrival time passes
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local arrivals = {}
+
+for i, key in ipairs(KEYS) do
+    local emission = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+    local tat = tonumber(redis.call('GET', key)) or now
+    if tat < now then
+        tat = now
+    end
+    local arrival = tat + emission
+    if arrival - now > period then
+        return {0, i, math.ceil(arrival - now - period)}
+    end
+    arrivals[i] = arrival
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, arrivals[i], 'PX', math.ceil(arrivals[i] - now))
+end
+
+return {1, 0, 0}
+"""
+
+
+class Limit(NamedTuple):
+    key: str
+    limit: int
+    period: int  # seconds
+
+
+class RateLimiter:
+    
+    def __init__(self, alias: str = 'default'):
+        self.alias = alias
+        self._script = None
+        self._async_script = None
+        self._local_arrivals = {}
+        self._local_lock = threading.Lock()
+        self._degraded = False
+        self._redis_retry_at = 0.0
+    
+    def hit(self, limits: List[Limit]) -> Tuple[bool, Optional[Limit], float]:
+        if self._degraded and time.monotonic() < self._redis_retry_at:
+            return self._hit_local(limits)
+        
+        try:
+            if self._script is None:
+                self._script = get_redis_connection(self.alias).register_script(GCRA_SCRIPT)
+            result = self._script(keys=self._script_keys(limits), args=self._script_args(limits))
+        except (RedisError, NotImplementedError) as e:
+            # NotImplementedError: the cache alias is not backed by django-redis
+            self._mark_degraded(e)
+            return self._hit_local(limits)
+        
+        return self._parse_result(limits, result)
+    
+    async def ahit(self, limits: List[Limit]) -> Tuple[bool, Optional[Limit], float]:
+        if self._degraded and time.monotonic() < self._redis_retry_at:
+            return self._hit_local(limits)
+        
+        if self._async_script is None:
+            self._async_script = async_redis.register_script(GCRA_SCRIPT)
+        
+        try:
+            result = await self._async_script(keys=self._script_keys(limits), args=self._script_args(limits))
+        except RedisError as e:
+            self._mark_degraded(e)
+            return self._hit_local(limits)
+        
+        return self._parse_result(limits, result)
+    
+    @staticmethod
+    def _script_keys(limits: List[Limit]) -> List[str]:
+        return [f"{KEY_PREFIX}:{limit.key}" for limit in limits]
+    
+    @staticmethod
+    def _script_args(limits: List[Limit]) -> List[float]:
+        args = []
+        for limit in limits:
+            args += [limit.period * 1000 / limit.limit, limit.period * 1000]
+        return args
+    
+    def _parse_result(self, limits: List[Limit], result) -> Tuple[bool, Optional[Limit], float]:
+        if self._degraded:
+            logger.info("rate_limiter_recovered")
+            self._degraded = False
+        
+        allowed, index, retry_after_ms = result
+        if allowed:
+            return True, None, 0.0
+        return False, limits[index - 1], retry_after_ms / 1000
+    
+    def _mark_degraded(self, error: Exception) -> None:
+        if not self._degraded:
+            logger.warning("rate_limiter_degraded", error=str(error))
+            self._degraded = True
+        # Back off from Redis so a dead server doesn't add a socket timeout to every request
+        self._redis_retry_at = time.monotonic() + DEGRADED_RETRY_SECONDS
+    
+    def _hit_local(self, limits: List[Limit]) -> Tuple[bool, Optional[Limit], float]:
+        # Same GCRA per process while Redis is unreachable, so limits stay roughly enforced
+        now = time.monotonic()
+        
+        with self._local_lock:
+            arrivals = []
+            for limit in limits:
+                tat = max(self._local_arrivals.get(limit.key, now), now)
+                arrival = tat + limit.period / limit.limit
+                if arrival - now > limit.period:
+                    return False, limit, arrival - now - limit.period
+                arrivals.append(arrival)
+            
+            for limit, arrival in zip(limits, arrivals):
+                self._local_arrivals[limit.key] = arrival
+            
+            if len(self._local_arrivals) > 100000:
+                self._local_arrivals = {
+                    key: arrival for key, arrival in self._local_arrivals.items() if arrival > now
+                }
+        
+        return True, None, 0.0
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(math.ceil(seconds), 1))
@@ -0,0 +1,154 @@
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+from django.db.models import Avg, Count, F, Q, Sum
+import structlog
+
+from apps.food.models import DailySummary
+from apps.goals.models import Goal
+from apps.sleep.models import SleepLog
+from apps.users.models import User
+from apps.workouts.models import WorkoutLog
+from .fanout import FanOutService
+
+logger = structlog.get_logger(__name__)
+
+REPORT_HEADER = "📊 Итоги недели {week_start:%d.%m}–{week_end:%d.%m}, {name}!"
+NUTRITION_LINE = (
+    "🍽 Питание: {days_logged}/7 дн., в среднем {avg_calories:.0f} ккал"
+    " (Б {avg_protein:.0f} / Ж {avg_fat:.0f} / У {avg_carbs:.0f} г)"
+)
+CALORIE_TARGET_LINE = "🎯 Норма {target_calories} ккал: в пределах ±10% — {days_on_target} дн."
+WATER_LINE = "💧 Вода: в среднем {avg_water:.0f} мл в день"
+WORKOUT_LINE = "🏃 Тренировки: {workouts}, {minutes} мин, {burned} ккал"
+SLEEP_LINE = "😴 Сон: в среднем {avg_hours:.1f} ч, качество {avg_quality:.1f}/5"
+GOALS_LINE = "🏆 Цели: активных {active}, выполнено за неделю {completed}"
+REPORT_FOOTER = "Хорошей недели! /menu"
+
+
+class StageTimer:
+    
+    def __init__(self):
+        self.timings: Dict[str, int] = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings[f'{name}_ms'] = self.timings.get(f'{name}_ms', 0) + round((time.monotonic() - started) * 1000)
+
+
+class WeeklyReportService:
+    
+    @staticmethod
+    def recipients():
+        return User.objects.filter(
+            is_active=True,
+            telegram_id__isnull=False,
+            profile__notifications_enabled=True,
+        )
+    
+    @staticmethod
+    def report_week(today: date) -> Tuple[date, date]:
+        week_end = today - timedelta(days=today.weekday() + 1)
+        return week_end - timedelta(days=6), week_end
+    
+    @staticmethod
+    def collect(lower: Any, upper: Any, week_start: date, week_end: date) -> Dict[int, Dict]:
+        # One grouped query per table for the whole user range; cost does not grow with per-user queries
+        def scoped(queryset):
+            return FanOutService.in_range(queryset, lower, upper, key='user_id')
+        
+        users = FanOutService.in_range(WeeklyReportService.recipients(), lower, upper).values(
+            'id', 'telegram_id', 'telegram_first_name', 'username'
+        )
+        reports = {user['id']: {'user': user} for user in users}
+        if not reports:
+            return reports
+        
+        logged = Q(total_calories__gt=0)
+        nutrition = scoped(DailySummary.objects.filter(date__range=(week_start, week_end))).values('user_id').annotate(
+            days_logged=Count('id', filter=logged),
+            avg_calories=Avg('total_calories', filter=logged),
+            avg_protein=Avg('total_protein', filter=logged),
+            avg_carbs=Avg('total_carbs', filter=logged),
+            avg_fat=Avg('total_fat', filter=logged),
+            # Named apart from the field so the days_on_target filter below compares against each day's own target
+            avg_target_calories=Avg('target_calories', filter=logged),
+            days_on_target=Count('id', filter=logged & Q(
+                total_calories__gte=F('target_calories') * Decimal('0.9'),
+                total_calories__lte=F('target_calories') * Decimal('1.1'),
+            )),
+            avg_water=Avg('water_intake_ml', filter=Q(water_intake_ml__gt=0)),
+        )
+        workouts = scoped(WorkoutLog.objects.filter(date__range=(week_start, week_end))).values('user_id').annotate(
+            workouts=Count('id'),
+            minutes=Sum('duration_minutes'),
+            burned=Sum('calories_burned'),
+        )
+        sleep = scoped(SleepLog.objects.filter(date__range=(week_start, week_end))).values('user_id').annotate(
+            avg_hours=Avg('duration_hours'),
+            avg_quality=Avg('quality'),
+        )
+        goals = scoped(Goal.objects.all()).values('user_id').annotate(
+            active=Count('id', filter=Q(status='active')),
+            completed=Count('id', filter=Q(status='completed', completed_date__range=(week_start, week_end))),
+        )
+        
+        for section, rows in (('nutrition', nutrition), ('workouts', workouts), ('sleep', sleep), ('goals', goals)):
+            for row in rows:
+                report = reports.get(row.pop('user_id'))
+                if report is not None:
+                    report[section] = row
+        
+        return reports
+    
+    @staticmethod
+    def render(report: Dict, week_start: date, week_end: date) -> str:
+        user = report['user']
+        nutrition = report.get('nutrition') or {}
+        workouts = report.get('workouts')
+        sleep = report.get('sleep')
+        goals = report.get('goals') or {}
+        
+        lines = [REPORT_HEADER.format(
+            week_start=week_start,
+            week_end=week_end,
+            name=user['telegram_first_name'] or user['username'],
+        ), ""]
+        
+        if nutrition.get('days_logged'):
+            lines.append(NUTRITION_LINE.format(**nutrition))
+            if nutrition['avg_target_calories']:
+                lines.append(CALORIE_TARGET_LINE.format(
+                    target_calories=round(nutrition['avg_target_calories']),
+                    days_on_target=nutrition['days_on_target'],
+                ))
+        if nutrition.get('avg_water'):
+            lines.append(WATER_LINE.format(avg_water=nutrition['avg_water']))
+        if workouts:
+            lines.append(WORKOUT_LINE.format(**workouts))
+        if sleep:
+            lines.append(SLEEP_LINE.format(avg_hours=float(sleep['avg_hours']), avg_quality=float(sleep['avg_quality'])))
+        if goals.get('active') or goals.get('completed'):
+            lines.append(GOALS_LINE.format(**goals))
+        
+        lines += ["", REPORT_FOOTER]
+        return "\n".join(lines)
+    
+    @staticmethod
+    def has_activity(report: Dict) -> bool:
+        nutrition = report.get('nutrition') or {}
+        return bool(nutrition.get('days_logged') or nutrition.get('avg_water') or report.get('workouts') or report.get('sleep'))
+    
+    @staticmethod
+    def build_messages(reports: Dict[int, Dict], week_start: date, week_end: date) -> List[Tuple[int, str]]:
+        return [
+            (report['user']['telegram_id'], WeeklyReportService.render(report, week_start, week_end))
+            for report in reports.values()
+            if WeeklyReportService.has_activity(report)
+        ]
@@ -1,35 +1,92 @@
 from celery import shared_task
+from datetime import date
 from django.contrib.sessions.models import Session
 from django.utils import timezone
 import structlog
 
+from .fanout import FanOutService, chunk_task
+
 logger = structlog.get_logger(__name__)
 
 
+@shared_task
+def aggregate_fanout_results(results, run_id: str):
+    return FanOutService.finish(run_id, results)
+
+
 @shared_task(bind=True, max_retries=3)
 def clean_old_sessions(self):
     try:
-        expired_sessions = Session.objects.filter(expire_date__lt=timezone.now())
-        count = expired_sessions.count()
-        expired_sessions.delete()
+        now = timezone.now().isoformat()
+        expired_sessions = Session.objects.filter(expire_date__lt=now)
         
-        logger.info("cleaned_old_sessions", count=count)
-        return f"Cleaned {count} expired sessions"
+        return FanOutService.dispatch(
+            'clean_old_sessions',
+            expired_sessions,
+            clean_old_sessions_chunk,
+            now,
+            key='session_key',
+        )
     except Exception as e:
         logger.error("clean_sessions_failed", error=str(e))
         raise self.retry(exc=e, countdown=60)
 
 
+@chunk_task()
+def clean_old_sessions_chunk(lower, upper, now: str):
+    expired_sessions = FanOutService.in_range(
+        Session.objects.filter(expire_date__lt=now), lower, upper, key='session_key'
+    )
+    count, _ = expired_sessions.delete()
+    
+    logger.info("cleaned_old_sessions", count=count)
+    return {'cleaned': count}
+
+
 @shared_task(bind=True, max_retries=3)
 def generate_weekly_reports(self):
     try:
-        from apps.users.models import User
+        from .reports import WeeklyReportService
         
-        users = User.objects.filter(is_active=True)
-        for user in users:
-            logger.info("generated_weekly_report", user_id=user.id)
+        week_start, week_end = WeeklyReportService.report_week(timezone.now().date())
         
-        return f"Generated reports for {users.count()} users"
+        return FanOutService.dispatch(
+            'generate_weekly_reports',
+            WeeklyReportService.recipients(),
+            generate_weekly_reports_chunk,
+            week_start.isoformat(),
+            week_end.isoformat(),
+        )
     except Exception as e:
         logger.error("generate_reports_failed", error=str(e))
         raise self.retry(exc=e, countdown=300)
+
+
+@chunk_task()
+def generate_weekly_reports_chunk(lower, upper, week_start: str, week_end: str):
+    from apps.telegram_bot.bot import bot, redis_client
+    from apps.telegram_bot.broadcast import BroadcastEngine, run_in_worker_loop
+    from .reports import StageTimer, WeeklyReportService
+    
+    week_start, week_end = date.fromisoformat(week_start), date.fromisoformat(week_end)
+    timer = StageTimer()
+    
+    with timer.stage('collect'):
+        reports = WeeklyReportService.collect(lower, upper, week_start, week_end)
+    
+    with timer.stage('render'):
+        messages = WeeklyReportService.build_messages(reports, week_start, week_end)
+    
+    with timer.stage('send'):
+        stats = run_in_worker_loop(BroadcastEngine(bot, redis_client=redis_client).broadcast(messages)) if messages else {}
+    
+    result = {
+        **stats,
+        'recipients': len(reports),
+        'generated': len(messages),
+        'skipped': len(reports) - len(messages),
+        **timer.timings,
+    }
+    
+    logger.info("weekly_reports_chunk_finished", lower=lower, upper=upper, **result)
+    return result
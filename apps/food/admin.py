@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Food, FoodLog, DailySummary, WaterLog
+from .models import Food, FoodLog, DailySummary, NutritionRollup, WaterLog
 
 
 @admin.register(Food)
@@ -26,6 +26,14 @@ class DailySummaryAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
 
 
+@admin.register(NutritionRollup)
+class NutritionRollupAdmin(admin.ModelAdmin):
+    list_display = ['user', 'period', 'period_start', 'days_logged', 'total_calories']
+    list_filter = ['period', 'period_start']
+    search_fields = ['user__username']
+    readonly_fields = ['created_at', 'updated_at']
+
+
 @admin.register(WaterLog)
 class WaterLogAdmin(admin.ModelAdmin):
     list_display = ['user', 'date', 'amount_ml', 'time']
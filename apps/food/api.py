@@ -1,7 +1,11 @@
 from ninja import Router, Query
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import date, timedelta
+import base64
+import binascii
+import orjson
 import structlog
 
 from .models import Food, FoodLog, DailySummary
@@ -10,17 +14,20 @@ from .schemas import (
     FoodCreateSchema,
     FoodLogSchema,
     FoodLogCreateSchema,
+    FoodLogBatchCreateSchema,
     DailySummarySchema,
     WaterLogSchema,
     FoodSearchResultSchema,
     NutritionStatsSchema,
 )
-from .services import FoodService, FoodLogService, DailySummaryService, WaterService
+from .services import FoodService, FoodLogService, DailySummaryService, RecentFoodsService, WaterService
 from apps.core.auth import AuthBearer
 
 router = Router()
 logger = structlog.get_logger(__name__)
 
+NDJSON_MAX_DAYS = 366
+
 
 @router.get("/search", response=List[FoodSchema], auth=AuthBearer())
 def search_foods(request, query: str = Query(..., min_length=2)):
@@ -28,6 +35,12 @@ def search_foods(request, query: str = Query(..., min_length=2)):
     return foods
 
 
+@router.get("/recent", response=List[FoodSchema], auth=AuthBearer())
+def get_recent_foods(request, limit: int = Query(10, ge=1, le=30)):
+    foods = RecentFoodsService.get_recent_foods(request.auth, limit)
+    return foods
+
+
 @router.get("/barcode/{barcode}", response=FoodSchema, auth=AuthBearer())
 def get_food_by_barcode(request, barcode: str):
     food = FoodService.get_food_by_barcode(barcode)
@@ -69,6 +82,16 @@ def log_food(request, data: FoodLogCreateSchema):
     return food_log
 
 
+@router.post("/log/batch", response={200: List[FoodLogSchema], 404: Dict[str, str]}, auth=AuthBearer())
+def log_food_batch(request, data: FoodLogBatchCreateSchema):
+    try:
+        food_logs = FoodLogService.log_foods(request.auth, data.items)
+    except Food.DoesNotExist as e:
+        return 404, {'error': str(e)}
+    
+    return food_logs
+
+
 @router.get("/logs", response=List[FoodLogSchema], auth=AuthBearer())
 def get_food_logs(request, date: date = Query(None)):
     log_date = date or date.today()
@@ -81,13 +104,50 @@ def get_food_logs(request, date: date = Query(None)):
     return all_logs
 
 
+@router.get("/logs/range", response={400: Dict[str, str]}, auth=AuthBearer())
+def get_food_logs_range(
+    request,
+    start: date,
+    end: date,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    format: str = Query(
+        'json',
+        pattern='^(json|ndjson)$',
+        description="ndjson streams every log from the cursor to the end of the range and ignores limit; "
+                    f"its range is capped at {NDJSON_MAX_DAYS} days",
+    ),
+):
+    if end < start:
+        return 400, {'error': 'end must not be before start'}
+    
+    try:
+        after = _decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return 400, {'error': 'Invalid cursor'}
+    
+    if format == 'ndjson':
+        if (end - start).days >= NDJSON_MAX_DAYS:
+            return 400, {'error': f'ndjson range must not exceed {NDJSON_MAX_DAYS} days'}
+        
+        return StreamingHttpResponse(
+            _ndjson_lines(FoodLogService.aiter_logs(request.auth, start, end, after)),
+            content_type='application/x-ndjson',
+        )
+    
+    rows = FoodLogService.get_logs_page(request.auth, start, end, after, limit)
+    next_cursor = _encode_cursor(rows[-1]['date'], rows[-1]['id']) if len(rows) == limit else None
+    
+    return HttpResponse(
+        orjson.dumps({'items': rows, 'next_cursor': next_cursor}, default=str),
+        content_type='application/json',
+    )
+
+
 @router.delete("/logs/{log_id}", auth=AuthBearer())
 def delete_food_log(request, log_id: int):
     log = get_object_or_404(FoodLog, id=log_id, user=request.auth)
-    log_date = log.date
-    log.delete()
-    
-    DailySummaryService.invalidate_summary_cache(request.auth, log_date)
+    FoodLogService.delete_food_log(request.auth, log)
     
     logger.info("food_log_deleted", user_id=request.auth.id, log_id=log_id)
     
@@ -97,7 +157,7 @@ def delete_food_log(request, log_id: int):
 @router.get("/summary", response=DailySummarySchema, auth=AuthBearer())
 def get_daily_summary(request, date: date = Query(None)):
     summary_date = date or date.today()
-    summary = DailySummaryService.get_or_create_summary(request.auth, summary_date)
+    summary = DailySummaryService.get_summary(request.auth, summary_date)
     
     return summary
 
@@ -136,3 +196,20 @@ def log_water(request, data: WaterLogSchema):
 def get_today_water(request):
     total = WaterService.get_daily_water_intake(request.auth, date.today())
     return {'total_ml': total, 'date': date.today()}
+
+
+async def _ndjson_lines(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield orjson.dumps(row, default=str, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def _encode_cursor(log_date: date, log_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{log_date.isoformat()}:{log_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        log_date, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        return date.fromisoformat(log_date), int(log_id)
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(str(e)) from e
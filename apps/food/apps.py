@@ -1,7 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class FoodConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.food'
     verbose_name = 'Food & Nutrition'
+
+    def ready(self):
+        from .models import Food
+        from .signals import invalidate_barcode, invalidate_private_foods, remember_barcode
+        
+        pre_save.connect(remember_barcode, sender=Food)
+        post_save.connect(invalidate_barcode, sender=Food)
+        post_delete.connect(invalidate_barcode, sender=Food)
+        post_save.connect(invalidate_private_foods, sender=Food)
+        post_delete.connect(invalidate_private_foods, sender=Food)
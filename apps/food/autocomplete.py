@@ -0,0 +1,147 @@
+import asyncio
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from datetime import timedelta
+from typing import List, NamedTuple
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+import structlog
+
+from apps.core.metrics import CacheMetrics
+from .models import Food, FoodLog
+
+logger = structlog.get_logger(__name__)
+
+PAYLOAD_KEY = 'popular_foods:payload'
+VERSION_KEY = 'popular_foods:version'
+POPULAR_FOODS_LIMIT = 1000
+POPULARITY_WINDOW_DAYS = 90
+RELOAD_CHECK_SECONDS = 60
+
+WORD_START = re.compile(r'(?<!\w)\w')
+
+
+class FoodSuggestion(NamedTuple):
+    id: int
+    name: str
+    brand: str
+    calories: str
+    uses: int
+
+
+def fold(text: str) -> str:
+    return ' '.join(text.casefold().replace('ё', 'е').split())
+
+
+class PopularFoodsIndex:
+    
+    def __init__(self):
+        self.keys: List[str] = []
+        self.positions: List[int] = []
+        self.foods: List[FoodSuggestion] = []
+        self.version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def search(self, query: str, limit: int = 10) -> List[FoodSuggestion]:
+        prefix = fold(query)
+        if not prefix:
+            return []
+        
+        keys, positions, foods = self.keys, self.positions, self.foods
+        
+        matched = set()
+        index = bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix):
+            matched.add(positions[index])
+            index += 1
+        
+        # Foods are stored by descending popularity, so position order is rank order
+        suggestions = [foods[position] for position in sorted(matched)[:limit]]
+        
+        if suggestions:
+            CacheMetrics.hit('autocomplete')
+        else:
+            CacheMetrics.miss('autocomplete')
+        
+        return suggestions
+    
+    def load(self, rows: List[list], version) -> None:
+        foods = [FoodSuggestion(*row) for row in rows]
+        
+        # Every word boundary of "name brand" becomes a key, so "прост" finds "Молоко Простоквашино"
+        entries = []
+        for position, food in enumerate(foods):
+            text = fold(f"{food.name} {food.brand}")
+            for match in WORD_START.finditer(text):
+                entries.append((text[match.start():], position))
+        entries.sort()
+        
+        keys = [key for key, _ in entries]
+        positions = [position for _, position in entries]
+        
+        self.keys, self.positions, self.foods, self.version = keys, positions, foods, version
+        
+        CacheMetrics.set_gauge('autocomplete', 'foods', len(foods))
+        CacheMetrics.set_gauge('autocomplete', 'memory_bytes', self.memory_footprint())
+        
+        logger.info("popular_foods_index_loaded", foods=len(foods), keys=len(keys), version=version)
+    
+    def memory_footprint(self) -> int:
+        size = sys.getsizeof(self.keys) + sys.getsizeof(self.positions) + sys.getsizeof(self.foods)
+        size += sum(sys.getsizeof(key) for key in self.keys)
+        size += sum(sys.getsizeof(food) + sum(sys.getsizeof(field) for field in food) for food in self.foods)
+        return size
+    
+    def schedule_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return
+        self._checked_at = now
+        
+        # Called from the event loop: the cache round trips run on a worker thread and nobody awaits them
+        asyncio.get_running_loop().run_in_executor(None, self.reload)
+    
+    def reload(self) -> None:
+        with self._lock:
+            try:
+                version = cache.get(VERSION_KEY)
+                if version is None or version == self.version:
+                    return
+                
+                rows = cache.get(PAYLOAD_KEY)
+                if rows is not None:
+                    self.load(rows, version)
+            except Exception as e:
+                logger.warning("popular_foods_reload_failed", error=str(e))
+
+
+def publish_popular_foods() -> int:
+    since = timezone.now().date() - timedelta(days=POPULARITY_WINDOW_DAYS)
+    
+    ranking = list(
+        FoodLog.objects.filter(date__gte=since, food__is_public=True, food__is_deleted=False)
+        .values('food_id')
+        .annotate(uses=Count('id'))
+        .order_by('-uses')
+        .values_list('food_id', 'uses')[:POPULAR_FOODS_LIMIT]
+    )
+    foods = Food.objects.only('id', 'name', 'brand', 'calories').in_bulk([food_id for food_id, _ in ranking])
+    
+    rows = [
+        [food_id, foods[food_id].name, foods[food_id].brand, str(foods[food_id].calories), uses]
+        for food_id, uses in ranking
+        if food_id in foods
+    ]
+    
+    cache.set(PAYLOAD_KEY, rows, None)
+    cache.set(VERSION_KEY, time.time_ns(), None)
+    
+    return len(rows)
+
+
+popular_foods = PopularFoodsIndex()
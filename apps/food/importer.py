@@ -0,0 +1,198 @@
+import csv
+import gzip
+import io
+import time
+from collections import Counter
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+from django.db import connection, models, transaction
+from django.utils import timezone
+from pydantic import ValidationError
+import orjson
+import structlog
+
+from .autocomplete import publish_popular_foods
+from .models import Food, NUTRIENT_PRECISION
+from .schemas import FoodCreateSchema
+from .services import BarcodeService, FoodService
+
+logger = structlog.get_logger(__name__)
+
+IMPORT_FIELDS = ('name', 'brand', 'calories', 'protein', 'carbs', 'fat', 'fiber', 'sugar', 'serving_size', 'barcode')
+IMPORT_COLUMNS = [Food._meta.get_field(name) for name in IMPORT_FIELDS]
+
+
+class FoodImportService:
+    
+    BATCH_SIZE = 5000
+    
+    @staticmethod
+    def read_file(path: str) -> Iterator[dict]:
+        path = Path(path)
+        suffixes = path.suffixes
+        opener = gzip.open if suffixes[-1:] == ['.gz'] else open
+        file_format = suffixes[-2] if suffixes[-1:] == ['.gz'] and len(suffixes) > 1 else path.suffix
+        
+        with opener(path, 'rb') as raw:
+            if file_format == '.csv':
+                yield from csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8', newline=''))
+            elif file_format in ('.jsonl', '.ndjson'):
+                for number, line in enumerate(raw, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield orjson.loads(line)
+                    except orjson.JSONDecodeError as e:
+                        # Yielded as None so import_rows counts it instead of one bad line aborting the run
+                        logger.warning("food_import_malformed_line", line=number, error=str(e))
+                        yield None
+            else:
+                raise ValueError(f"Unsupported food import format: {path.name}")
+    
+    @staticmethod
+    def import_rows(rows: Iterable[dict], batch_size: int = BATCH_SIZE, verified: bool = False) -> Dict:
+        stats = Counter()
+        started = time.monotonic()
+        rows = iter(rows)
+        
+        # Only one batch is held at a time, so memory is bounded by batch_size regardless of input size
+        while batch := list(islice(rows, batch_size)):
+            stats.update(FoodImportService._import_batch(batch, verified))
+            logger.info("food_import_batch", **stats)
+        
+        if stats['created'] or stats['updated']:
+            # Cached searches and the autocomplete payload still hold the catalog as it was before the import
+            FoodService.invalidate_search_cache()
+            publish_popular_foods()
+        
+        seconds = time.monotonic() - started
+        report = dict(stats, seconds=round(seconds, 2))
+        report['rows_per_second'] = round(stats['read'] / seconds) if seconds else 0
+        
+        logger.info("food_import_finished", **report)
+        
+        return report
+    
+    @staticmethod
+    def _import_batch(batch: List[dict], verified: bool) -> Counter:
+        stats = Counter(read=len(batch))
+        
+        with_barcode = {}
+        without_barcode = {}
+        for row in batch:
+            if not isinstance(row, dict):
+                stats['malformed'] += 1
+                continue
+            
+            try:
+                # CSV dumps use empty strings for missing values; let the schema defaults apply instead
+                data = FoodCreateSchema.model_validate({k: v for k, v in row.items() if v not in ('', None)})
+            except ValidationError:
+                stats['invalid'] += 1
+                continue
+            
+            fields = data.model_dump()
+            fields['brand'] = fields['brand'] or ''
+            fields['barcode'] = (fields['barcode'] or '').strip()
+            
+            # A single out-of-range value would raise DataError and abort the whole batch insert
+            if not FoodImportService._fits_columns(fields):
+                stats['invalid'] += 1
+                continue
+            
+            # Later rows win, so a dump with corrections appended keeps the last version of a product.
+            # Without a barcode, name and brand identify the product, so re-running a dump updates it in place.
+            if fields['barcode']:
+                with_barcode[fields['barcode']] = fields
+            else:
+                without_barcode[fields['name'], fields['brand']] = fields
+        
+        rows = {**with_barcode, **without_barcode}
+        stats['duplicates'] = len(batch) - stats['malformed'] - stats['invalid'] - len(rows)
+        
+        # Descending ids so that, when a product already has several rows, the oldest one is always updated
+        catalog = Food.objects.filter(created_by__isnull=True, is_deleted=False).order_by('-id')
+        existing = dict(catalog.filter(barcode__in=with_barcode.keys()).values_list('barcode', 'id'))
+        existing.update(
+            ((name, brand), food_id)
+            for name, brand, food_id in catalog.filter(
+                barcode='', name__in={name for name, _ in without_barcode},
+            ).values_list('name', 'brand', 'id')
+        )
+        
+        now = timezone.now()
+        updates = [(existing[key], fields) for key, fields in rows.items() if key in existing]
+        creates = [fields for key, fields in rows.items() if key not in existing]
+        
+        # An unverified import must not clear the flag on foods that were verified by hand
+        update_fields = [*IMPORT_FIELDS, 'updated_at', *(['is_verified'] if verified else [])]
+        
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                FoodImportService._copy(updates, creates, update_fields, verified, now)
+            else:
+                Food.objects.bulk_update(
+                    [Food(id=food_id, is_verified=verified, updated_at=now, **fields) for food_id, fields in updates],
+                    update_fields,
+                    batch_size=1000,
+                )
+                Food.objects.bulk_create(
+                    [Food(is_public=True, is_verified=verified, **fields) for fields in creates],
+                    batch_size=1000,
+                )
+        
+        # Bulk writes skip the post_save signals that normally keep the barcode index honest
+        BarcodeService.invalidate_many(list(with_barcode))
+        
+        stats['updated'] = len(updates)
+        stats['created'] = len(creates)
+        
+        return stats
+    
+    @staticmethod
+    def _copy(updates: List[tuple], creates: List[dict], update_fields: List[str], verified: bool, now) -> None:
+        # COPY streams the batch without model instances or the huge CASE/VALUES statements bulk_* generate
+        table = Food._meta.db_table
+        
+        with connection.cursor() as cursor:
+            if updates:
+                columns = ['id', *update_fields]
+                cursor.execute(
+                    f"CREATE TEMP TABLE food_import_updates AS SELECT {', '.join(columns)} FROM {table} WITH NO DATA"
+                )
+                with cursor.copy(f"COPY food_import_updates ({', '.join(columns)}) FROM STDIN") as copy:
+                    for food_id, fields in updates:
+                        row = {**fields, 'id': food_id, 'updated_at': now, 'is_verified': verified}
+                        copy.write_row([row[column] for column in columns])
+                
+                assignments = ', '.join(f"{column} = updates.{column}" for column in update_fields)
+                cursor.execute(
+                    f"UPDATE {table} SET {assignments} FROM food_import_updates updates WHERE {table}.id = updates.id"
+                )
+                # Dropped explicitly: inside an outer transaction each batch only releases a savepoint
+                cursor.execute("DROP TABLE food_import_updates")
+            
+            if creates:
+                columns = [*IMPORT_FIELDS, 'is_public', 'is_verified', 'is_deleted', 'created_at', 'updated_at']
+                with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                    for fields in creates:
+                        copy.write_row([*(fields[name] for name in IMPORT_FIELDS), True, verified, False, now, now])
+    
+    @staticmethod
+    def _fits_columns(fields: dict) -> bool:
+        # Checked against the column definitions directly; Field.run_validators costs more than the schema itself
+        try:
+            for column in IMPORT_COLUMNS:
+                value = fields[column.name]
+                if isinstance(column, models.DecimalField):
+                    # Stored values are rounded to the column scale, so only the remaining digits must fit
+                    value = fields[column.name] = Decimal(value).quantize(NUTRIENT_PRECISION, rounding=ROUND_HALF_UP)
+                    if abs(value) >= 10 ** (column.max_digits - column.decimal_places):
+                        return False
+                elif len(value) > column.max_length:
+                    return False
+        except InvalidOperation:
+            return False
+        return True
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.food.importer import FoodImportService
+
+
+class Command(BaseCommand):
+    help = 'Bulk import a food catalog from CSV or JSONL (optionally gzipped), upserting on barcode'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Path to a .csv, .jsonl or .ndjson file, optionally .gz')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=FoodImportService.BATCH_SIZE,
+            help=f'Rows validated and written per batch (default: {FoodImportService.BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--verified',
+            action='store_true',
+            help='Mark imported foods as verified',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            rows = FoodImportService.read_file(options['path'])
+            report = FoodImportService.import_rows(rows, options['batch_size'], options['verified'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.get('read', 0)} rows in {report['seconds']}s "
+            f"({report['rows_per_second']} rows/s): "
+            f"{report.get('created', 0)} created, {report.get('updated', 0)} updated, "
+            f"{report.get('duplicates', 0)} duplicates, {report.get('invalid', 0)} invalid, "
+            f"{report.get('malformed', 0)} malformed"
+        ))
@@ -0,0 +1,161 @@
+# Generated by Django 5.0 on 2026-10-18 13:47
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Food',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('brand', models.CharField(blank=True, max_length=255)),
+                ('calories', models.DecimalField(decimal_places=2, max_digits=7, validators=[django.core.validators.MinValueValidator(0)])),
+                ('protein', models.DecimalField(decimal_places=2, max_digits=6, validators=[django.core.validators.MinValueValidator(0)])),
+                ('carbs', models.DecimalField(decimal_places=2, max_digits=6, validators=[django.core.validators.MinValueValidator(0)])),
+                ('fat', models.DecimalField(decimal_places=2, max_digits=6, validators=[django.core.validators.MinValueValidator(0)])),
+                ('fiber', models.DecimalField(decimal_places=2, default=0, max_digits=6, validators=[django.core.validators.MinValueValidator(0)])),
+                ('sugar', models.DecimalField(decimal_places=2, default=0, max_digits=6, validators=[django.core.validators.MinValueValidator(0)])),
+                ('serving_size', models.DecimalField(decimal_places=2, default=100, max_digits=7)),
+                ('barcode', models.CharField(blank=True, db_index=True, max_length=50)),
+                ('is_verified', models.BooleanField(default=False)),
+                ('is_public', models.BooleanField(default=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='custom_foods', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'foods',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FoodLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(db_index=True)),
+                ('meal_type', models.CharField(choices=[('breakfast', 'Breakfast'), ('lunch', 'Lunch'), ('dinner', 'Dinner'), ('snack', 'Snack')], max_length=20)),
+                ('serving_amount', models.DecimalField(decimal_places=2, max_digits=7, validators=[django.core.validators.MinValueValidator(0)])),
+                ('calories', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('protein', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('carbs', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('fat', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('notes', models.TextField(blank=True)),
+                ('food', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='logs', to='food.food')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='food_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'food_logs',
+                'ordering': ['-date', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NutritionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('days_logged', models.PositiveSmallIntegerField(default=0)),
+                ('total_calories', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('total_protein', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('total_carbs', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('total_fat', models.DecimalField(decimal_places=2, default=0, max_digits=9)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nutrition_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'nutrition_rollups',
+                'ordering': ['-period_start'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WaterLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(db_index=True)),
+                ('amount_ml', models.IntegerField(validators=[django.core.validators.MinValueValidator(0)])),
+                ('time', models.TimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='water_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'water_logs',
+                'ordering': ['-date', '-time'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(db_index=True)),
+                ('total_calories', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('total_protein', models.DecimalField(decimal_places=2, default=0, max_digits=6)),
+                ('total_carbs', models.DecimalField(decimal_places=2, default=0, max_digits=6)),
+                ('total_fat', models.DecimalField(decimal_places=2, default=0, max_digits=6)),
+                ('target_calories', models.IntegerField(blank=True, null=True)),
+                ('target_protein', models.IntegerField(blank=True, null=True)),
+                ('target_carbs', models.IntegerField(blank=True, null=True)),
+                ('target_fat', models.IntegerField(blank=True, null=True)),
+                ('breakfast_calories', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('lunch_calories', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('dinner_calories', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('snack_calories', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('water_intake_ml', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('weight', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'daily_summaries',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['user', 'date'], name='daily_summa_user_id_4b4570_idx')],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='food',
+            index=models.Index(fields=['name', 'is_public'], name='foods_name_0c31f6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='food',
+            index=models.Index(fields=['barcode'], name='foods_barcode_1c521a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='food',
+            index=models.Index(fields=['created_by', 'is_deleted'], name='foods_created_23497f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodlog',
+            index=models.Index(fields=['user', 'date'], name='food_logs_user_id_9ce3b2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodlog',
+            index=models.Index(fields=['user', 'meal_type'], name='food_logs_user_id_319c57_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='nutritionrollup',
+            unique_together={('user', 'period', 'period_start')},
+        ),
+        migrations.AddIndex(
+            model_name='waterlog',
+            index=models.Index(fields=['user', 'date'], name='water_logs_user_id_3c0f56_idx'),
+        ),
+    ]
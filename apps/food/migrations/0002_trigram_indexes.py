@@ -0,0 +1,46 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+TRIGRAM_INDEXES = (
+    ('name', 'foods_name_trgm_idx'),
+    ('brand', 'foods_brand_trgm_idx'),
+)
+
+
+def pg_trgm_available(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def create_trigram_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    # Other backends and servers without pg_trgm keep the plain icontains search, so the indexes are optional
+    if connection.vendor != 'postgresql' or not pg_trgm_available(connection):
+        return
+    
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    Food = apps.get_model('food', 'Food')
+    for field, name in TRIGRAM_INDEXES:
+        schema_editor.add_index(Food, GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=name))
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    
+    for _, name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
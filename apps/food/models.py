@@ -1,9 +1,21 @@
+from decimal import Decimal, ROUND_HALF_UP
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from apps.core.models import TimeStampedModel, SoftDeleteModel
 from apps.users.models import User
 
 
+NUTRIENT_PRECISION = Decimal('0.01')
+
+
+def calculate_nutrients(food, serving_amount) -> dict:
+    multiplier = Decimal(str(serving_amount)) / 100  # Food nutrition is per 100g
+    return {
+        field: (getattr(food, field) * multiplier).quantize(NUTRIENT_PRECISION, rounding=ROUND_HALF_UP)
+        for field in ('calories', 'protein', 'carbs', 'fat')
+    }
+
+
 class Food(TimeStampedModel, SoftDeleteModel):
     
     name = models.CharField(max_length=255, db_index=True)
@@ -73,11 +85,8 @@ class FoodLog(TimeStampedModel):
     
     def save(self, *args, **kwargs):
         if not self.calories:
-            multiplier = float(self.serving_amount) / 100  # Food nutrition is per 100g
-            self.calories = float(self.food.calories) * multiplier
-            self.protein = float(self.food.protein) * multiplier
-            self.carbs = float(self.food.carbs) * multiplier
-            self.fat = float(self.food.fat) * multiplier
+            for field, value in calculate_nutrients(self.food, self.serving_amount).items():
+                setattr(self, field, value)
         super().save(*args, **kwargs)
 
 
@@ -123,6 +132,33 @@ class DailySummary(TimeStampedModel):
         return 0
 
 
+class NutritionRollup(TimeStampedModel):
+    
+    PERIOD_CHOICES = [
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='nutrition_rollups')
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    
+    # Totals cover logged days only, so averages are totals divided by days_logged
+    days_logged = models.PositiveSmallIntegerField(default=0)
+    total_calories = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    total_protein = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    total_carbs = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    total_fat = models.DecimalField(max_digits=9, decimal_places=2, default=0)
+    
+    class Meta:
+        db_table = 'nutrition_rollups'
+        ordering = ['-period_start']
+        unique_together = [['user', 'period', 'period_start']]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.period} of {self.period_start}"
+
+
 class WaterLog(TimeStampedModel):
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='water_logs')
@@ -60,6 +60,10 @@ class FoodLogCreateSchema(BaseModel):
     notes: Optional[str] = None
 
 
+class FoodLogBatchCreateSchema(BaseModel):
+    items: List[FoodLogCreateSchema] = Field(..., min_length=1, max_length=500)
+
+
 class DailySummarySchema(BaseModel):
     date: date
     total_calories: Decimal
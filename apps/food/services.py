@@ -1,11 +1,27 @@
-from typing import List, Optional, Dict
+import calendar
+import copy
+from collections import Counter
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import date, timedelta
 from decimal import Decimal
-from django.db.models import Sum, Q, Avg, Count
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.db.models import F, Sum, Q, Count, Max, Case, When, Value, BooleanField, FloatField, QuerySet
+from django.db.models.functions import Greatest, Upper
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.core.cache import cache
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from django.utils import timezone
+import hashlib
+import time
+import zlib
 import structlog
 
-from .models import Food, FoodLog, DailySummary, WaterLog
+from .models import Food, FoodLog, DailySummary, NutritionRollup, WaterLog, calculate_nutrients
+from .schemas import DailySummarySchema, FoodLogCreateSchema
+from apps.core.lru import TTLCache
+from apps.core.metrics import CacheMetrics
 from apps.users.models import User, UserProfile
 
 logger = structlog.get_logger(__name__)
@@ -13,38 +29,399 @@ logger = structlog.get_logger(__name__)
 
 class FoodService:
     
+    SEARCH_CACHE_TTL = 300
+    SEARCH_VERSION_KEY = 'food_search_version'
+    SEARCH_LOCK_TTL = 10
+    SEARCH_LOCK_WAIT = 0.05
+    SEARCH_STALE_TTL = 3600
+    SEARCH_ORDER = ('-is_verified', '-is_prefix', '-rank', 'name')
+    PRIVATE_FOODS_TTL = 3600
+    _trigram_enabled: Dict[str, bool] = {}
+    # Only the fields FoodSchema and the bot render, as plain tuples rather than pickled models
+    CACHED_FIELDS = (
+        'id', 'name', 'brand', 'calories', 'protein', 'carbs', 'fat',
+        'fiber', 'sugar', 'serving_size', 'barcode', 'is_verified',
+    )
+    RANK_FIELDS = ('is_prefix', 'rank')
+    
     @staticmethod
     def search_foods(query: str, user: Optional[User] = None, limit: int = 20) -> List[Food]:
-        cache_key = f"food_search:{query}:{user.id if user else 'public'}"
-        cached = cache.get(cache_key)
+        query = ' '.join(query.casefold().split())
         
-        if cached:
-            return cached
+        # The user's own foods are rare, so they skip the shared cache and are merged into the public results by rank
+        private_foods = []
+        if user and FoodService._has_private_foods(user.id):
+            private_foods = list(FoodService._search(Food.objects.filter(created_by=user, is_public=False), query)[:limit])
         
-        q_filter = Q(name__icontains=query) | Q(brand__icontains=query)
+        public_foods = FoodService._search_public(query, limit)
+        private_ids = {food.id for food in private_foods}
         
-        if user:
-            q_filter &= Q(Q(created_by=user) | Q(is_public=True))
-        else:
-            q_filter &= Q(is_public=True)
+        foods = private_foods + [food for food in public_foods if food.id not in private_ids]
+        return sorted(foods, key=FoodService._search_rank)[:limit]
+    
+    @staticmethod
+    def invalidate_private_foods(user_id: int) -> None:
+        cache.delete(f"food_private:{user_id}")
+    
+    @staticmethod
+    def invalidate_search_cache() -> None:
+        # Entries of older generations are never read again and expire with SEARCH_CACHE_TTL
+        cache.set(FoodService.SEARCH_VERSION_KEY, time.time_ns(), None)
+    
+    @staticmethod
+    def _search_public(query: str, limit: int) -> List[Food]:
+        digest = hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+        version = cache.get(FoodService.SEARCH_VERSION_KEY, 0)
+        cache_key = f"food_search:{version}:{digest}:{limit}:ranked"
+        stale_key = f"food_search:stale:{digest}:{limit}"
+        lock_key = f"{cache_key}:lock"
+        
+        rows = cache.get(cache_key)
+        owns_lock = rows is None and cache.add(lock_key, 1, FoodService.SEARCH_LOCK_TTL)
+        
+        # Only one worker recomputes a missing entry; the rest serve the last result for the query,
+        # or wait once for the new one and otherwise query Postgres themselves
+        if rows is None and not owns_lock:
+            rows = cache.get(stale_key)
+            if rows is None:
+                time.sleep(FoodService.SEARCH_LOCK_WAIT)
+                rows = cache.get(cache_key)
+        
+        if rows is not None:
+            CacheMetrics.hit('food_search')
+            return [FoodService._from_row(row) for row in rows]
+        
+        CacheMetrics.miss('food_search')
+        try:
+            rows = list(
+                FoodService._search(Food.objects.filter(is_public=True), query)
+                .values_list(*FoodService.CACHED_FIELDS, *FoodService.RANK_FIELDS)[:limit]
+            )
+            # Empty results are cached too, so repeated misses stop reaching Postgres
+            cache.set(cache_key, rows, FoodService.SEARCH_CACHE_TTL)
+            cache.set(stale_key, rows, FoodService.SEARCH_STALE_TTL)
+        finally:
+            if owns_lock:
+                cache.delete(lock_key)
+        
+        return [FoodService._from_row(row) for row in rows]
+    
+    @staticmethod
+    def _search(foods: QuerySet, query: str) -> QuerySet:
+        foods = foods.filter(is_deleted=False).annotate(
+            is_prefix=Case(
+                When(name__istartswith=query, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+        
+        if FoodService._has_trigram():
+            return FoodService._rank_by_similarity(foods, query)
         
-        foods = Food.objects.filter(q_filter, is_deleted=False).order_by('-is_verified', 'name')[:limit]
-        foods = list(foods)
+        return foods.annotate(rank=Value(0.0, output_field=FloatField())).filter(
+            Q(name__icontains=query) | Q(brand__icontains=query)
+        ).order_by(*FoodService.SEARCH_ORDER)
+    
+    @staticmethod
+    def _search_rank(food: Food) -> tuple:
+        # SEARCH_ORDER in Python, for merging results that were ranked by separate queries
+        return (not food.is_verified, not food.is_prefix, -food.rank, food.name)
+    
+    @staticmethod
+    def _has_private_foods(user_id: int) -> bool:
+        cache_key = f"food_private:{user_id}"
+        has_private = cache.get(cache_key)
+        
+        if has_private is None:
+            has_private = Food.objects.filter(created_by_id=user_id, is_public=False, is_deleted=False).exists()
+            cache.set(cache_key, has_private, FoodService.PRIVATE_FOODS_TTL)
         
-        cache.set(cache_key, foods, 300)  # Cache for 5 minutes
+        return has_private
+    
+    @staticmethod
+    def _has_trigram() -> bool:
+        # pg_trgm is only installed by the food migrations where the server ships it
+        if connection.alias not in FoodService._trigram_enabled:
+            enabled = False
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                    enabled = cursor.fetchone() is not None
+            FoodService._trigram_enabled[connection.alias] = enabled
         
-        return foods
+        return FoodService._trigram_enabled[connection.alias]
+    
+    @staticmethod
+    def _from_row(row: tuple) -> Food:
+        food = Food(**dict(zip(FoodService.CACHED_FIELDS, row)))
+        food.is_prefix, food.rank = row[len(FoodService.CACHED_FIELDS):]
+        return food
+    
+    @staticmethod
+    def _rank_by_similarity(foods: QuerySet, query: str) -> QuerySet:
+        # Every predicate below is served by the UPPER(name|brand) gin_trgm_ops indexes on Food
+        return foods.annotate(
+            search_name=Upper('name'),
+            rank=Greatest(
+                TrigramWordSimilarity(query, 'name'),
+                TrigramWordSimilarity(query, 'brand'),
+            ),
+        ).filter(
+            Q(name__icontains=query)
+            | Q(brand__icontains=query)
+            | Q(search_name__trigram_word_similar=query.upper())
+        ).order_by(*FoodService.SEARCH_ORDER)
     
     @staticmethod
     def get_food_by_barcode(barcode: str) -> Optional[Food]:
+        return BarcodeService.resolve(barcode)
+
+
+class BarcodeService:
+    
+    INDEX_KEY = 'lifemetrics:food_barcodes'
+    MISS_KEY = 'lifemetrics:barcode_miss'
+    # Enough buckets to keep each hash small enough for Redis' compact listpack encoding
+    INDEX_BUCKETS = 16384
+    MISS_TTL = 3600
+    WARMUP_BATCH = 10000
+    
+    @staticmethod
+    def resolve(barcode: str) -> Optional[Food]:
+        food = _local_barcodes.get(barcode)
+        if food is not None:
+            CacheMetrics.hit('barcode')
+            # Copies get their own field and related-object state, so callers never mutate the shared entry
+            return copy.copy(food) if food else None
+        
+        food_id, known_miss = BarcodeService._lookup_index(barcode)
+        
+        if known_miss:
+            food = None
+        elif food_id:
+            food = Food.objects.filter(pk=food_id, barcode=barcode, is_deleted=False).first()
+        
+        if known_miss or (food_id and food):
+            CacheMetrics.hit('barcode')
+        else:
+            CacheMetrics.miss('barcode')
+            food = BarcodeService._resolve_from_db(barcode)
+            BarcodeService._store(barcode, food)
+        
+        _local_barcodes.set(barcode, food or False)
+        return copy.copy(food) if food else None
+    
+    @staticmethod
+    def invalidate(barcode: str) -> None:
+        if not barcode:
+            return
+        
+        _local_barcodes.pop(barcode)
         try:
-            return Food.objects.get(barcode=barcode, is_deleted=False)
-        except Food.DoesNotExist:
-            return None
+            redis_client = get_redis_connection('default')
+            with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hdel(BarcodeService._bucket_key(barcode), barcode)
+                pipe.delete(f"{BarcodeService.MISS_KEY}:{barcode}")
+                pipe.execute()
+        except RedisError as e:
+            logger.warning("barcode_invalidate_failed", barcode=barcode, error=str(e))
+    
+    @staticmethod
+    def invalidate_many(barcodes: List[str]) -> None:
+        if not barcodes:
+            return
+        
+        for barcode in barcodes:
+            _local_barcodes.pop(barcode)
+        try:
+            redis_client = get_redis_connection('default')
+            with redis_client.pipeline(transaction=False) as pipe:
+                for barcode in barcodes:
+                    pipe.hdel(BarcodeService._bucket_key(barcode), barcode)
+                pipe.delete(*[f"{BarcodeService.MISS_KEY}:{barcode}" for barcode in barcodes])
+                pipe.execute()
+        except RedisError as e:
+            logger.warning("barcode_invalidate_failed", barcodes=len(barcodes), error=str(e))
+    
+    @staticmethod
+    def warm_up() -> int:
+        # DISTINCT ON keeps the same preferred row per barcode that _resolve_from_db picks
+        rows = (
+            Food.objects.filter(is_deleted=False)
+            .exclude(barcode='')
+            .order_by('barcode', '-is_verified', 'id')
+            .distinct('barcode')
+            .values_list('barcode', 'id')
+            .iterator(chunk_size=BarcodeService.WARMUP_BATCH)
+        )
+        
+        redis_client = get_redis_connection('default')
+        pipe = redis_client.pipeline(transaction=False)
+        warmed = 0
+        for barcode, food_id in rows:
+            pipe.hset(BarcodeService._bucket_key(barcode), barcode, food_id)
+            warmed += 1
+            if warmed % BarcodeService.WARMUP_BATCH == 0:
+                pipe.execute()
+        pipe.execute()
+        
+        logger.info("barcode_index_warmed", barcodes=warmed)
+        
+        return warmed
+    
+    @staticmethod
+    def _resolve_from_db(barcode: str) -> Optional[Food]:
+        return (
+            Food.objects.filter(barcode=barcode, is_deleted=False)
+            .order_by('-is_verified', 'id')
+            .first()
+        )
+    
+    @staticmethod
+    def _lookup_index(barcode: str):
+        try:
+            redis_client = get_redis_connection('default')
+            with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hget(BarcodeService._bucket_key(barcode), barcode)
+                pipe.exists(f"{BarcodeService.MISS_KEY}:{barcode}")
+                food_id, known_miss = pipe.execute()
+        except RedisError as e:
+            logger.warning("barcode_index_unavailable", error=str(e))
+            return None, False
+        
+        return (int(food_id) if food_id else None), bool(known_miss)
+    
+    @staticmethod
+    def _store(barcode: str, food: Optional[Food]) -> None:
+        try:
+            redis_client = get_redis_connection('default')
+            if food:
+                redis_client.hset(BarcodeService._bucket_key(barcode), barcode, food.id)
+            else:
+                redis_client.set(f"{BarcodeService.MISS_KEY}:{barcode}", 1, ex=BarcodeService.MISS_TTL)
+        except RedisError as e:
+            logger.warning("barcode_index_store_failed", barcode=barcode, error=str(e))
+    
+    @staticmethod
+    def _bucket_key(barcode: str) -> str:
+        return f"{BarcodeService.INDEX_KEY}:{zlib.crc32(barcode.encode()) % BarcodeService.INDEX_BUCKETS}"
+
+
+# Scanner sessions repeat the same codes, so resolved foods (False for misses) stay in process briefly
+_local_barcodes = TTLCache(maxsize=20000, ttl=60)
+
+
+class RecentFoodsService:
+    
+    RECENT_KEY = 'lifemetrics:food_recent'
+    FREQUENT_KEY = 'lifemetrics:food_frequent'
+    RECENT_SIZE = 30
+    FREQUENT_SIZE = 100
+    KEY_TTL = 60 * 60 * 24 * 90
+    SEED_DAYS = 90
+    
+    @staticmethod
+    def record(user_id: int, food_ids: List[int]) -> None:
+        # Runs after commit so a rolled back log never shows up as a one-tap suggestion
+        transaction.on_commit(lambda: RecentFoodsService._record(user_id, food_ids, time.time()))
+    
+    @staticmethod
+    def get_recent_foods(user: User, limit: int = 10) -> List[Food]:
+        recent_ids, frequent_ids = RecentFoodsService._read(user.id, limit)
+        
+        # With Redis down the suggestions still come from the log history, they just aren't stored
+        if not recent_ids and not frequent_ids:
+            recent_ids, frequent_ids = RecentFoodsService._seed(user.id, limit, store=recent_ids is not None)
+        
+        food_ids = list(dict.fromkeys(recent_ids + frequent_ids))
+        foods = Food.objects.filter(
+            Q(created_by=user) | Q(is_public=True),
+            is_deleted=False,
+        ).in_bulk(food_ids)
+        
+        return [foods[food_id] for food_id in food_ids if food_id in foods][:limit]
+    
+    @staticmethod
+    def _record(user_id: int, food_ids: List[int], logged_at: float) -> None:
+        recent_key = f"{RecentFoodsService.RECENT_KEY}:{user_id}"
+        frequent_key = f"{RecentFoodsService.FREQUENT_KEY}:{user_id}"
+        
+        try:
+            redis_client = get_redis_connection('default')
+            with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zadd(recent_key, {food_id: logged_at for food_id in food_ids})
+                for food_id, uses in Counter(food_ids).items():
+                    pipe.zincrby(frequent_key, uses, food_id)
+                pipe.zremrangebyrank(recent_key, 0, -RecentFoodsService.RECENT_SIZE - 1)
+                pipe.zremrangebyrank(frequent_key, 0, -RecentFoodsService.FREQUENT_SIZE - 1)
+                pipe.expire(recent_key, RecentFoodsService.KEY_TTL)
+                pipe.expire(frequent_key, RecentFoodsService.KEY_TTL)
+                pipe.execute()
+        except RedisError as e:
+            logger.warning("recent_foods_record_failed", user_id=user_id, error=str(e))
+    
+    @staticmethod
+    def _read(user_id: int, limit: int):
+        try:
+            redis_client = get_redis_connection('default')
+            with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zrevrange(f"{RecentFoodsService.RECENT_KEY}:{user_id}", 0, limit - 1)
+                pipe.zrevrange(f"{RecentFoodsService.FREQUENT_KEY}:{user_id}", 0, limit - 1)
+                recent_ids, frequent_ids = pipe.execute()
+        except RedisError as e:
+            logger.warning("recent_foods_unavailable", user_id=user_id, error=str(e))
+            return None, None
+        
+        if recent_ids or frequent_ids:
+            CacheMetrics.hit('recent_foods')
+        else:
+            CacheMetrics.miss('recent_foods')
+        
+        return [int(food_id) for food_id in recent_ids], [int(food_id) for food_id in frequent_ids]
+    
+    @staticmethod
+    def _seed(user_id: int, limit: int, store: bool = True):
+        # Users who logged food before the sorted sets existed get them rebuilt from their history once
+        rows = list(
+            FoodLog.objects.filter(
+                user_id=user_id,
+                date__gte=timezone.now().date() - timedelta(days=RecentFoodsService.SEED_DAYS),
+            )
+            .values('food_id')
+            .annotate(uses=Count('id'), last_logged=Max('created_at'))
+            .order_by('-uses')[:RecentFoodsService.FREQUENT_SIZE]
+        )
+        if not rows:
+            return [], []
+        
+        if store:
+            RecentFoodsService._store_seed(user_id, rows)
+        
+        recent = sorted(rows, key=lambda row: row['last_logged'], reverse=True)
+        return [row['food_id'] for row in recent[:limit]], [row['food_id'] for row in rows[:limit]]
+    
+    @staticmethod
+    def _store_seed(user_id: int, rows: List[dict]) -> None:
+        recent_key = f"{RecentFoodsService.RECENT_KEY}:{user_id}"
+        frequent_key = f"{RecentFoodsService.FREQUENT_KEY}:{user_id}"
+        try:
+            redis_client = get_redis_connection('default')
+            with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zadd(recent_key, {row['food_id']: row['last_logged'].timestamp() for row in rows})
+                pipe.zadd(frequent_key, {row['food_id']: row['uses'] for row in rows})
+                pipe.zremrangebyrank(recent_key, 0, -RecentFoodsService.RECENT_SIZE - 1)
+                pipe.expire(recent_key, RecentFoodsService.KEY_TTL)
+                pipe.expire(frequent_key, RecentFoodsService.KEY_TTL)
+                pipe.execute()
+        except RedisError as e:
+            logger.warning("recent_foods_seed_failed", user_id=user_id, error=str(e))
 
 
 class FoodLogService:
     
+    RANGE_FIELDS = ('id', 'date', 'meal_type', 'food_id', 'serving_amount', 'calories', 'protein', 'carbs', 'fat', 'notes')
+    
     @staticmethod
     def log_food(
         user: User,
@@ -56,16 +433,19 @@ class FoodLogService:
     ) -> FoodLog:
         food = Food.objects.get(id=food_id)
         
-        food_log = FoodLog.objects.create(
-            user=user,
-            food=food,
-            date=log_date,
-            meal_type=meal_type,
-            serving_amount=serving_amount,
-            notes=notes,
-        )
+        with transaction.atomic():
+            food_log = FoodLog.objects.create(
+                user=user,
+                food=food,
+                date=log_date,
+                meal_type=meal_type,
+                serving_amount=serving_amount,
+                notes=notes,
+            )
+            DailySummaryService.apply_delta(user, log_date, **DailySummaryService.food_log_delta(food_log))
         
-        DailySummaryService.invalidate_summary_cache(user, log_date)
+        DailySummaryService.invalidate_summary_cache(user.id, log_date)
+        RecentFoodsService.record(user.id, [food_id])
         
         logger.info(
             "food_logged",
@@ -77,6 +457,97 @@ class FoodLogService:
         
         return food_log
     
+    @staticmethod
+    def log_foods(user: User, items: List[FoodLogCreateSchema]) -> List[FoodLog]:
+        foods = Food.objects.in_bulk({item.food_id for item in items})
+        
+        missing = sorted({item.food_id for item in items} - foods.keys())
+        if missing:
+            raise Food.DoesNotExist(f"Food not found: {missing}")
+        
+        food_logs = [
+            FoodLog(
+                user=user,
+                food=foods[item.food_id],
+                date=item.date,
+                meal_type=item.meal_type,
+                serving_amount=item.serving_amount,
+                notes=item.notes or "",
+                **calculate_nutrients(foods[item.food_id], item.serving_amount),
+            )
+            for item in items
+        ]
+        
+        deltas_by_date = {}
+        for food_log in food_logs:
+            deltas = deltas_by_date.setdefault(food_log.date, Counter())
+            deltas.update(DailySummaryService.food_log_delta(food_log))
+        
+        with transaction.atomic():
+            FoodLog.objects.bulk_create(food_logs)
+            for log_date, deltas in deltas_by_date.items():
+                DailySummaryService.apply_delta(user, log_date, **deltas)
+        
+        for log_date in deltas_by_date:
+            DailySummaryService.invalidate_summary_cache(user.id, log_date)
+        RecentFoodsService.record(user.id, [food_log.food_id for food_log in food_logs])
+        
+        logger.info("food_logged_batch", user_id=user.id, count=len(food_logs), dates=len(deltas_by_date))
+        
+        return food_logs
+    
+    @staticmethod
+    def delete_food_log(user: User, food_log: FoodLog) -> None:
+        with transaction.atomic():
+            food_log.delete()
+            DailySummaryService.apply_delta(
+                user,
+                food_log.date,
+                **DailySummaryService.food_log_delta(food_log, sign=-1),
+            )
+        
+        DailySummaryService.invalidate_summary_cache(user.id, food_log.date)
+    
+    @staticmethod
+    def get_logs_page(
+        user: User,
+        start_date: date,
+        end_date: date,
+        after: Optional[Tuple[date, int]] = None,
+        limit: int = 500,
+    ) -> List[dict]:
+        logs = FoodLog.objects.filter(user=user, date__range=(start_date, end_date))
+        
+        # Keyset on (date, id) walks the (user, date) index instead of paying for OFFSET scans
+        if after:
+            after_date, after_id = after
+            # The plain date bound keeps the OR from turning into a scan of the user's whole range
+            logs = logs.filter(date__gte=after_date).filter(Q(date__gt=after_date) | Q(date=after_date, id__gt=after_id))
+        
+        return list(
+            logs.order_by('date', 'id')
+            .values(*FoodLogService.RANGE_FIELDS, food_name=F('food__name'))[:limit]
+        )
+    
+    @staticmethod
+    async def aiter_logs(
+        user: User,
+        start_date: date,
+        end_date: date,
+        after: Optional[Tuple[date, int]] = None,
+        batch_size: int = 2000,
+    ) -> AsyncIterator[dict]:
+        # Async so StreamingHttpResponse streams under ASGI instead of buffering a sync generator
+        get_page = sync_to_async(FoodLogService.get_logs_page)
+        while True:
+            page = await get_page(user, start_date, end_date, after, batch_size)
+            for row in page:
+                yield row
+            
+            if len(page) < batch_size:
+                return
+            after = (page[-1]['date'], page[-1]['id'])
+    
     @staticmethod
     def get_daily_logs(user: User, log_date: date) -> Dict[str, List[FoodLog]]:
         logs = FoodLog.objects.filter(user=user, date=log_date).select_related('food')
@@ -96,17 +567,59 @@ class FoodLogService:
 
 class DailySummaryService:
     
+    MEAL_TYPES = [meal_type for meal_type, _ in FoodLog.MEAL_TYPE_CHOICES]
+    FOOD_TOTAL_FIELDS = [
+        'total_calories',
+        'total_protein',
+        'total_carbs',
+        'total_fat',
+        *[f'{meal_type}_calories' for meal_type in MEAL_TYPES],
+    ]
+    SUMMARY_CACHE_TTL = 300
+    SUMMARY_VERSION_TTL = 2 * 24 * 3600
+    ROLLUP_FIELDS = ['total_calories', 'total_protein', 'total_carbs', 'total_fat']
+    
+    @staticmethod
+    def get_summary(user: User, summary_date: date) -> DailySummarySchema:
+        version = DailySummaryService._get_summary_version(user.id, summary_date)
+        cache_key = f"daily_summary:{user.id}:{summary_date}:{version}"
+        
+        if version is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                CacheMetrics.hit('daily_summary')
+                return DailySummarySchema.model_validate_json(cached)
+        
+        CacheMetrics.miss('daily_summary')
+        summary = DailySummarySchema.model_validate(
+            DailySummaryService.get_or_create_summary(user, summary_date)
+        )
+        
+        # Written under the version read before loading, so a concurrent bump orphans this entry
+        if version is not None:
+            cache.set(cache_key, summary.model_dump_json(), DailySummaryService.SUMMARY_CACHE_TTL)
+        
+        return summary
+    
+    @staticmethod
+    def _get_summary_version(user_id: int, summary_date: date) -> Optional[int]:
+        version_key = f"daily_summary_version:{user_id}:{summary_date}"
+        version = cache.get(version_key)
+        
+        if version is None:
+            # Seeded from the clock so an evicted counter never reuses an old version
+            cache.add(version_key, time.time_ns(), DailySummaryService.SUMMARY_VERSION_TTL)
+            version = cache.get(version_key)
+        
+        return version
+    
     @staticmethod
     def get_or_create_summary(user: User, summary_date: date) -> DailySummary:
-        summary, created = DailySummary.objects.get_or_create(
+        summary, _ = DailySummary.objects.get_or_create(
             user=user,
             date=summary_date,
             defaults=DailySummaryService._get_default_targets(user)
         )
-        
-        if created or DailySummaryService._needs_recalculation(summary):
-            DailySummaryService.recalculate_summary(summary)
-        
         return summary
     
     @staticmethod
@@ -123,92 +636,360 @@ class DailySummaryService:
             return {}
     
     @staticmethod
-    def _needs_recalculation(summary: DailySummary) -> bool:
-        from django.utils import timezone
-        return (timezone.now() - summary.updated_at).seconds > 300
+    def apply_delta(user: User, summary_date: date, **deltas) -> None:
+        changes = {field: F(field) + value for field, value in deltas.items()}
+        changes['updated_at'] = timezone.now()
+        
+        summaries = DailySummary.objects.filter(user=user, date=summary_date)
+        if not summaries.update(**changes):
+            DailySummaryService.get_or_create_summary(user, summary_date)
+            summaries.update(**changes)
+    
+    @staticmethod
+    def food_log_delta(food_log: FoodLog, sign: int = 1) -> Dict[str, Decimal]:
+        return {
+            'total_calories': sign * food_log.calories,
+            'total_protein': sign * food_log.protein,
+            'total_carbs': sign * food_log.carbs,
+            'total_fat': sign * food_log.fat,
+            f'{food_log.meal_type}_calories': sign * food_log.calories,
+        }
     
     @staticmethod
     def recalculate_summary(summary: DailySummary) -> DailySummary:
-        logs = FoodLog.objects.filter(user=summary.user, date=summary.date)
+        return DailySummaryService.recalculate_summaries([summary])[0]
+    
+    @staticmethod
+    def recalculate_summaries(summaries: List[DailySummary]) -> List[DailySummary]:
+        if not summaries:
+            return summaries
         
-        totals = logs.aggregate(
-            total_calories=Sum('calories'),
-            total_protein=Sum('protein'),
-            total_carbs=Sum('carbs'),
-            total_fat=Sum('fat'),
-        )
+        pairs = Q()
+        for summary in summaries:
+            pairs |= Q(user_id=summary.user_id, date=summary.date)
         
-        summary.total_calories = totals['total_calories'] or 0
-        summary.total_protein = totals['total_protein'] or 0
-        summary.total_carbs = totals['total_carbs'] or 0
-        summary.total_fat = totals['total_fat'] or 0
+        food_totals = {
+            (row.pop('user_id'), row.pop('date')): row
+            for row in FoodLog.objects.filter(pairs)
+            .values('user_id', 'date')
+            .order_by()
+            .annotate(**DailySummaryService._food_aggregates())
+        }
+        water_totals = {
+            (row['user_id'], row['date']): row['water_intake_ml']
+            for row in WaterLog.objects.filter(pairs)
+            .values('user_id', 'date')
+            .order_by()
+            .annotate(water_intake_ml=Sum('amount_ml'))
+        }
         
-        for meal_type in ['breakfast', 'lunch', 'dinner', 'snack']:
-            meal_logs = logs.filter(meal_type=meal_type)
-            meal_calories = meal_logs.aggregate(Sum('calories'))['calories__sum'] or 0
-            setattr(summary, f'{meal_type}_calories', meal_calories)
+        now = timezone.now()
+        for summary in summaries:
+            key = (summary.user_id, summary.date)
+            totals = food_totals.get(key, {})
+            for field in DailySummaryService.FOOD_TOTAL_FIELDS:
+                setattr(summary, field, totals.get(field) or 0)
+            summary.water_intake_ml = water_totals.get(key) or 0
+            summary.updated_at = now
+            transaction.on_commit(
+                lambda key=key: DailySummaryService._bump_summary_version(*key)
+            )
         
-        water_logs = WaterLog.objects.filter(user=summary.user, date=summary.date)
-        summary.water_intake_ml = water_logs.aggregate(Sum('amount_ml'))['amount_ml__sum'] or 0
+        DailySummary.objects.bulk_update(
+            summaries,
+            [*DailySummaryService.FOOD_TOTAL_FIELDS, 'water_intake_ml', 'updated_at'],
+        )
+        DailySummaryService.schedule_rollup_refresh([(summary.user_id, summary.date) for summary in summaries])
         
-        summary.save()
+        logger.info("summaries_recalculated", count=len(summaries))
         
-        logger.info(
-            "summary_recalculated",
-            user_id=summary.user.id,
-            date=str(summary.date),
-            total_calories=float(summary.total_calories),
+        return summaries
+    
+    @staticmethod
+    def rollup_summaries(summary_date: date, after_user_id: int, until_user_id: int) -> int:
+        meal_sums = ',\n'.join(
+            f"SUM(calories) FILTER (WHERE meal_type = '{meal_type}') AS {meal_type}_calories"
+            for meal_type in DailySummaryService.MEAL_TYPES
         )
+        total_columns = [*DailySummaryService.FOOD_TOTAL_FIELDS, 'water_intake_ml']
+        total_values = [
+            *[f'COALESCE(food.{column}, 0)' for column in DailySummaryService.FOOD_TOTAL_FIELDS],
+            'COALESCE(water.water_intake_ml, 0)',
+        ]
         
-        return summary
+        sql = f"""
+            WITH food AS (
+                SELECT user_id,
+                       SUM(calories) AS total_calories,
+                       SUM(protein) AS total_protein,
+                       SUM(carbs) AS total_carbs,
+                       SUM(fat) AS total_fat,
+                       {meal_sums}
+                FROM food_logs
+                WHERE date = %(date)s AND user_id > %(after)s AND user_id <= %(until)s
+                GROUP BY user_id
+            ),
+            water AS (
+                SELECT user_id, SUM(amount_ml) AS water_intake_ml
+                FROM water_logs
+                WHERE date = %(date)s AND user_id > %(after)s AND user_id <= %(until)s
+                GROUP BY user_id
+            )
+            INSERT INTO daily_summaries (
+                created_at, updated_at, user_id, date,
+                target_calories, target_protein, target_carbs, target_fat,
+                {', '.join(total_columns)}
+            )
+            SELECT now(), now(), users.id, %(date)s,
+                   profile.daily_calorie_target, profile.daily_protein_target,
+                   profile.daily_carbs_target, profile.daily_fat_target,
+                   {', '.join(total_values)}
+            FROM food FULL OUTER JOIN water ON water.user_id = food.user_id
+            JOIN users ON users.id = COALESCE(food.user_id, water.user_id)
+            LEFT JOIN user_profiles AS profile ON profile.user_id = users.id
+            WHERE users.is_active
+            ON CONFLICT (user_id, date) DO UPDATE SET
+                updated_at = EXCLUDED.updated_at,
+                {', '.join(f'{column} = EXCLUDED.{column}' for column in total_columns)}
+        """
+        
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {'date': summary_date, 'after': after_user_id, 'until': until_user_id})
+            return cursor.rowcount
+    
+    @staticmethod
+    def apply_profile_targets(after_user_id: int, until_user_id: int, from_date: date) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE daily_summaries AS summaries SET
+                    target_calories = profile.daily_calorie_target,
+                    target_protein = profile.daily_protein_target,
+                    target_carbs = profile.daily_carbs_target,
+                    target_fat = profile.daily_fat_target,
+                    updated_at = now()
+                FROM user_profiles AS profile
+                WHERE profile.user_id = summaries.user_id
+                  AND summaries.date >= %(from_date)s
+                  AND summaries.user_id > %(after)s AND summaries.user_id <= %(until)s
+                RETURNING summaries.user_id, summaries.date
+                """,
+                {'from_date': from_date, 'after': after_user_id, 'until': until_user_id},
+            )
+            changed = cursor.fetchall()
+        
+        # Targets do not feed the rollups, so only the cached summaries need a new version
+        def bump_versions():
+            for user_id, summary_date in changed:
+                DailySummaryService._bump_summary_version(user_id, summary_date)
+        
+        transaction.on_commit(bump_versions)
+        
+        return len(changed)
+    
+    @staticmethod
+    def _food_aggregates() -> Dict:
+        aggregates = {
+            'total_calories': Sum('calories'),
+            'total_protein': Sum('protein'),
+            'total_carbs': Sum('carbs'),
+            'total_fat': Sum('fat'),
+        }
+        for meal_type in DailySummaryService.MEAL_TYPES:
+            aggregates[f'{meal_type}_calories'] = Sum('calories', filter=Q(meal_type=meal_type))
+        return aggregates
+    
+    @staticmethod
+    def invalidate_summary_cache(user_id: int, summary_date: date):
+        transaction.on_commit(lambda: DailySummaryService._bump_summary_version(user_id, summary_date))
+        # Every summary write funnels through here, which keeps the week and month rollups in step
+        DailySummaryService.schedule_rollup_refresh([(user_id, summary_date)])
     
     @staticmethod
-    def invalidate_summary_cache(user: User, summary_date: date):
-        cache_key = f"daily_summary:{user.id}:{summary_date}"
-        cache.delete(cache_key)
+    def schedule_rollup_refresh(keys: List[Tuple[int, date]]) -> None:
+        from .tasks import refresh_user_rollups
+        
+        # One refresh per user and month, spanning only the days that changed, instead of one per summary
+        spans = {}
+        for user_id, summary_date in keys:
+            span_key = (user_id, summary_date.replace(day=1))
+            first, last = spans.get(span_key, (summary_date, summary_date))
+            spans[span_key] = (min(first, summary_date), max(last, summary_date))
+        
+        def dispatch():
+            for (user_id, _), (first, last) in spans.items():
+                refresh_user_rollups.delay(user_id, first.isoformat(), last.isoformat())
+        
+        transaction.on_commit(dispatch)
+    
+    @staticmethod
+    def _bump_summary_version(user_id: int, summary_date: date):
+        version_key = f"daily_summary_version:{user_id}:{summary_date}"
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.add(version_key, time.time_ns(), DailySummaryService.SUMMARY_VERSION_TTL)
     
     @staticmethod
     def get_period_stats(user: User, start_date: date, end_date: date) -> Dict:
-        summaries = DailySummary.objects.filter(
-            user=user,
-            date__range=[start_date, end_date]
-        )
+        months, weeks, day_ranges = DailySummaryService._period_buckets(start_date, end_date)
+        totals = Counter()
         
-        stats = summaries.aggregate(
-            avg_calories=Avg('total_calories'),
-            avg_protein=Avg('total_protein'),
-            avg_carbs=Avg('total_carbs'),
-            avg_fat=Avg('total_fat'),
-            days_logged=Count('id'),
-        )
+        # Whole months and weeks come from pre-aggregated rollups; only the ragged edges scan daily rows
+        if months or weeks:
+            rollups = {
+                (row.pop('period'), row.pop('period_start')): row
+                for row in NutritionRollup.objects.filter(
+                    Q(period='month', period_start__in=months) | Q(period='week', period_start__in=weeks),
+                    user=user,
+                ).values('period', 'period_start', 'days_logged', *DailySummaryService.ROLLUP_FIELDS)
+            }
+            buckets = [('month', month, _month_end(month)) for month in months]
+            buckets += [('week', week, week + timedelta(days=6)) for week in weeks]
+            
+            for period, period_start, period_end in buckets:
+                rollup = rollups.get((period, period_start))
+                # A bucket that was never rolled up (e.g. history from before rollups existed) is summed from daily rows
+                if rollup is None:
+                    day_ranges.append((period_start, period_end))
+                else:
+                    totals.update(rollup)
+        
+        if day_ranges:
+            date_filter = Q()
+            for day_range in day_ranges:
+                date_filter |= Q(date__range=day_range)
+            
+            days = DailySummary.objects.filter(date_filter, user=user, total_calories__gt=0).aggregate(
+                days_logged=Count('id'),
+                **{field: Sum(field) for field in DailySummaryService.ROLLUP_FIELDS},
+            )
+            totals.update({field: value for field, value in days.items() if value is not None})
         
+        days_logged = totals['days_logged']
         total_days = (end_date - start_date).days + 1
-        adherence = (stats['days_logged'] / total_days * 100) if total_days > 0 else 0
+        adherence = (days_logged / total_days * 100) if total_days > 0 else 0
+        
+        def average(field):
+            return float(totals[field]) / days_logged if days_logged else 0.0
         
         return {
-            'avg_calories': float(stats['avg_calories'] or 0),
-            'avg_protein': float(stats['avg_protein'] or 0),
-            'avg_carbs': float(stats['avg_carbs'] or 0),
-            'avg_fat': float(stats['avg_fat'] or 0),
-            'days_logged': stats['days_logged'],
+            'avg_calories': average('total_calories'),
+            'avg_protein': average('total_protein'),
+            'avg_carbs': average('total_carbs'),
+            'avg_fat': average('total_fat'),
+            'days_logged': days_logged,
             'total_days': total_days,
             'adherence_percentage': round(adherence, 2),
         }
+    
+    @staticmethod
+    def refresh_rollups(after_user_id: int, until_user_id: int, start_date: date, end_date: date) -> int:
+        first_week = start_date - timedelta(days=start_date.weekday())
+        last_week = end_date - timedelta(days=end_date.weekday())
+        first_month = start_date.replace(day=1)
+        last_month = end_date.replace(day=1)
+        
+        # Scan whole buckets so every week and month touched by [start_date, end_date] is recomputed in full
+        scan_from = min(first_week, first_month)
+        scan_to = max(last_week + timedelta(days=6), _month_end(last_month))
+        
+        rollup_sums = ',\n'.join(
+            f"COALESCE(SUM({field}) FILTER (WHERE total_calories > 0), 0)"
+            for field in DailySummaryService.ROLLUP_FIELDS
+        )
+        
+        sql = f"""
+            INSERT INTO nutrition_rollups (
+                created_at, updated_at, user_id, period, period_start,
+                days_logged, {', '.join(DailySummaryService.ROLLUP_FIELDS)}
+            )
+            SELECT now(), now(), summaries.user_id, bucket.period, bucket.period_start,
+                   COUNT(*) FILTER (WHERE total_calories > 0),
+                   {rollup_sums}
+            FROM daily_summaries AS summaries
+            CROSS JOIN LATERAL (VALUES
+                ('week', date_trunc('week', summaries.date)::date),
+                ('month', date_trunc('month', summaries.date)::date)
+            ) AS bucket(period, period_start)
+            WHERE summaries.user_id > %(after)s AND summaries.user_id <= %(until)s
+              AND summaries.date BETWEEN %(scan_from)s AND %(scan_to)s
+              AND (
+                  (bucket.period = 'week' AND bucket.period_start BETWEEN %(first_week)s AND %(last_week)s)
+                  OR (bucket.period = 'month' AND bucket.period_start BETWEEN %(first_month)s AND %(last_month)s)
+              )
+            GROUP BY summaries.user_id, bucket.period, bucket.period_start
+            ON CONFLICT (user_id, period, period_start) DO UPDATE SET
+                updated_at = EXCLUDED.updated_at,
+                days_logged = EXCLUDED.days_logged,
+                {', '.join(f'{field} = EXCLUDED.{field}' for field in DailySummaryService.ROLLUP_FIELDS)}
+        """
+        
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {
+                'after': after_user_id,
+                'until': until_user_id,
+                'scan_from': scan_from,
+                'scan_to': scan_to,
+                'first_week': first_week,
+                'last_week': last_week,
+                'first_month': first_month,
+                'last_month': last_month,
+            })
+            return cursor.rowcount
+    
+    @staticmethod
+    def _period_buckets(start_date: date, end_date: date):
+        months = []
+        month = start_date if start_date.day == 1 else _month_end(start_date) + timedelta(days=1)
+        while _month_end(month) <= end_date:
+            months.append(month)
+            month = _month_end(month) + timedelta(days=1)
+        
+        if months:
+            segments = [(start_date, months[0] - timedelta(days=1)), (month, end_date)]
+        else:
+            segments = [(start_date, end_date)]
+        
+        weeks, day_ranges = [], []
+        for segment_start, segment_end in segments:
+            if segment_start > segment_end:
+                continue
+            
+            week = segment_start + timedelta(days=(7 - segment_start.weekday()) % 7)
+            first_week = week
+            while week + timedelta(days=6) <= segment_end:
+                weeks.append(week)
+                week += timedelta(days=7)
+            
+            if week == first_week:
+                day_ranges.append((segment_start, segment_end))
+                continue
+            if segment_start < first_week:
+                day_ranges.append((segment_start, first_week - timedelta(days=1)))
+            if week <= segment_end:
+                day_ranges.append((week, segment_end))
+        
+        return months, weeks, day_ranges
+
+
+def _month_end(day: date) -> date:
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
 
 
 class WaterService:
     
     @staticmethod
     def log_water(user: User, amount_ml: int, log_date: date) -> WaterLog:
-        water_log = WaterLog.objects.create(
-            user=user,
-            date=log_date,
-            amount_ml=amount_ml,
-        )
+        with transaction.atomic():
+            water_log = WaterLog.objects.create(
+                user=user,
+                date=log_date,
+                amount_ml=amount_ml,
+            )
+            DailySummaryService.apply_delta(user, log_date, water_intake_ml=amount_ml)
         
-        summary = DailySummaryService.get_or_create_summary(user, log_date)
-        summary.water_intake_ml += amount_ml
-        summary.save()
+        DailySummaryService.invalidate_summary_cache(user.id, log_date)
         
         logger.info("water_logged", user_id=user.id, amount_ml=amount_ml)
         
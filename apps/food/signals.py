@@ -0,0 +1,23 @@
+from django.db import transaction
+
+
+def remember_barcode(sender, instance, **kwargs):
+    # A changed barcode must also be dropped under its old value, which the instance no longer carries
+    instance._previous_barcode = (
+        sender.objects.filter(pk=instance.pk).values_list('barcode', flat=True).first() if instance.pk else None
+    )
+
+
+def invalidate_barcode(sender, instance, **kwargs):
+    from .services import BarcodeService
+    
+    barcodes = list({instance.barcode, getattr(instance, '_previous_barcode', None)} - {None, ''})
+    transaction.on_commit(lambda: BarcodeService.invalidate_many(barcodes))
+
+
+def invalidate_private_foods(sender, instance, **kwargs):
+    from .services import FoodService
+    
+    if instance.created_by_id and not instance.is_public:
+        user_id = instance.created_by_id
+        transaction.on_commit(lambda: FoodService.invalidate_private_foods(user_id))
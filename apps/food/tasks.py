@@ -3,35 +3,80 @@ from datetime import date, timedelta
 from django.utils import timezone
 import structlog
 
+from apps.core.fanout import FanOutService, chunk_task
 from apps.users.models import User
-from .services import DailySummaryService
+from .autocomplete import publish_popular_foods
+from .services import BarcodeService, DailySummaryService
 
 logger = structlog.get_logger(__name__)
 
+ROLLUP_CHUNK_SIZE = 50000  # users per statement, keeps each rollup under statement_timeout
+
 
 @shared_task(bind=True, max_retries=3)
 def calculate_daily_summaries(self):
     try:
         yesterday = (timezone.now() - timedelta(days=1)).date()
-        users = User.objects.filter(is_active=True)
-        
-        processed = 0
-        for user in users:
-            try:
-                summary = DailySummaryService.get_or_create_summary(user, yesterday)
-                DailySummaryService.recalculate_summary(summary)
-                processed += 1
-            except Exception as e:
-                logger.error("failed_to_calculate_summary", user_id=user.id, error=str(e))
         
-        logger.info("daily_summaries_calculated", processed=processed, total=users.count())
-        
-        return f"Calculated {processed} summaries"
+        return FanOutService.dispatch(
+            'calculate_daily_summaries',
+            User.objects.filter(is_active=True),
+            calculate_daily_summaries_chunk,
+            yesterday.isoformat(),
+            chunk_size=ROLLUP_CHUNK_SIZE,
+        )
     except Exception as e:
         logger.error("calculate_summaries_failed", error=str(e))
         raise self.retry(exc=e, countdown=300)
 
 
+@chunk_task()
+def calculate_daily_summaries_chunk(lower, upper, summary_date: str):
+    summary_date = date.fromisoformat(summary_date)
+    processed = DailySummaryService.rollup_summaries(summary_date, lower or 0, upper)
+    rollups = DailySummaryService.refresh_rollups(lower or 0, upper, summary_date, summary_date)
+    
+    logger.info("daily_summaries_calculated", processed=processed, rollups=rollups, date=str(summary_date))
+    return {'processed': processed, 'rollups': rollups}
+
+
+@shared_task(bind=True, max_retries=3)
+def rebuild_nutrition_rollups(self, since: str):
+    try:
+        return FanOutService.dispatch(
+            'rebuild_nutrition_rollups',
+            User.objects.all(),
+            rebuild_nutrition_rollups_chunk,
+            since,
+            timezone.now().date().isoformat(),
+            chunk_size=ROLLUP_CHUNK_SIZE,
+        )
+    except Exception as e:
+        logger.error("rebuild_nutrition_rollups_failed", error=str(e))
+        raise self.retry(exc=e, countdown=300)
+
+
+@chunk_task()
+def rebuild_nutrition_rollups_chunk(lower, upper, since: str, until: str):
+    rollups = DailySummaryService.refresh_rollups(
+        lower or 0, upper, date.fromisoformat(since), date.fromisoformat(until)
+    )
+    
+    logger.info("nutrition_rollups_rebuilt", rollups=rollups, since=since, until=until)
+    return {'rollups': rollups}
+
+
+@shared_task(bind=True, max_retries=3)
+def refresh_user_rollups(self, user_id: int, start_date: str, end_date: str):
+    try:
+        return DailySummaryService.refresh_rollups(
+            user_id - 1, user_id, date.fromisoformat(start_date), date.fromisoformat(end_date)
+        )
+    except Exception as e:
+        logger.error("refresh_user_rollups_failed", user_id=user_id, error=str(e))
+        raise self.retry(exc=e, countdown=60)
+
+
 @shared_task(bind=True)
 def recalculate_user_summary(self, user_id: int, summary_date: str):
     try:
@@ -47,3 +92,24 @@ def recalculate_user_summary(self, user_id: int, summary_date: str):
     except Exception as e:
         logger.error("recalculate_summary_failed", user_id=user_id, error=str(e))
         raise
+
+
+@shared_task(bind=True, max_retries=3)
+def warm_barcode_index(self):
+    try:
+        warmed = BarcodeService.warm_up()
+        return f"Warmed {warmed} barcodes"
+    except Exception as e:
+        logger.error("warm_barcode_index_failed", error=str(e))
+        raise self.retry(exc=e, countdown=300)
+
+
+@shared_task(bind=True, max_retries=3)
+def refresh_popular_foods(self):
+    try:
+        published = publish_popular_foods()
+        logger.info("popular_foods_refreshed", foods=published)
+        return f"Published {published} popular foods"
+    except Exception as e:
+        logger.error("refresh_popular_foods_failed", error=str(e))
+        raise self.retry(exc=e, countdown=300)
@@ -4,6 +4,7 @@ from datetime import date
 from decimal import Decimal
 from apps.core.auth import AuthBearer
 from .models import Goal, Achievement, UserAchievement
+from .services import GoalProgressService
 from pydantic import BaseModel, Field
 
 
@@ -50,6 +51,7 @@ class AchievementSchema(BaseModel):
 def create_goal(request, data: GoalCreateSchema):
     goal = Goal.objects.create(
         user=request.auth,
+        start_value=GoalProgressService.start_value(request.auth.id, data.goal_type, data.start_date),
         **data.dict()
     )
     return goal
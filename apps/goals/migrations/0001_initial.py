@@ -0,0 +1,74 @@
+# Generated by Django 5.0 on 2026-10-18 14:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Achievement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('category', models.CharField(choices=[('streak', 'Streak'), ('milestone', 'Milestone'), ('consistency', 'Consistency'), ('challenge', 'Challenge')], max_length=20)),
+                ('icon', models.CharField(blank=True, max_length=100)),
+                ('points', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'achievements',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Goal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('goal_type', models.CharField(choices=[('weight', 'Weight Goal'), ('calories', 'Daily Calories'), ('workout_frequency', 'Workout Frequency'), ('water', 'Daily Water'), ('sleep', 'Sleep Duration')], max_length=20)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('target_value', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('current_value', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('start_value', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('start_date', models.DateField()),
+                ('target_date', models.DateField()),
+                ('completed_date', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('completed', 'Completed'), ('failed', 'Failed'), ('abandoned', 'Abandoned')], default='active', max_length=20)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='goals', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'goals',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'status'], name='goals_user_id_49fd29_idx'), models.Index(fields=['user', 'goal_type'], name='goals_user_id_d50d5e_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserAchievement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('earned_at', models.DateTimeField(auto_now_add=True)),
+                ('achievement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='goals.achievement')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='achievements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_achievements',
+                'ordering': ['-earned_at'],
+                'unique_together': {('user', 'achievement')},
+            },
+        ),
+    ]
@@ -29,6 +29,7 @@ class Goal(TimeStampedModel):
     
     target_value = models.DecimalField(max_digits=10, decimal_places=2)
     current_value = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    start_value = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     
     start_date = models.DateField()
     target_date = models.DateField()
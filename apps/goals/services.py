@@ -0,0 +1,146 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from django.db import transaction
+from django.db.models import Avg, Count, DecimalField, F, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+import structlog
+
+from apps.core.fanout import FanOutService
+from apps.food.models import DailySummary
+from apps.sleep.models import SleepLog
+from apps.users.models import UserProfile
+from apps.workouts.models import WorkoutLog
+from .models import Goal
+
+logger = structlog.get_logger(__name__)
+
+NOTIFICATION_BATCH_SIZE = 100
+
+
+class GoalProgressService:
+    
+    # Reached as soon as current_value crosses target_value
+    MILESTONE_GOALS = ('weight', 'workout_frequency')
+    # Averages over the whole goal period, judged once target_date has passed
+    PERIOD_GOALS = ('calories', 'water', 'sleep')
+    
+    @staticmethod
+    def evaluate(lower: Any, upper: Any, today: date) -> Dict[str, int]:
+        active = FanOutService.in_range(Goal.objects.filter(status='active'), lower, upper, key='user_id')
+        
+        evaluated = 0
+        for goal_type, value in GoalProgressService._current_values(today).items():
+            # One UPDATE per goal type: the subquery aggregates the source table for every goal at once
+            evaluated += active.filter(goal_type=goal_type).update(
+                current_value=Coalesce(value, F('current_value'), output_field=DecimalField()),
+            )
+        
+        with transaction.atomic():
+            completed = GoalProgressService._close(
+                active.filter(GoalProgressService._completed_condition(today)),
+                'completed',
+                today,
+            )
+            failed = GoalProgressService._close(active.filter(target_date__lt=today), 'failed', today)
+        
+        notifications = [(user_id, title) for _, user_id, title, telegram_id in completed if telegram_id]
+        transaction.on_commit(lambda: GoalProgressService.notify(notifications))
+        
+        return {'evaluated': evaluated, 'completed': len(completed), 'failed': len(failed)}
+    
+    @staticmethod
+    def notify(notifications: List[Tuple[int, str]]) -> None:
+        from apps.telegram_bot.tasks import send_achievement_notification
+        
+        if notifications:
+            send_achievement_notification.chunks(notifications, NOTIFICATION_BATCH_SIZE).apply_async()
+    
+    @staticmethod
+    def _current_values(today: date) -> Dict[str, Subquery]:
+        def window(queryset: QuerySet) -> QuerySet:
+            return queryset.filter(
+                user_id=OuterRef('user_id'),
+                date__gte=OuterRef('start_date'),
+                date__lte=OuterRef('target_date'),
+            ).filter(date__lte=today)
+        
+        def aggregate(queryset: QuerySet, expression) -> Subquery:
+            return Subquery(
+                window(queryset).values('user_id').annotate(value=expression).values('value')[:1],
+                output_field=DecimalField(),
+            )
+        
+        return {
+            'weight': Coalesce(
+                Subquery(
+                    window(DailySummary.objects.filter(weight__isnull=False)).order_by('-date').values('weight')[:1]
+                ),
+                Subquery(UserProfile.objects.filter(user_id=OuterRef('user_id')).values('weight')[:1]),
+                output_field=DecimalField(),
+            ),
+            'workout_frequency': Coalesce(
+                aggregate(WorkoutLog.objects.all(), Count('id')),
+                Value(0),
+                output_field=DecimalField(),
+            ),
+            'calories': aggregate(DailySummary.objects.filter(total_calories__gt=0), Avg('total_calories')),
+            'water': aggregate(DailySummary.objects.filter(water_intake_ml__gt=0), Avg('water_intake_ml')),
+            'sleep': aggregate(SleepLog.objects.all(), Avg('duration_hours')),
+        }
+    
+    @staticmethod
+    def start_value(user_id: int, goal_type: str, start_date: date) -> Optional[Decimal]:
+        if goal_type != 'weight':
+            return None
+        
+        # The last weigh-in up to the start, else the profile weight; _completed_condition falls back the same way
+        weight = (
+            DailySummary.objects.filter(user_id=user_id, date__lte=start_date, weight__isnull=False)
+            .order_by('-date')
+            .values_list('weight', flat=True)
+            .first()
+        )
+        if weight is None:
+            weight = UserProfile.objects.filter(user_id=user_id).values_list('weight', flat=True).first()
+        return weight
+    
+    @staticmethod
+    def _completed_condition(today: date) -> Q:
+        # Weight goals can point either way, so the weight when the goal was set decides the direction.
+        # Goals created before start_value was stored derive it the way start_value() does.
+        start_weight = Coalesce(
+            F('start_value'),
+            Subquery(
+                DailySummary.objects.filter(
+                    user_id=OuterRef('user_id'),
+                    date__lte=OuterRef('start_date'),
+                    weight__isnull=False,
+                ).order_by('-date').values('weight')[:1]
+            ),
+            Subquery(UserProfile.objects.filter(user_id=OuterRef('user_id')).values('weight')[:1]),
+            F('current_value'),
+            output_field=DecimalField(),
+        )
+        losing = Q(goal_type='weight') & Q(target_value__lt=start_weight)
+        period_over = Q(goal_type__in=GoalProgressService.PERIOD_GOALS, target_date__lt=today)
+        
+        return (
+            (losing & Q(current_value__lte=F('target_value')))
+            | (Q(goal_type='weight') & ~Q(target_value__lt=start_weight) & Q(current_value__gte=F('target_value')))
+            | Q(goal_type='workout_frequency', current_value__gte=F('target_value'))
+            | (period_over & Q(goal_type='calories', current_value__gt=0, current_value__lte=F('target_value')))
+            | (period_over & Q(goal_type__in=('water', 'sleep'), current_value__gte=F('target_value')))
+        )
+    
+    @staticmethod
+    def _close(goals: QuerySet, status: str, today: date) -> List[Tuple]:
+        closed = list(goals.select_for_update(of=('self',)).values_list('id', 'user_id', 'title', 'user__telegram_id'))
+        if closed:
+            Goal.objects.filter(id__in=[goal_id for goal_id, *_ in closed]).update(
+                status=status,
+                completed_date=today if status == 'completed' else None,
+                updated_at=timezone.now(),
+            )
+        return closed
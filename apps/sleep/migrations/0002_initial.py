@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-18 13:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('sleep', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sleeplog',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sleep_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='sleeplog',
+            index=models.Index(fields=['user', 'date'], name='sleep_logs_user_id_3af8b4_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='sleeplog',
+            unique_together={('user', 'date')},
+        ),
+    ]
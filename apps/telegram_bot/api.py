@@ -1,5 +1,7 @@
 from ninja import Router
 from django.http import HttpResponse
+import hmac
+import orjson
 import structlog
 
 router = Router()
@@ -8,6 +10,21 @@ logger = structlog.get_logger(__name__)
 
 @router.post("/webhook", auth=None)
 async def telegram_webhook(request):
+    from django.conf import settings
+    from .bot import redis_client
+    from .updates import enqueue_update
+    
+    secret = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+    if not settings.TELEGRAM_WEBHOOK_SECRET or not hmac.compare_digest(secret, settings.TELEGRAM_WEBHOOK_SECRET):
+        logger.warning("telegram_webhook_rejected")
+        return HttpResponse(status=403)
+    
+    try:
+        await enqueue_update(redis_client, request.body)
+    except orjson.JSONDecodeError:
+        logger.warning("telegram_webhook_invalid_payload")
+        return HttpResponse(status=400)
+    
     return HttpResponse("OK")
 
 
@@ -1,5 +1,7 @@
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ParseMode
 from aiogram.fsm.storage.redis import RedisStorage
 from django.conf import settings
@@ -9,8 +11,13 @@ import redis.asyncio as redis
 redis_client = redis.from_url(settings.REDIS_URL)
 storage = RedisStorage(redis_client)
 
+session = None
+if settings.TELEGRAM_API_SERVER:
+    session = AiohttpSession(api=TelegramAPIServer.from_base(settings.TELEGRAM_API_SERVER))
+
 bot = Bot(
     token=settings.TELEGRAM_BOT_TOKEN,
+    session=session,
     default=DefaultBotProperties(parse_mode=ParseMode.HTML)
 )
 dp = Dispatcher(storage=storage)
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError, TelegramRetryAfter
+from django.conf import settings
+from redis.exceptions import RedisError
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_in_worker_loop(coro):
+    # One long-lived loop per worker process, so the bot's aiohttp session is pooled across tasks
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_loop.run_until_complete(coro)
+
+
+class TokenBucket:
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class SharedRateWindow:
+    
+    def __init__(self, redis_client, key: str, limit: int):
+        self.redis = redis_client
+        self.key = key
+        self.limit = limit
+    
+    async def acquire(self) -> None:
+        while True:
+            second = int(time.time())
+            window_key = f"{self.key}:{second}"
+            
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.incr(window_key)
+                    pipe.expire(window_key, 2)
+                    count, _ = await pipe.execute()
+            except RedisError as e:
+                # Degrade to the per-process bucket rather than stall the broadcast
+                logger.warning("broadcast_rate_window_unavailable", error=str(e))
+                return
+            
+            if count <= self.limit:
+                return
+            
+            await asyncio.sleep(max(second + 1 - time.time(), 0))
+
+
+class BroadcastEngine:
+    
+    def __init__(
+        self,
+        bot: Bot,
+        rate: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_retries: int = 3,
+        redis_client=None,
+    ):
+        self.bot = bot
+        self.rate = rate or settings.TELEGRAM_BROADCAST_RATE
+        self.bucket = TokenBucket(self.rate)
+        self.window = SharedRateWindow(redis_client, "telegram_broadcast_rate", self.rate) if redis_client else None
+        self.semaphore = asyncio.Semaphore(concurrency or settings.TELEGRAM_BROADCAST_CONCURRENCY)
+        self.max_retries = max_retries
+        self.chat_next_send: Dict[int, float] = {}
+        self.stats = Counter()
+    
+    async def broadcast(self, messages: Iterable[Tuple[int, str]]) -> Dict:
+        started = time.monotonic()
+        
+        await asyncio.gather(*(self._send_bounded(chat_id, text) for chat_id, text in messages))
+        
+        duration = time.monotonic() - started
+        stats = dict(self.stats)
+        logger.info(
+            "broadcast_finished",
+            duration=f"{duration:.3f}s",
+            messages_per_second=round(self.stats['sent'] / duration, 2) if duration else 0,
+            **stats,
+        )
+        return stats
+    
+    async def _send_bounded(self, chat_id: int, text: str) -> None:
+        async with self.semaphore:
+            self.stats[await self.send(chat_id, text)] += 1
+    
+    async def send(self, chat_id: int, text: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_chat(chat_id)
+            await self.bucket.acquire()
+            if self.window:
+                await self.window.acquire()
+            
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text)
+                return 'sent'
+            except TelegramRetryAfter as e:
+                # Flood wait applies bot-wide, so the whole bucket backs off
+                self.stats['retried'] += 1
+                self.bucket.pause(e.retry_after)
+                logger.warning("broadcast_flood_wait", chat_id=chat_id, retry_after=e.retry_after, attempt=attempt)
+            except TelegramForbiddenError:
+                return 'blocked'
+            except TelegramAPIError as e:
+                logger.error("broadcast_send_failed", chat_id=chat_id, error=str(e))
+                return 'failed'
+        
+        return 'failed'
+    
+    async def _wait_for_chat(self, chat_id: int) -> None:
+        now = time.monotonic()
+        next_send = self.chat_next_send.get(chat_id, now)
+        self.chat_next_send[chat_id] = max(next_send, now) + 1  # Telegram allows ~1 msg/s per chat
+        
+        if next_send > now:
+            await asyncio.sleep(next_send - now)
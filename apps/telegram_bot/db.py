@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+# Django's async ORM funnels every query through one shared thread, which would
+# serialize all chats again; a bounded pool lets handlers overlap their queries
+_executor = ThreadPoolExecutor(
+    max_workers=settings.TELEGRAM_BOT_DB_THREADS,
+    thread_name_prefix='telegram-bot-db',
+)
+
+
+def _call_with_connection(func, *args, **kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_db(func, *args, **kwargs):
+    return await sync_to_async(
+        _call_with_connection,
+        thread_sensitive=False,
+        executor=_executor,
+    )(func, *args, **kwargs)
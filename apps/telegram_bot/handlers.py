@@ -6,6 +6,7 @@ from datetime import date, time
 from decimal import Decimal
 import structlog
 
+from .db import run_db
 from .states import RegistrationStates, FoodLoggingStates, WaterLoggingStates
 from .keyboards import (
     get_main_menu_keyboard,
@@ -13,10 +14,12 @@ from .keyboards import (
     get_activity_keyboard,
     get_goal_keyboard,
     get_meal_type_keyboard,
+    get_recent_foods_keyboard,
 )
 from apps.users.models import User, UserProfile
 from apps.users.services import HealthCalculationService
-from apps.food.services import FoodService, FoodLogService, WaterService
+from apps.food.autocomplete import popular_foods
+from apps.food.services import FoodService, FoodLogService, RecentFoodsService, WaterService, DailySummaryService
 
 logger = structlog.get_logger(__name__)
 router = Router()
@@ -27,14 +30,15 @@ async def cmd_start(message: Message, state: FSMContext):
     telegram_id = message.from_user.id
     
     try:
-        user = User.objects.get(telegram_id=telegram_id)
+        user = await run_db(User.objects.get, telegram_id=telegram_id)
         await message.answer(
             f"С возвращением, {user.username}! 👋\n\n"
             "Выберите действие:",
             reply_markup=get_main_menu_keyboard()
         )
     except User.DoesNotExist:
-        user = User.objects.create(
+        user = await run_db(
+            User.objects.create,
             username=f"tg_{telegram_id}",
             telegram_id=telegram_id,
             telegram_username=message.from_user.username,
@@ -139,23 +143,7 @@ async def process_goal(callback: CallbackQuery, state: FSMContext):
     await state.update_data(goal=goal)
     
     data = await state.get_data()
-    user = User.objects.get(id=data['user_id'])
-    
-    from datetime import date, timedelta
-    birth_year = date.today().year - data['age']
-    date_of_birth = date(birth_year, 1, 1)
-    
-    profile = UserProfile.objects.create(
-        user=user,
-        gender=data['gender'],
-        date_of_birth=date_of_birth,
-        height=Decimal(str(data['height'])),
-        weight=Decimal(str(data['weight'])),
-        activity_level=data['activity_level'],
-        goal=data['goal'],
-    )
-    
-    result = HealthCalculationService.calculate_and_update_profile(profile)
+    result = await run_db(_create_profile, data)
     
     await callback.message.edit_text(
         f"✅ Профиль создан!\n\n"
@@ -189,19 +177,35 @@ async def process_meal_type(callback: CallbackQuery, state: FSMContext):
     meal_type = callback.data.split('_')[1]
     await state.update_data(meal_type=meal_type)
     
-    await callback.message.edit_text(
-        "Введите название продукта для поиска:"
-    )
+    recent_foods = await run_db(_get_recent_foods, callback.from_user.id)
+    
+    if recent_foods:
+        await callback.message.edit_text(
+            "Выберите продукт из недавних или введите название для поиска:",
+            reply_markup=get_recent_foods_keyboard(recent_foods)
+        )
+    else:
+        await callback.message.edit_text(
+            "Введите название продукта для поиска:"
+        )
     await state.set_state(FoodLoggingStates.waiting_for_food_search)
     await callback.answer()
 
 
+@router.callback_query(FoodLoggingStates.waiting_for_food_search, F.data.startswith('recent_food_'))
+async def process_recent_food(callback: CallbackQuery, state: FSMContext):
+    food_id = int(callback.data.rsplit('_', 1)[1])
+    await state.update_data(food_id=food_id)
+    
+    await callback.message.edit_text("Укажите количество в граммах (например, 150):")
+    await state.set_state(FoodLoggingStates.waiting_for_serving_amount)
+    await callback.answer()
+
+
 @router.message(FoodLoggingStates.waiting_for_food_search)
 async def process_food_search(message: Message, state: FSMContext):
-    query = message.text
-    user = User.objects.get(telegram_id=message.from_user.id)
-    
-    foods = FoodService.search_foods(query, user, limit=10)
+    query = message.text or ''
+    foods = await _find_foods(message.from_user.id, query, limit=10) if query.strip() else []
     
     if not foods:
         await message.answer(
@@ -252,15 +256,7 @@ async def process_serving_amount(message: Message, state: FSMContext):
             return
         
         data = await state.get_data()
-        user = User.objects.get(telegram_id=message.from_user.id)
-        
-        food_log = FoodLogService.log_food(
-            user=user,
-            food_id=data['food_id'],
-            serving_amount=Decimal(str(amount)),
-            meal_type=data['meal_type'],
-            log_date=date.today(),
-        )
+        food_log = await run_db(_log_food, message.from_user.id, data, amount)
         
         await message.answer(
             f"✅ Записано!\n\n"
@@ -292,10 +288,7 @@ async def process_water_amount(message: Message, state: FSMContext):
             await message.answer("Пожалуйста, укажите корректное количество (1-5000 мл):")
             return
         
-        user = User.objects.get(telegram_id=message.from_user.id)
-        WaterService.log_water(user, amount, date.today())
-        
-        total = WaterService.get_daily_water_intake(user, date.today())
+        total = await run_db(_log_water, message.from_user.id, amount)
         
         await message.answer(
             f"✅ Записано {amount} мл!\n\n"
@@ -309,10 +302,7 @@ async def process_water_amount(message: Message, state: FSMContext):
 
 @router.callback_query(F.data == "view_stats")
 async def view_stats(callback: CallbackQuery):
-    user = User.objects.get(telegram_id=callback.from_user.id)
-    
-    from apps.food.services import DailySummaryService
-    summary = DailySummaryService.get_or_create_summary(user, date.today())
+    summary = await run_db(_get_today_summary, callback.from_user.id)
     
     text = (
         f"📊 Статистика за сегодня ({date.today().strftime('%d.%m.%Y')})\n\n"
@@ -346,3 +336,64 @@ async def cancel_handler(message: Message, state: FSMContext):
         "Операция отменена.",
         reply_markup=get_main_menu_keyboard()
     )
+
+
+def _create_profile(data: dict):
+    user = User.objects.get(id=data['user_id'])
+    
+    birth_year = date.today().year - data['age']
+    profile = UserProfile.objects.create(
+        user=user,
+        gender=data['gender'],
+        date_of_birth=date(birth_year, 1, 1),
+        height=Decimal(str(data['height'])),
+        weight=Decimal(str(data['weight'])),
+        activity_level=data['activity_level'],
+        goal=data['goal'],
+    )
+    
+    return HealthCalculationService.calculate_and_update_profile(profile)
+
+
+async def _find_foods(telegram_id: int, query: str, limit: int):
+    popular_foods.schedule_reload()
+    # Common prefixes are answered from the in-process index; a short list is topped up from the database,
+    # which also has the user's own foods and matches inside words
+    foods = popular_foods.search(query, limit=limit)
+    if len(foods) < limit:
+        found_ids = {food.id for food in foods}
+        found = await run_db(_search_foods, telegram_id, query, limit)
+        foods += [food for food in found if food.id not in found_ids][:limit - len(foods)]
+    return foods
+
+
+def _search_foods(telegram_id: int, query: str, limit: int):
+    user = User.objects.get(telegram_id=telegram_id)
+    return FoodService.search_foods(query, user, limit=limit)
+
+
+def _get_recent_foods(telegram_id: int):
+    user = User.objects.get(telegram_id=telegram_id)
+    return RecentFoodsService.get_recent_foods(user, limit=8)
+
+
+def _log_food(telegram_id: int, data: dict, amount: float):
+    user = User.objects.get(telegram_id=telegram_id)
+    return FoodLogService.log_food(
+        user=user,
+        food_id=data['food_id'],
+        serving_amount=Decimal(str(amount)),
+        meal_type=data['meal_type'],
+        log_date=date.today(),
+    )
+
+
+def _log_water(telegram_id: int, amount: int) -> int:
+    user = User.objects.get(telegram_id=telegram_id)
+    WaterService.log_water(user, amount, date.today())
+    return WaterService.get_daily_water_intake(user, date.today())
+
+
+def _get_today_summary(telegram_id: int):
+    user = User.objects.get(telegram_id=telegram_id)
+    return DailySummaryService.get_summary(user, date.today())
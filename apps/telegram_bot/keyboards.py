@@ -69,6 +69,15 @@ def get_meal_type_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
+def get_recent_foods_keyboard(foods) -> InlineKeyboardMarkup:
+    keyboard = [
+        [InlineKeyboardButton(text=f"{food.name} ({food.brand})" if food.brand else food.name, callback_data=f"recent_food_{food.id}")]
+        for food in foods
+    ]
+    keyboard.append([InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_menu")])
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
 def get_back_keyboard() -> InlineKeyboardMarkup:
     keyboard = [
         [InlineKeyboardButton(text="◀️ Главное меню", callback_data="back_to_menu")],
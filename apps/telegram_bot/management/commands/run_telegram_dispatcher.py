@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import asyncio
+import structlog
+
+from apps.telegram_bot.bot import bot, dp, redis_client
+from apps.telegram_bot.handlers import router
+from apps.telegram_bot.updates import UpdateDispatcher
+
+logger = structlog.get_logger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Feed webhook updates from Redis streams into the bot dispatcher'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--shards',
+            type=str,
+            default='',
+            help='Comma-separated shard numbers to serve, e.g. "0,1,2" (default: all). '
+                 'Each shard is leased to one process at a time; give processes disjoint sets to spread the load',
+        )
+
+    def handle(self, *args, **options):
+        if options['shards']:
+            shards = [int(shard) for shard in options['shards'].split(',')]
+        else:
+            shards = range(settings.TELEGRAM_UPDATE_SHARDS)
+        
+        if len(set(shards)) != len(shards) or not all(0 <= shard < settings.TELEGRAM_UPDATE_SHARDS for shard in shards):
+            raise CommandError(f'Shards must be distinct numbers from 0 to {settings.TELEGRAM_UPDATE_SHARDS - 1}')
+        
+        self.stdout.write(self.style.SUCCESS(f'Starting update dispatcher for shards: {list(shards)}'))
+        
+        dp.include_router(router)
+        
+        asyncio.run(self.start_dispatcher(shards))
+
+    async def start_dispatcher(self, shards):
+        try:
+            await UpdateDispatcher(bot, dp, redis_client, shards).run()
+        except Exception as e:
+            logger.error("dispatcher_startup_failed", error=str(e))
+            self.stdout.write(self.style.ERROR(f'Dispatcher stopped: {e}'))
@@ -3,7 +3,9 @@ from datetime import datetime, timedelta
 from django.utils import timezone
 import structlog
 
+from apps.core.fanout import FanOutService, chunk_task
 from apps.users.models import User
+from .broadcast import BroadcastEngine, run_in_worker_loop
 
 logger = structlog.get_logger(__name__)
 
@@ -11,44 +13,52 @@ logger = structlog.get_logger(__name__)
 @shared_task(bind=True, max_retries=3)
 def send_daily_reminders(self):
     try:
-        from .bot import bot
-        import asyncio
-        
-        users = User.objects.filter(
-            is_active=True,
-            telegram_id__isnull=False,
-            profile__notifications_enabled=True
+        return FanOutService.dispatch(
+            'send_daily_reminders',
+            _reminder_recipients(),
+            send_daily_reminders_chunk,
         )
-        
-        sent = 0
-        for user in users:
-            try:
-                message = (
-                    f"🌅 Доброе утро, {user.telegram_first_name or user.username}!\n\n"
-                    "Не забудьте записать завтрак и выпить воды! 💧\n\n"
-                    "Используйте /menu для начала."
-                )
-                
-                asyncio.run(
-                    bot.send_message(chat_id=user.telegram_id, text=message)
-                )
-                sent += 1
-            except Exception as e:
-                logger.error("failed_to_send_reminder", user_id=user.id, error=str(e))
-        
-        logger.info("daily_reminders_sent", sent=sent, total=users.count())
-        
-        return f"Sent {sent} reminders"
     except Exception as e:
         logger.error("send_reminders_failed", error=str(e))
         raise self.retry(exc=e, countdown=300)
 
 
+@chunk_task()
+def send_daily_reminders_chunk(lower, upper):
+    from .bot import bot, redis_client
+    
+    users = FanOutService.in_range(_reminder_recipients(), lower, upper).values(
+        'telegram_id', 'telegram_first_name', 'username'
+    )
+    messages = [
+        (
+            user['telegram_id'],
+            f"🌅 Доброе утро, {user['telegram_first_name'] or user['username']}!\n\n"
+            "Не забудьте записать завтрак и выпить воды! 💧\n\n"
+            "Используйте /menu для начала.",
+        )
+        for user in users
+    ]
+    
+    engine = BroadcastEngine(bot, redis_client=redis_client)
+    stats = run_in_worker_loop(engine.broadcast(messages))
+    
+    logger.info("daily_reminders_sent", sent=stats.get('sent', 0), total=len(messages))
+    return {**stats, 'total': len(messages)}
+
+
+def _reminder_recipients():
+    return User.objects.filter(
+        is_active=True,
+        telegram_id__isnull=False,
+        profile__notifications_enabled=True
+    )
+
+
 @shared_task
 def send_achievement_notification(user_id: int, achievement_name: str):
     try:
         from .bot import bot
-        import asyncio
         
         user = User.objects.get(id=user_id, telegram_id__isnull=False)
         
@@ -57,7 +67,7 @@ def send_achievement_notification(user_id: int, achievement_name: str):
             f"Вы получили достижение: {achievement_name}!"
         )
         
-        asyncio.run(
+        run_in_worker_loop(
             bot.send_message(chat_id=user.telegram_id, text=message)
         )
         
@@ -0,0 +1,199 @@
+import asyncio
+import os
+import socket
+from typing import Iterable, List, Tuple
+import orjson
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from django.conf import settings
+from redis.exceptions import ResponseError
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+UPDATE_STREAM = 'telegram:updates'
+CONSUMER_GROUP = 'dispatchers'
+READ_BATCH = 50
+READ_BLOCK_MS = 5000
+
+DEAD_LETTER_STREAM = f"{UPDATE_STREAM}:dead"
+MAX_DELIVERIES = 5
+RETRY_BACKOFF_SECONDS = 1
+SHARD_LEASE_MS = 30000
+LEASE_RETRY_SECONDS = 5
+
+RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+CHAT_CARRIERS = ('message', 'edited_message', 'channel_post', 'edited_channel_post', 'callback_query')
+
+
+def chat_key(payload: dict) -> int:
+    for field in CHAT_CARRIERS:
+        event = payload.get(field)
+        if not event:
+            continue
+        chat = event.get('chat') or (event.get('message') or {}).get('chat')
+        if chat:
+            return chat['id']
+        return event.get('from', {}).get('id', 0)
+    
+    for event in payload.values():
+        if isinstance(event, dict) and 'from' in event:
+            return event['from']['id']
+    
+    return payload.get('update_id', 0)
+
+
+def stream_for(shard: int) -> str:
+    return f"{UPDATE_STREAM}:{shard}"
+
+
+def lease_for(shard: int) -> str:
+    return f"{UPDATE_STREAM}:{shard}:owner"
+
+
+async def enqueue_update(redis_client, raw: bytes) -> None:
+    payload = orjson.loads(raw)
+    
+    # Every update of a chat lands on the same shard, and each shard is consumed in order
+    shard = chat_key(payload) % settings.TELEGRAM_UPDATE_SHARDS
+    await redis_client.xadd(
+        stream_for(shard),
+        {'update': raw},
+        maxlen=settings.TELEGRAM_UPDATE_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+class ShardLeaseLostError(Exception):
+    pass
+
+
+class UpdateDispatcher:
+    
+    def __init__(self, bot: Bot, dp: Dispatcher, redis_client, shards: Iterable[int]):
+        self.bot = bot
+        self.dp = dp
+        self.redis = redis_client
+        self.shards = list(shards)
+        # Unique per process, so two dispatchers never read or ack through the same consumer
+        self.process_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._renew_lease = redis_client.register_script(RENEW_LEASE_SCRIPT)
+    
+    async def run(self) -> None:
+        logger.info("telegram_dispatcher_started", shards=self.shards, process=self.process_id)
+        await asyncio.gather(*(self._consume(shard) for shard in self.shards))
+    
+    async def _consume(self, shard: int) -> None:
+        stream = stream_for(shard)
+        consumer = f"{self.process_id}-shard-{shard}"
+        await self._ensure_group(stream)
+        
+        while True:
+            # A shard is owned by one process at a time, otherwise two consumers would interleave a chat's updates
+            if not await self.redis.set(lease_for(shard), consumer, nx=True, px=SHARD_LEASE_MS):
+                await asyncio.sleep(LEASE_RETRY_SECONDS)
+                continue
+            
+            logger.info("telegram_shard_acquired", shard=shard, consumer=consumer)
+            drain = asyncio.create_task(self._drain(stream, consumer))
+            keeper = asyncio.create_task(self._keep_lease(shard, consumer))
+            try:
+                # Whichever stops first stops the other, so a slow update can't outlive the lease it runs under
+                await asyncio.wait({drain, keeper}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                drain.cancel()
+                keeper.cancel()
+            drained, kept = await asyncio.gather(drain, keeper, return_exceptions=True)
+            
+            if not isinstance(kept, ShardLeaseLostError):
+                raise kept if isinstance(drained, asyncio.CancelledError) else drained
+            logger.warning("telegram_shard_lost", shard=shard, consumer=consumer)
+    
+    async def _drain(self, stream: str, consumer: str) -> None:
+        # On takeover, finish everything the previous owner left in flight before reading new updates
+        await self._handle(stream, await self._claim(stream, consumer))
+        
+        while True:
+            entries = await self.redis.xreadgroup(
+                CONSUMER_GROUP,
+                consumer,
+                {stream: '>'},
+                count=READ_BATCH,
+                block=READ_BLOCK_MS,
+            )
+            await self._handle(stream, entries[0][1] if entries else [])
+    
+    async def _claim(self, stream: str, consumer: str) -> List[Tuple[bytes, dict]]:
+        claimed = []
+        start_id = '0-0'
+        while True:
+            result = await self.redis.xautoclaim(
+                stream, CONSUMER_GROUP, consumer, 0, start_id=start_id, count=READ_BATCH,
+            )
+            start_id, messages = result[0], result[1]
+            claimed.extend(messages)
+            if start_id in (b'0-0', '0-0'):
+                return claimed
+    
+    async def _handle(self, stream: str, messages: List[Tuple[bytes, dict]]) -> None:
+        for message_id, fields in messages:
+            # Trimmed by MAXLEN while still pending, nothing left to deliver
+            if fields:
+                await self._deliver(stream, message_id, fields[b'update'])
+            await self.redis.xack(stream, CONSUMER_GROUP, message_id)
+    
+    async def _deliver(self, stream: str, message_id: bytes, raw: bytes) -> None:
+        # Retried in place: moving on would let the chat's next update overtake the failed one
+        deliveries = None
+        while not await self._process(raw):
+            if deliveries is None:
+                deliveries = await self._times_delivered(stream, message_id)
+            else:
+                deliveries += 1
+            
+            if deliveries >= MAX_DELIVERIES:
+                await self._dead_letter(stream, message_id, raw, deliveries)
+                return
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * deliveries)
+    
+    async def _process(self, raw: bytes) -> bool:
+        try:
+            update = Update.model_validate_json(raw)
+            await self.dp.feed_update(self.bot, update)
+            return True
+        except Exception as e:
+            logger.error("telegram_update_failed", error=str(e))
+            return False
+    
+    async def _times_delivered(self, stream: str, message_id: bytes) -> int:
+        # Counts the deliveries to owners that died mid-update, so a crashing update still ends up dead-lettered
+        pending = await self.redis.xpending_range(stream, CONSUMER_GROUP, min=message_id, max=message_id, count=1)
+        return pending[0]['times_delivered'] if pending else MAX_DELIVERIES
+    
+    async def _dead_letter(self, stream: str, message_id: bytes, raw: bytes, deliveries: int) -> None:
+        await self.redis.xadd(
+            DEAD_LETTER_STREAM,
+            {'stream': stream, 'message_id': message_id, 'update': raw},
+            maxlen=settings.TELEGRAM_UPDATE_STREAM_MAXLEN,
+            approximate=True,
+        )
+        logger.error("telegram_update_dead_lettered", stream=stream, message_id=message_id, deliveries=deliveries)
+    
+    async def _keep_lease(self, shard: int, consumer: str) -> None:
+        while True:
+            await asyncio.sleep(SHARD_LEASE_MS / 3000)
+            if not await self._renew_lease(keys=[lease_for(shard)], args=[consumer, SHARD_LEASE_MS]):
+                raise ShardLeaseLostError(shard)
+    
+    async def _ensure_group(self, stream: str) -> None:
+        try:
+            await self.redis.xgroup_create(stream, CONSUMER_GROUP, id='0', mkstream=True)
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
@@ -1,7 +1,9 @@
-from ninja import Router
+from ninja import Router, Query
+from celery.result import AsyncResult
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.hashers import make_password
-from typing import List
+from typing import Dict, List
 import structlog
 
 from .models import User, UserProfile
@@ -15,7 +17,9 @@ from .schemas import (
     UserProfileUpdateSchema,
     CalorieCalculationResult,
 )
+from .export import AccountExportService, CONTENT_TYPES, export_storage
 from .services import AuthService, HealthCalculationService, UserCacheService
+from .tasks import export_account_data
 from apps.core.auth import AuthBearer
 
 router = Router()
@@ -89,6 +93,72 @@ def get_current_user(request):
     return request.auth
 
 
+@router.get("/export", auth=AuthBearer())
+def export_account(
+    request,
+    format: str = Query('ndjson', pattern='^(ndjson|csv)$'),
+    gzip: bool = False,
+):
+    response = StreamingHttpResponse(
+        AccountExportService.astream(request.auth, format, gzip),
+        content_type='application/gzip' if gzip else CONTENT_TYPES[format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{AccountExportService.filename(request.auth, format, gzip)}"'
+    )
+    
+    logger.info("account_export_started", user_id=request.auth.id, format=format, gzip=gzip)
+    
+    return response
+
+
+@router.post("/export", auth=AuthBearer())
+def schedule_account_export(
+    request,
+    format: str = Query('ndjson', pattern='^(ndjson|csv)$'),
+    gzip: bool = True,
+):
+    result = export_account_data.delay(request.auth.id, format, gzip)
+    
+    return {'task_id': result.id, 'status_url': f"/api/auth/export/{result.id}"}
+
+
+@router.get("/export/files/{name}", response={404: Dict[str, str]}, auth=AuthBearer())
+def download_account_export(request, name: str):
+    # Exports live under the owner's id, so a name can only ever resolve to the caller's own files
+    path = f"{request.auth.id}/{name}"
+    if '/' in name or not export_storage.exists(path):
+        return 404, {'error': 'Export not found'}
+    
+    export_format = name.removesuffix('.gz').rsplit('.', 1)[-1]
+    response = StreamingHttpResponse(
+        AccountExportService.aread_file(path),
+        content_type=(
+            'application/gzip' if name.endswith('.gz')
+            else CONTENT_TYPES.get(export_format, 'application/octet-stream')
+        ),
+    )
+    response['Content-Disposition'] = f'attachment; filename="{name}"'
+    
+    return response
+
+
+@router.get("/export/{task_id}", response={frozenset({200, 202, 404, 500}): Dict[str, str]}, auth=AuthBearer())
+def get_account_export_status(request, task_id: str):
+    result = AsyncResult(task_id)
+    
+    if not result.successful():
+        status = 202 if result.status in ('PENDING', 'STARTED', 'RETRY') else 500
+        return status, {'status': result.status}
+    
+    path = result.result or ''
+    owner, _, name = path.partition('/')
+    if owner != str(request.auth.id):
+        return 404, {'error': 'Export not found'}
+    
+    return {'status': result.status, 'download_url': f"/api/auth/export/files/{name}"}
+
+
 @router.get("/profile", response=UserProfileSchema, auth=AuthBearer())
 def get_profile(request):
     profile = get_object_or_404(UserProfile, user=request.auth)
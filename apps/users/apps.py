@@ -1,7 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
     verbose_name = 'Users'
+
+    def ready(self):
+        from .models import User, UserProfile
+        from .signals import invalidate_cached_user, invalidate_cached_profile_owner
+        
+        # Covers deactivation and edits made through the admin, not just the API
+        post_save.connect(invalidate_cached_user, sender=User)
+        post_delete.connect(invalidate_cached_user, sender=User)
+        post_save.connect(invalidate_cached_profile_owner, sender=UserProfile)
+        post_delete.connect(invalidate_cached_profile_owner, sender=UserProfile)
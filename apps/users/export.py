@@ -0,0 +1,148 @@
+import csv
+import io
+import zlib
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db.models import F, QuerySet
+import orjson
+import structlog
+
+from apps.food.models import FoodLog, WaterLog, DailySummary
+from apps.goals.models import Goal, UserAchievement
+from apps.sleep.models import SleepLog
+from apps.workouts.models import WorkoutLog
+from .models import User, UserProfile
+
+logger = structlog.get_logger(__name__)
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Kept out of MEDIA_ROOT, which nginx serves publicly
+export_storage = FileSystemStorage(location=settings.ACCOUNT_EXPORT_ROOT)
+
+
+class ExportEncoder:
+    
+    def __init__(self, export_format: str, compress: bool, flush_bytes: int):
+        self.export_format = export_format
+        # gzip framing (wbits=31) lets the output be compressed chunk by chunk without buffering the file
+        self.compressor = zlib.compressobj(wbits=31) if compress else None
+        self.flush_bytes = flush_bytes
+        self.buffer = bytearray()
+        self.records = 0
+        self.current_type = None
+        self.csv_output = io.StringIO()
+        self.csv_writer = csv.writer(self.csv_output)
+    
+    def add(self, record_type: str, row: dict) -> bytes:
+        self.records += 1
+        
+        if self.export_format == 'ndjson':
+            self.buffer += orjson.dumps({'type': record_type, **row}, default=str, option=orjson.OPT_APPEND_NEWLINE)
+        else:
+            # One CSV stream with a header row whenever the record type changes
+            if record_type != self.current_type:
+                self.csv_writer.writerow(['type', *row.keys()])
+                self.current_type = record_type
+            self.csv_writer.writerow([record_type, *row.values()])
+            self.buffer += self.csv_output.getvalue().encode()
+            self.csv_output.seek(0)
+            self.csv_output.truncate()
+        
+        return self._drain() if len(self.buffer) >= self.flush_bytes else b''
+    
+    def finish(self) -> bytes:
+        data = self._drain()
+        return data + self.compressor.flush() if self.compressor else data
+    
+    def _drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return self.compressor.compress(data) if self.compressor else data
+
+
+class AccountExportService:
+    
+    BATCH_SIZE = 2000
+    FLUSH_BYTES = 64 * 1024
+    USER_FIELDS = (
+        'id', 'username', 'email', 'first_name', 'last_name', 'date_joined',
+        'telegram_id', 'telegram_username', 'telegram_first_name', 'telegram_last_name',
+    )
+    
+    @staticmethod
+    def stream(user: User, export_format: str = 'ndjson', compress: bool = False) -> Iterator[bytes]:
+        encoder = ExportEncoder(export_format, compress, AccountExportService.FLUSH_BYTES)
+        
+        for record_type, rows in AccountExportService._sections(user):
+            # Server-side cursor: memory stays flat no matter how many years of logs the user has
+            for row in rows.order_by('pk').iterator(chunk_size=AccountExportService.BATCH_SIZE):
+                chunk = encoder.add(record_type, row)
+                if chunk:
+                    yield chunk
+        
+        yield encoder.finish()
+        
+        logger.info("account_exported", user_id=user.id, format=export_format, compressed=compress, records=encoder.records)
+    
+    @staticmethod
+    async def astream(user: User, export_format: str = 'ndjson', compress: bool = False) -> AsyncIterator[bytes]:
+        # ASGI only streams async iterators; a sync generator would be collected into a list before sending
+        encoder = ExportEncoder(export_format, compress, AccountExportService.FLUSH_BYTES)
+        fetch_batch = sync_to_async(AccountExportService._fetch_batch)
+        
+        for record_type, rows in AccountExportService._sections(user):
+            after = None
+            while True:
+                batch = await fetch_batch(rows, after)
+                for row in batch:
+                    chunk = encoder.add(record_type, row)
+                    if chunk:
+                        yield chunk
+                
+                if len(batch) < AccountExportService.BATCH_SIZE:
+                    break
+                after = batch[-1]['id']
+        
+        yield encoder.finish()
+        
+        logger.info("account_exported", user_id=user.id, format=export_format, compressed=compress, records=encoder.records)
+    
+    @staticmethod
+    async def aread_file(path: str) -> AsyncIterator[bytes]:
+        export_file = await sync_to_async(export_storage.open)(path, 'rb')
+        try:
+            while chunk := await sync_to_async(export_file.read)(AccountExportService.FLUSH_BYTES):
+                yield chunk
+        finally:
+            await sync_to_async(export_file.close)()
+    
+    @staticmethod
+    def filename(user: User, export_format: str, compress: bool) -> str:
+        return f"lifemetrics-{user.id}.{export_format}{'.gz' if compress else ''}"
+    
+    @staticmethod
+    def _fetch_batch(rows: QuerySet, after: Optional[int]) -> List[dict]:
+        # Keyset batches instead of one long-lived cursor, so no connection is pinned between awaits
+        if after is not None:
+            rows = rows.filter(pk__gt=after)
+        return list(rows.order_by('pk')[:AccountExportService.BATCH_SIZE])
+    
+    @staticmethod
+    def _sections(user: User) -> Tuple[Tuple[str, QuerySet], ...]:
+        return (
+            ('user', User.objects.filter(id=user.id).values(*AccountExportService.USER_FIELDS)),
+            ('profile', UserProfile.objects.filter(user=user).values()),
+            ('food_log', FoodLog.objects.filter(user=user).annotate(food_name=F('food__name')).values()),
+            ('water_log', WaterLog.objects.filter(user=user).values()),
+            ('daily_summary', DailySummary.objects.filter(user=user).values()),
+            ('workout_log', WorkoutLog.objects.filter(user=user).annotate(workout_name=F('workout__name')).values()),
+            ('sleep_log', SleepLog.objects.filter(user=user).values()),
+            ('goal', Goal.objects.filter(user=user).values()),
+            ('achievement', UserAchievement.objects.filter(user=user).annotate(achievement_name=F('achievement__name')).values()),
+        )
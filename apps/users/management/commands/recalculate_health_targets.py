@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.fanout import FanOutService
+from apps.users.models import UserProfile
+from apps.users.tasks import recalculate_health_targets, recalculate_health_targets_range
+
+
+class Command(BaseCommand):
+    help = 'Recompute BMR, TDEE and daily targets for every user profile in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill-summaries',
+            action='store_true',
+            help="Also copy the new targets onto today's and future daily summaries",
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Profiles per chunk (default: 5000)',
+        )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Run chunks in this process instead of fanning out to Celery workers',
+        )
+
+    def handle(self, *args, **options):
+        backfill = options['backfill_summaries']
+        
+        if not options['sync']:
+            result = recalculate_health_targets.delay(backfill)
+            self.stdout.write(self.style.SUCCESS(f'Dispatched recalculation task {result.id}'))
+            return
+        
+        ranges = FanOutService.key_ranges(UserProfile.objects.all(), options['chunk_size'], key='user_id')
+        updated = backfilled = 0
+        for number, (lower, upper) in enumerate(ranges, 1):
+            result = recalculate_health_targets_range(lower, upper, backfill)
+            updated += result['updated']
+            backfilled += result['backfilled']
+            self.stdout.write(f'Chunk {number}/{len(ranges)}: {updated} profiles, {backfilled} summaries')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Recalculated {updated} profiles and backfilled {backfilled} daily summaries'
+        ))
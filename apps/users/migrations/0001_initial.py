@@ -0,0 +1,116 @@
+# Generated by Django 5.0 on 2026-10-18 13:48
+
+import django.contrib.auth.models
+import django.contrib.auth.validators
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('username', models.CharField(error_messages={'unique': 'A user with that username already exists.'}, help_text='Required. 150 characters or fewer. Letters, digits and @/./+/-/_ only.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='username')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='first name')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='last name')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='email address')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('telegram_id', models.BigIntegerField(blank=True, db_index=True, null=True, unique=True)),
+                ('telegram_username', models.CharField(blank=True, max_length=255)),
+                ('telegram_first_name', models.CharField(blank=True, max_length=255)),
+                ('telegram_last_name', models.CharField(blank=True, max_length=255)),
+                ('is_premium', models.BooleanField(default=False)),
+                ('premium_until', models.DateTimeField(blank=True, null=True)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'db_table': 'users',
+                'ordering': ['-created_at'],
+            },
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TelegramSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('telegram_id', models.BigIntegerField(db_index=True)),
+                ('chat_id', models.BigIntegerField()),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('state_data', models.JSONField(blank=True, default=dict)),
+                ('last_activity', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='telegram_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'telegram_sessions',
+                'ordering': ['-last_activity'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('gender', models.CharField(choices=[('M', 'Male'), ('F', 'Female'), ('O', 'Other')], max_length=1)),
+                ('date_of_birth', models.DateField(blank=True, null=True)),
+                ('height', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('weight', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('activity_level', models.CharField(choices=[('sedentary', 'Sedentary (little or no exercise)'), ('light', 'Light (exercise 1-3 days/week)'), ('moderate', 'Moderate (exercise 3-5 days/week)'), ('active', 'Active (exercise 6-7 days/week)'), ('very_active', 'Very Active (intense exercise daily)')], default='sedentary', max_length=20)),
+                ('goal', models.CharField(choices=[('weight_loss', 'Weight Loss'), ('maintenance', 'Maintenance'), ('muscle_gain', 'Muscle Gain')], default='maintenance', max_length=20)),
+                ('target_weight', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('bmr', models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True)),
+                ('tdee', models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True)),
+                ('daily_calorie_target', models.IntegerField(blank=True, null=True)),
+                ('daily_protein_target', models.IntegerField(blank=True, null=True)),
+                ('daily_carbs_target', models.IntegerField(blank=True, null=True)),
+                ('daily_fat_target', models.IntegerField(blank=True, null=True)),
+                ('timezone', models.CharField(default='Europe/Moscow', max_length=50)),
+                ('language', models.CharField(default='ru', max_length=10)),
+                ('notifications_enabled', models.BooleanField(default=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_profiles',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['telegram_id'], name='users_telegra_d76140_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], name='users_email_4b85f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telegramsession',
+            index=models.Index(fields=['telegram_id', 'is_active'], name='telegram_se_telegra_64a05b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telegramsession',
+            index=models.Index(fields=['user', 'is_active'], name='telegram_se_user_id_abec6d_idx'),
+        ),
+    ]
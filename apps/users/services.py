@@ -1,12 +1,17 @@
+import copy
 import jwt
 from datetime import datetime, timedelta
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.core.cache import cache
+from django.db.models import QuerySet
+from django.utils import timezone
 from typing import Optional, Dict, Any
+import numpy as np
 import structlog
 from decimal import Decimal
 
+from apps.core.lru import TTLCache
 from .models import User, UserProfile
 from .schemas import CalorieCalculationResult
 
@@ -84,12 +89,33 @@ class HealthCalculationService:
         'active': 1.725,
         'very_active': 1.9,
     }
+    GOAL_CALORIE_ADJUSTMENTS = {
+        'weight_loss': -500,
+        'muscle_gain': 300,
+        'maintenance': 0,
+    }
+    # (protein, carbs, fat) shares of the calorie target
+    MACRO_RATIOS = {
+        'weight_loss': (0.35, 0.35, 0.30),
+        'muscle_gain': (0.30, 0.45, 0.25),
+        'maintenance': (0.30, 0.40, 0.30),
+    }
+    MIN_CALORIE_TARGET = 1200
+    DEFAULT_AGE = 30
+    TARGET_FIELDS = [
+        'bmr',
+        'tdee',
+        'daily_calorie_target',
+        'daily_protein_target',
+        'daily_carbs_target',
+        'daily_fat_target',
+    ]
     
     @staticmethod
     def calculate_bmr(profile: UserProfile) -> float:
         weight = float(profile.weight)
         height = float(profile.height)
-        age = profile.age or 30  # Default age if not provided
+        age = profile.age or HealthCalculationService.DEFAULT_AGE
         
         if profile.gender == 'M':
             bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
@@ -106,29 +132,14 @@ class HealthCalculationService:
     
     @staticmethod
     def calculate_calorie_target(tdee: float, goal: str) -> int:
-        if goal == 'weight_loss':
-            target = tdee - 500
-        elif goal == 'muscle_gain':
-            target = tdee + 300
-        else:  # maintenance
-            target = tdee
-        
-        return max(int(target), 1200)  # Minimum 1200 calories
+        target = tdee + HealthCalculationService.GOAL_CALORIE_ADJUSTMENTS.get(goal, 0)
+        return max(int(target), HealthCalculationService.MIN_CALORIE_TARGET)
     
     @staticmethod
     def calculate_macros(calorie_target: int, goal: str) -> Dict[str, int]:
-        if goal == 'weight_loss':
-            protein_ratio = 0.35
-            carbs_ratio = 0.35
-            fat_ratio = 0.30
-        elif goal == 'muscle_gain':
-            protein_ratio = 0.30
-            carbs_ratio = 0.45
-            fat_ratio = 0.25
-        else:  # maintenance
-            protein_ratio = 0.30
-            carbs_ratio = 0.40
-            fat_ratio = 0.30
+        protein_ratio, carbs_ratio, fat_ratio = HealthCalculationService.MACRO_RATIOS.get(
+            goal, HealthCalculationService.MACRO_RATIOS['maintenance']
+        )
         
         protein_grams = int((calorie_target * protein_ratio) / 4)
         carbs_grams = int((calorie_target * carbs_ratio) / 4)
@@ -160,7 +171,7 @@ class HealthCalculationService:
         
         logger.info(
             "calculated_health_metrics",
-            user_id=profile.user.id,
+            user_id=profile.user_id,
             bmr=bmr,
             tdee=tdee,
             calorie_target=calorie_target,
@@ -174,6 +185,84 @@ class HealthCalculationService:
             daily_carbs_target=macros['carbs'],
             daily_fat_target=macros['fat'],
         )
+    
+    @staticmethod
+    def bulk_recalculate(profiles: QuerySet) -> int:
+        rows = list(profiles.values_list(
+            'id', 'user_id', 'gender', 'date_of_birth', 'height', 'weight', 'activity_level', 'goal'
+        ))
+        if not rows:
+            return 0
+        
+        profile_ids, user_ids, genders, births, heights, weights, activity_levels, goals = zip(*rows)
+        service = HealthCalculationService
+        
+        # Same formulas as the per-profile methods above, evaluated over the whole chunk at once
+        ages = service._ages(births)
+        height = np.array(heights, dtype=float)
+        weight = np.array(weights, dtype=float)
+        bmr = service._round(np.where(
+            np.array(genders) == 'M',
+            88.362 + 13.397 * weight + 4.799 * height - 5.677 * ages,
+            447.593 + 9.247 * weight + 3.098 * height - 4.330 * ages,
+        ))
+        tdee = service._round(bmr * service._lookup(activity_levels, service.ACTIVITY_MULTIPLIERS, 1.2))
+        calorie_target = np.maximum(
+            np.trunc(tdee + service._lookup(goals, service.GOAL_CALORIE_ADJUSTMENTS, 0)),
+            service.MIN_CALORIE_TARGET,
+        )
+        ratios = service._lookup(goals, service.MACRO_RATIOS, service.MACRO_RATIOS['maintenance'])
+        macros = np.trunc(calorie_target[:, None] * ratios / np.array([4, 4, 9])).astype(int)
+        
+        now = timezone.now()
+        updated = [
+            UserProfile(
+                id=profile_id,
+                user_id=user_id,
+                bmr=Decimal(f"{profile_bmr:.2f}"),
+                tdee=Decimal(f"{profile_tdee:.2f}"),
+                daily_calorie_target=int(target),
+                daily_protein_target=int(protein),
+                daily_carbs_target=int(carbs),
+                daily_fat_target=int(fat),
+                updated_at=now,
+            )
+            for profile_id, user_id, profile_bmr, profile_tdee, target, (protein, carbs, fat)
+            in zip(profile_ids, user_ids, bmr.tolist(), tdee.tolist(), calorie_target.tolist(), macros.tolist())
+        ]
+        
+        UserProfile.objects.bulk_update(updated, [*service.TARGET_FIELDS, 'updated_at'], batch_size=1000)
+        # bulk_update skips the post_save receivers that normally drop cached users
+        UserCacheService.invalidate_user_caches(user_ids)
+        
+        logger.info("bulk_recalculated_health_metrics", profiles=len(updated))
+        
+        return len(updated)
+    
+    @staticmethod
+    def _ages(births) -> np.ndarray:
+        today = timezone.now().date()
+        known = np.array([birth is not None for birth in births])
+        birth = np.array([birth or today for birth in births], dtype='datetime64[D]')
+        
+        years = birth.astype('datetime64[Y]').astype(int) + 1970
+        months = birth.astype('datetime64[M]').astype(int) % 12 + 1
+        days = (birth - birth.astype('datetime64[M]')).astype(int) + 1
+        before_birthday = (months > today.month) | ((months == today.month) & (days > today.day))
+        ages = today.year - years - before_birthday
+        
+        # Mirrors `profile.age or DEFAULT_AGE`, where an age of zero also falls back
+        return np.where(known & (ages != 0), ages, HealthCalculationService.DEFAULT_AGE).astype(float)
+    
+    @staticmethod
+    def _round(values: np.ndarray) -> np.ndarray:
+        # ndarray.round scales by 100 and rounds half-to-even, which can land a cent away from builtin round()
+        return np.array([round(value, 2) for value in values.tolist()], dtype=float)
+    
+    @staticmethod
+    def _lookup(keys, mapping: Dict, default) -> np.ndarray:
+        unique, inverse = np.unique(np.array(keys), return_inverse=True)
+        return np.array([mapping.get(key, default) for key in unique.tolist()], dtype=float)[inverse]
 
 
 class UserCacheService:
@@ -192,14 +281,42 @@ class UserCacheService:
     def cache_user(user: User) -> None:
         cache_key = UserCacheService.get_user_cache_key(user.id)
         cache.set(cache_key, user, UserCacheService.CACHE_TTL)
+        UserCacheService._remember_locally(user)
     
     @staticmethod
     def get_cached_user(user_id: int) -> Optional[User]:
+        user = _local_users.get(user_id)
+        if user is not None:
+            # Copies get their own related-object cache, so requests never share state
+            return copy.copy(user)
+        
         cache_key = UserCacheService.get_user_cache_key(user_id)
-        return cache.get(cache_key)
+        user = cache.get(cache_key)
+        
+        if user is not None:
+            UserCacheService._remember_locally(user)
+        
+        return user
     
     @staticmethod
     def invalidate_user_cache(user_id: int) -> None:
         user_key = UserCacheService.get_user_cache_key(user_id)
         profile_key = UserCacheService.get_profile_cache_key(user_id)
         cache.delete_many([user_key, profile_key])
+        _local_users.pop(user_id)
+    
+    @staticmethod
+    def invalidate_user_caches(user_ids) -> None:
+        keys = []
+        for user_id in user_ids:
+            keys += [UserCacheService.get_user_cache_key(user_id), UserCacheService.get_profile_cache_key(user_id)]
+            _local_users.pop(user_id)
+        cache.delete_many(keys)
+    
+    @staticmethod
+    def _remember_locally(user: User) -> None:
+        _local_users.set(user.id, copy.copy(user))
+
+
+# Per-process LRU in front of Redis; other workers see invalidations once AUTH_LOCAL_CACHE_TTL expires
+_local_users = TTLCache(settings.AUTH_LOCAL_CACHE_SIZE, settings.AUTH_LOCAL_CACHE_TTL)
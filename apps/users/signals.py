@@ -0,0 +1,13 @@
+from django.db import transaction
+
+from .services import UserCacheService
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: UserCacheService.invalidate_user_cache(user_id))
+
+
+def invalidate_cached_profile_owner(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: UserCacheService.invalidate_user_cache(user_id))
@@ -0,0 +1,74 @@
+from celery import shared_task
+from django.core.files import File
+from django.utils import timezone
+import tempfile
+import structlog
+
+from apps.core.fanout import FanOutService, chunk_task
+from apps.food.services import DailySummaryService
+from .export import AccountExportService, export_storage
+from .models import User, UserProfile
+from .services import HealthCalculationService
+
+logger = structlog.get_logger(__name__)
+
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@shared_task(bind=True, max_retries=3)
+def export_account_data(self, user_id: int, export_format: str = 'ndjson', compress: bool = True):
+    try:
+        user = User.objects.get(id=user_id)
+        filename = AccountExportService.filename(user, export_format, compress)
+        
+        # Large exports spill to disk instead of being held in worker memory
+        with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as export_file:
+            for chunk in AccountExportService.stream(user, export_format, compress):
+                export_file.write(chunk)
+            export_file.seek(0)
+            
+            path = export_storage.save(
+                f"{user_id}/{timezone.now():%Y%m%d%H%M%S}-{filename}",
+                File(export_file),
+            )
+        
+        logger.info("account_export_saved", user_id=user_id, path=path)
+        
+        return path
+    except User.DoesNotExist:
+        logger.warning("account_export_user_missing", user_id=user_id)
+    except Exception as e:
+        logger.error("account_export_failed", user_id=user_id, error=str(e))
+        raise self.retry(exc=e, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3)
+def recalculate_health_targets(self, backfill_summaries: bool = False):
+    try:
+        return FanOutService.dispatch(
+            'recalculate_health_targets',
+            UserProfile.objects.all(),
+            recalculate_health_targets_chunk,
+            backfill_summaries,
+            key='user_id',
+        )
+    except Exception as e:
+        logger.error("recalculate_health_targets_failed", error=str(e))
+        raise self.retry(exc=e, countdown=300)
+
+
+@chunk_task()
+def recalculate_health_targets_chunk(lower, upper, backfill_summaries: bool):
+    return recalculate_health_targets_range(lower, upper, backfill_summaries)
+
+
+def recalculate_health_targets_range(lower, upper, backfill_summaries: bool):
+    profiles = FanOutService.in_range(UserProfile.objects.all(), lower, upper, key='user_id')
+    updated = HealthCalculationService.bulk_recalculate(profiles)
+    
+    backfilled = 0
+    if backfill_summaries:
+        backfilled = DailySummaryService.apply_profile_targets(lower or 0, upper, timezone.now().date())
+    
+    logger.info("health_targets_recalculated", updated=updated, backfilled=backfilled, lower=lower, upper=upper)
+    return {'updated': updated, 'backfilled': backfilled}
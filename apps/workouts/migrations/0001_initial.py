@@ -0,0 +1,56 @@
+# Generated by Django 5.0 on 2026-10-18 13:48
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Workout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('category', models.CharField(choices=[('cardio', 'Cardio'), ('strength', 'Strength Training'), ('flexibility', 'Flexibility'), ('sports', 'Sports'), ('other', 'Other')], max_length=20)),
+                ('description', models.TextField(blank=True)),
+                ('calories_per_hour', models.IntegerField(validators=[django.core.validators.MinValueValidator(0)])),
+                ('is_public', models.BooleanField(default=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'workouts',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkoutLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(db_index=True)),
+                ('duration_minutes', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('calories_burned', models.IntegerField(validators=[django.core.validators.MinValueValidator(0)])),
+                ('distance_km', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workout_logs', to=settings.AUTH_USER_MODEL)),
+                ('workout', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='logs', to='workouts.workout')),
+            ],
+            options={
+                'db_table': 'workout_logs',
+                'ordering': ['-date', '-created_at'],
+                'indexes': [models.Index(fields=['user', 'date'], name='workout_log_user_id_e8e75a_idx')],
+            },
+        ),
+    ]
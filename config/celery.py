@@ -25,6 +25,18 @@ app.conf.beat_schedule = {
         'task': 'apps.core.tasks.clean_old_sessions',
         'schedule': crontab(hour=3, minute=0),  # Every day at 03:00
     },
+    'warm-analytics-reports': {
+        'task': 'apps.analytics.tasks.warm_analytics_reports',
+        'schedule': crontab(hour=1, minute=30),  # Every day at 01:30, after the daily summaries
+    },
+    'warm-barcode-index': {
+        'task': 'apps.food.tasks.warm_barcode_index',
+        'schedule': crontab(hour=4, minute=0),  # Every day at 04:00
+    },
+    'refresh-popular-foods': {
+        'task': 'apps.food.tasks.refresh_popular_foods',
+        'schedule': crontab(minute='*/30'),  # Every 30 minutes
+    },
     'generate-weekly-reports': {
         'task': 'apps.core.tasks.generate_weekly_reports',
         'schedule': crontab(day_of_week=1, hour=8, minute=0),  # Every Monday at 08:00
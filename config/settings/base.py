@@ -16,6 +16,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'django_celery_beat',
     'django_celery_results',
@@ -24,6 +25,7 @@ INSTALLED_APPS = [
     'apps.workouts',
     'apps.sleep',
     'apps.goals',
+    'apps.analytics',
     'apps.telegram_bot',
     'apps.core',
 ]
@@ -107,6 +109,8 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+ACCOUNT_EXPORT_ROOT = os.getenv('ACCOUNT_EXPORT_ROOT', str(BASE_DIR / 'exports'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
@@ -170,9 +174,18 @@ JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRE_MINUTES', 30))
 JWT_REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv('JWT_REFRESH_TOKEN_EXPIRE_DAYS', 7))
 
+AUTH_LOCAL_CACHE_TTL = int(os.getenv('AUTH_LOCAL_CACHE_TTL', 10))
+AUTH_LOCAL_CACHE_SIZE = int(os.getenv('AUTH_LOCAL_CACHE_SIZE', 10000))
+
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '')
 TELEGRAM_WEBHOOK_URL = os.getenv('TELEGRAM_WEBHOOK_URL', '')
 TELEGRAM_WEBHOOK_SECRET = os.getenv('TELEGRAM_WEBHOOK_SECRET', '')
+TELEGRAM_API_SERVER = os.getenv('TELEGRAM_API_SERVER', '')
+TELEGRAM_BROADCAST_RATE = int(os.getenv('TELEGRAM_BROADCAST_RATE', 30))
+TELEGRAM_BROADCAST_CONCURRENCY = int(os.getenv('TELEGRAM_BROADCAST_CONCURRENCY', 20))
+TELEGRAM_BOT_DB_THREADS = int(os.getenv('TELEGRAM_BOT_DB_THREADS', 10))
+TELEGRAM_UPDATE_SHARDS = int(os.getenv('TELEGRAM_UPDATE_SHARDS', 16))
+TELEGRAM_UPDATE_STREAM_MAXLEN = int(os.getenv('TELEGRAM_UPDATE_STREAM_MAXLEN', 100000))
 
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -185,6 +198,14 @@ SESSION_COOKIE_SAMESITE = 'Lax'
 
 RATE_LIMIT_PER_MINUTE = int(os.getenv('RATE_LIMIT_PER_MINUTE', 60))
 RATE_LIMIT_PER_HOUR = int(os.getenv('RATE_LIMIT_PER_HOUR', 1000))
+RATE_LIMIT_USER_PER_MINUTE = int(os.getenv('RATE_LIMIT_USER_PER_MINUTE', 120))
+RATE_LIMIT_USER_PER_HOUR = int(os.getenv('RATE_LIMIT_USER_PER_HOUR', 3000))
+RATE_LIMIT_ROUTES = {
+    # path prefix -> {period in seconds: requests}, applied on top of the identity limits
+    '/api/auth/login': {60: 10, 3600: 100},
+    '/api/auth/register': {60: 5, 3600: 20},
+    '/api/auth/telegram-auth': {60: 10, 3600: 100},
+}
 
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 JSON_LOGS = os.getenv('JSON_LOGS', 'False') == 'True'
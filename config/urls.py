@@ -9,6 +9,7 @@ from apps.food.api import router as food_router
 from apps.workouts.api import router as workouts_router
 from apps.sleep.api import router as sleep_router
 from apps.goals.api import router as goals_router
+from apps.analytics.api import router as analytics_router
 from apps.telegram_bot.api import router as telegram_router
 
 api = NinjaAPI(
@@ -24,6 +25,7 @@ api.add_router("/food", food_router, tags=["Food & Nutrition"])
 api.add_router("/workouts", workouts_router, tags=["Workouts"])
 api.add_router("/sleep", sleep_router, tags=["Sleep"])
 api.add_router("/goals", goals_router, tags=["Goals"])
+api.add_router("/analytics", analytics_router, tags=["Analytics"])
 api.add_router("/telegram", telegram_router, tags=["Telegram"])
 
 urlpatterns = [
@@ -0,0 +1,21 @@
+from decimal import Decimal
+import pytest
+
+from apps.food.models import Food
+from apps.users.models import User
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username='tester', email='tester@example.com', password='secret-pass')
+
+
+@pytest.fixture
+def food(db):
+    return Food.objects.create(
+        name='Oatmeal',
+        calories=Decimal('370.00'),
+        protein=Decimal('13.00'),
+        carbs=Decimal('60.00'),
+        fat=Decimal('7.00'),
+    )
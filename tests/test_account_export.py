@@ -0,0 +1,72 @@
+from uuid import uuid4
+
+import pytest
+from asgiref.sync import async_to_sync
+from celery.result import AsyncResult
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory
+from ninja.testing import TestClient
+
+from apps.users import api, export
+from apps.users.api import download_account_export, router
+from apps.users.services import AuthService
+
+
+@pytest.fixture
+def client():
+    return TestClient(router)
+
+
+@pytest.fixture
+def headers(user):
+    return {'Authorization': f"Bearer {AuthService.create_tokens(user)['access_token']}"}
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = FileSystemStorage(location=tmp_path)
+    monkeypatch.setattr(api, 'export_storage', storage)
+    monkeypatch.setattr(export, 'export_storage', storage)
+    return storage
+
+
+def _finished(path):
+    task_id = uuid4().hex
+    AsyncResult(task_id).backend.store_result(task_id, path, 'SUCCESS')
+    return task_id
+
+
+async def _drain(response):
+    return b''.join([chunk async for chunk in response.streaming_content])
+
+
+def test_pending_export_reports_202(client, headers):
+    response = client.get(f'/export/{uuid4().hex}', headers=headers)
+
+    assert response.status_code == 202
+    assert response.json() == {'status': 'PENDING'}
+
+
+def test_finished_export_links_only_its_owner(client, headers, user):
+    response = client.get(f"/export/{_finished(f'{user.id}/lifemetrics.ndjson')}", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()['download_url'] == '/api/auth/export/files/lifemetrics.ndjson'
+
+    response = client.get(f"/export/{_finished(f'{user.id + 1}/lifemetrics.ndjson')}", headers=headers)
+
+    assert response.status_code == 404
+
+
+def test_export_file_download(client, headers, user, storage):
+    storage.save(f'{user.id}/lifemetrics.ndjson', ContentFile(b'{"id": 1}\n'))
+
+    assert client.get('/export/files/missing.ndjson', headers=headers).status_code == 404
+
+    request = RequestFactory().get('/export/files/lifemetrics.ndjson')
+    request.auth = user
+    response = download_account_export(request, 'lifemetrics.ndjson')
+
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert async_to_sync(_drain)(response) == b'{"id": 1}\n'
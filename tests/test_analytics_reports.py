@@ -0,0 +1,53 @@
+from datetime import time, timedelta
+from decimal import Decimal
+
+import orjson
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.analytics.services import AnalyticsService
+from apps.food.models import DailySummary
+from apps.sleep.models import SleepLog
+from apps.users.models import User, UserProfile
+
+
+@pytest.fixture
+def users(db):
+    users = [
+        User.objects.create_user(username=f'analyst{index}', email=f'analyst{index}@example.com', password='secret')
+        for index in range(3)
+    ]
+    yesterday = timezone.now().date() - timedelta(days=1)
+    for index, user in enumerate(users):
+        UserProfile.objects.create(
+            user=user, gender='F', height=Decimal('170'), weight=Decimal('70'), tdee=Decimal(2000 + index * 100),
+        )
+        for day in range(0, 200, 3):
+            DailySummary.objects.create(
+                user=user, date=yesterday - timedelta(days=day), total_calories=Decimal(1800 + day + index),
+                total_protein=Decimal('90'), weight=Decimal('70') - Decimal(day) / 100,
+            )
+            SleepLog.objects.create(
+                user=user, date=yesterday - timedelta(days=day), bedtime=time(23), wake_time=time(7),
+                duration_hours=Decimal(6 + day % 4), quality=1 + day % 5,
+            )
+    return users
+
+
+def test_warmed_reports_match_the_on_demand_ones(users, django_assert_num_queries):
+    # One query per series table and one for the TDEEs, whatever the number of users
+    with django_assert_num_queries(4):
+        warmed = AnalyticsService.warm_reports([user.id for user in users])
+    assert warmed == len(users) * len(AnalyticsService.DEFAULT_REPORT_DAYS)
+
+    for user in users:
+        for report, days in AnalyticsService.DEFAULT_REPORT_DAYS.items():
+            with django_assert_num_queries(0):
+                cached = AnalyticsService.get_report(user, report, days)
+
+            _, end_date = AnalyticsService._report_range(days)
+            cache.delete(AnalyticsService._cache_key(user.id, report, end_date, days))
+            fresh = AnalyticsService.get_report(user, report, days)
+
+            assert cached == orjson.loads(orjson.dumps(fresh))
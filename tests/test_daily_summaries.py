@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from apps.food.models import DailySummary, FoodLog, WaterLog
+from apps.food.services import DailySummaryService
+from apps.users.models import User, UserProfile
+
+
+@pytest.fixture
+def users(db):
+    return [
+        User.objects.create_user(username=f'user{index}', email=f'user{index}@example.com', password='secret-pass')
+        for index in range(3)
+    ]
+
+
+def _summaries(users, food, days):
+    summaries = []
+    for user in users:
+        for day in range(days):
+            summary_date = date(2024, 3, 1) + timedelta(days=day)
+            FoodLog.objects.bulk_create([
+                FoodLog(
+                    user=user, food=food, date=summary_date, meal_type=meal_type, serving_amount=Decimal('100'),
+                    calories=Decimal('370'), protein=Decimal('13'), carbs=Decimal('60'), fat=Decimal('7'),
+                )
+                for meal_type in ('breakfast', 'dinner')
+            ])
+            WaterLog.objects.create(user=user, date=summary_date, amount_ml=250)
+            summaries.append(DailySummary.objects.create(user=user, date=summary_date))
+    return summaries
+
+
+@pytest.mark.parametrize('days', [1, 10])
+def test_recalculate_summaries_runs_constant_queries(users, food, days, django_assert_num_queries):
+    summaries = _summaries(users, food, days)
+
+    # One aggregate over food logs, one over water logs and one bulk UPDATE, however many summaries
+    with django_assert_num_queries(3):
+        DailySummaryService.recalculate_summaries(summaries)
+
+    summary = DailySummary.objects.get(user=users[0], date=date(2024, 3, 1))
+    assert summary.total_calories == Decimal('740')
+    assert summary.breakfast_calories == Decimal('370')
+    assert summary.lunch_calories == 0
+    assert summary.water_intake_ml == 250
+
+
+def test_rollup_summaries_covers_food_only_and_water_only_days(users, food):
+    food_only, water_only, inactive = users
+    inactive.is_active = False
+    inactive.save(update_fields=['is_active'])
+    UserProfile.objects.create(
+        user=water_only, gender='F', height=Decimal('170'), weight=Decimal('60'), daily_calorie_target=1900,
+    )
+    summary_date = date(2024, 3, 1)
+    for user in (food_only, inactive):
+        FoodLog.objects.create(
+            user=user, food=food, date=summary_date, meal_type='lunch', serving_amount=Decimal('100'),
+            calories=Decimal('370'), protein=Decimal('13'), carbs=Decimal('60'), fat=Decimal('7'),
+        )
+    WaterLog.objects.create(user=water_only, date=summary_date, amount_ml=500)
+    DailySummary.objects.create(user=food_only, date=summary_date, water_intake_ml=100)
+
+    assert DailySummaryService.rollup_summaries(summary_date, 0, inactive.id) == 2
+
+    summaries = {summary.user_id: summary for summary in DailySummary.objects.filter(date=summary_date)}
+    assert set(summaries) == {food_only.id, water_only.id}
+    assert summaries[food_only.id].total_calories == Decimal('370')
+    assert summaries[food_only.id].lunch_calories == Decimal('370')
+    assert summaries[food_only.id].water_intake_ml == 0
+    assert summaries[water_only.id].total_calories == 0
+    assert summaries[water_only.id].water_intake_ml == 500
+    assert summaries[water_only.id].target_calories == 1900
@@ -0,0 +1,43 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from apps.food.autocomplete import PopularFoodsIndex
+from apps.food.models import Food
+from apps.telegram_bot import handlers
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = PopularFoodsIndex()
+    index.load([[1, 'Молоко', 'Простоквашино', '60.00', 40], [2, 'Молочный коктейль', '', '90.00', 12]], 1)
+    monkeypatch.setattr(handlers, 'popular_foods', index)
+    return index
+
+
+@pytest.mark.parametrize('query', ['', '   ', '\n'])
+def test_blank_query_suggests_nothing(index, query):
+    assert index.search(query) == []
+
+
+def test_prefix_matches_any_word_in_popularity_order(index):
+    assert [food.id for food in index.search('мол')] == [1, 2]
+    assert [food.id for food in index.search('ПРОСТ')] == [1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_short_suggestion_list_is_topped_up_from_the_database(index, user):
+    user.telegram_id = 555
+    user.save(update_fields=['telegram_id'])
+    nutrients = {'protein': Decimal('3'), 'carbs': Decimal('5'), 'fat': Decimal('3')}
+    popular = Food.objects.create(name='Milk', brand='Farm', calories=Decimal('60'), **nutrients)
+    own = Food.objects.create(
+        name='Milk homemade', calories=Decimal('64'), created_by=user, is_public=False, **nutrients,
+    )
+    index.load([[popular.id, 'Milk', 'Farm', '60.00', 40]], 2)
+
+    foods = asyncio.run(handlers._find_foods(555, 'milk', limit=10))
+
+    # Index hits keep their place, the database adds what the index doesn't have, without duplicates
+    assert [food.id for food in foods] == [popular.id, own.id]
@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from apps.food.autocomplete import VERSION_KEY
+from apps.food.importer import FoodImportService
+from apps.food.models import Food
+from apps.food.services import FoodService
+
+
+def _row(**overrides):
+    row = {
+        'name': 'Rye bread', 'brand': 'Bakery', 'calories': '250', 'protein': '8.5',
+        'carbs': '48', 'fat': '1.2', 'barcode': '4600000000001',
+    }
+    row.update(overrides)
+    return row
+
+
+def test_invalid_rows_are_skipped_without_aborting_batch(db):
+    rows = [
+        _row(),
+        _row(barcode='4600000000002', calories='not-a-number'),
+        _row(barcode='4600000000003', name=''),
+        _row(barcode='9' * 51),
+        _row(barcode='4600000000004', calories='123456.78'),
+        _row(barcode='4600000000005', protein='10000'),
+        _row(barcode='4600000000006', brand='x' * 256),
+        _row(barcode='', name='Loose apples', calories='52.345'),
+    ]
+
+    report = FoodImportService.import_rows(rows)
+
+    assert report['read'] == 8
+    assert report['invalid'] == 6
+    assert report['created'] == 2
+    assert report['duplicates'] == 0
+    assert Food.objects.get(name='Loose apples').calories == Decimal('52.35')
+
+
+def test_existing_duplicate_barcodes_update_lowest_id(db):
+    first, second = Food.objects.bulk_create([
+        Food(name='Old rye', calories=200, protein=7, carbs=40, fat=1, barcode='4600000000001'),
+        Food(name='Old rye copy', calories=200, protein=7, carbs=40, fat=1, barcode='4600000000001'),
+    ])
+
+    report = FoodImportService.import_rows([_row()])
+
+    assert report['updated'] == 1
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.name == 'Rye bread'
+    assert second.name == 'Old rye copy'
+
+
+def test_unverified_import_keeps_verified_flag(db):
+    verified = Food.objects.create(
+        name='Old rye', calories=200, protein=7, carbs=40, fat=1, barcode='4600000000001', is_verified=True,
+    )
+    unverified = Food.objects.create(name='Old oats', calories=350, protein=12, carbs=60, fat=6, barcode='4600000000002')
+
+    FoodImportService.import_rows([_row(), _row(barcode='4600000000002', name='Oats')])
+    verified.refresh_from_db()
+    assert verified.name == 'Rye bread'
+    assert verified.is_verified
+
+    FoodImportService.import_rows([_row(barcode='4600000000002', name='Oats')], verified=True)
+    unverified.refresh_from_db()
+    assert unverified.is_verified
+
+
+def test_reimporting_rows_without_barcode_updates_them(db):
+    rows = [_row(barcode='', name='Loose apples'), _row(barcode='', name='Loose apples', brand='')]
+
+    first = FoodImportService.import_rows(rows)
+    second = FoodImportService.import_rows([*rows, _row(barcode='', name='Loose apples', calories='60')])
+
+    assert (first['created'], first['updated']) == (2, 0)
+    assert (second['created'], second['updated'], second['duplicates']) == (0, 2, 1)
+    assert Food.objects.count() == 2
+    assert Food.objects.get(name='Loose apples', brand='Bakery').calories == Decimal('60')
+
+
+def test_malformed_lines_are_counted_and_skipped(db, tmp_path):
+    path = tmp_path / 'foods.jsonl'
+    path.write_bytes(b'{"name": "Rye", "calories": 250, "protein": 8, "carbs": 48, "fat": 1}\n'
+                     b'{"name": "Broken", "calories": \n'
+                     b'\n'
+                     b'["not", "an", "object"]\n'
+                     b'{"name": "Oats", "calories": 350, "protein": 12, "carbs": 60, "fat": 6}\n')
+
+    report = FoodImportService.import_rows(FoodImportService.read_file(str(path)))
+
+    assert report['read'] == 4
+    assert report['malformed'] == 2
+    assert report['created'] == 2
+
+
+def test_import_bumps_search_and_popular_foods_versions(db):
+    search_version = cache.get(FoodService.SEARCH_VERSION_KEY)
+    popular_version = cache.get(VERSION_KEY)
+
+    FoodImportService.import_rows([_row()])
+
+    assert cache.get(FoodService.SEARCH_VERSION_KEY) != search_version
+    assert cache.get(VERSION_KEY) != popular_version
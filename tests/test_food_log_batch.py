@@ -0,0 +1,61 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from ninja.testing import TestClient
+
+from apps.food.api import router
+from apps.food.models import DailySummary, Food, FoodLog
+from apps.users.models import User
+from apps.users.services import AuthService
+
+ITEMS = [
+    {'food_id': None, 'date': '2024-03-01', 'meal_type': 'breakfast', 'serving_amount': '150'},
+    {'food_id': None, 'date': '2024-03-01', 'meal_type': 'snack', 'serving_amount': '33.3', 'notes': 'half'},
+    {'food_id': None, 'date': '2024-03-02', 'meal_type': 'dinner', 'serving_amount': '80'},
+]
+NUTRIENTS = ('food_id', 'date', 'meal_type', 'serving_amount', 'calories', 'protein', 'carbs', 'fat', 'notes')
+TOTALS = ('date', 'total_calories', 'total_protein', 'total_carbs', 'total_fat', 'breakfast_calories', 'snack_calories')
+
+
+@pytest.fixture
+def client():
+    return TestClient(router)
+
+
+def _headers(user):
+    return {'Authorization': f"Bearer {AuthService.create_tokens(user)['access_token']}"}
+
+
+def _items(food):
+    return [{**item, 'food_id': food.id} for item in ITEMS]
+
+
+def test_batch_matches_single_item_logging(client, user, food):
+    batch_user = User.objects.create_user(username='batcher', email='batcher@example.com', password='secret-pass')
+
+    for item in _items(food):
+        assert client.post('/log', json=item, headers=_headers(user)).status_code == 200
+    response = client.post('/log/batch', json={'items': _items(food)}, headers=_headers(batch_user))
+
+    assert response.status_code == 200
+    assert len(response.json()) == len(ITEMS)
+    single = FoodLog.objects.filter(user=user).order_by('id').values_list(*NUTRIENTS)
+    batch = FoodLog.objects.filter(user=batch_user).order_by('id').values_list(*NUTRIENTS)
+    assert list(batch) == list(single)
+    single = DailySummary.objects.filter(user=user).order_by('date').values_list(*TOTALS)
+    batch = DailySummary.objects.filter(user=batch_user).order_by('date').values_list(*TOTALS)
+    assert list(batch) == list(single)
+    assert single[0][1] == Decimal('678.21')
+
+
+def test_batch_with_unknown_food_logs_nothing(client, user, food):
+    missing = Food.objects.order_by('-id').values_list('id', flat=True).first() + 1
+    items = [*_items(food), {**ITEMS[0], 'food_id': missing}]
+
+    response = client.post('/log/batch', json={'items': items}, headers=_headers(user))
+
+    assert response.status_code == 404
+    assert response.json() == {'error': f"Food not found: [{missing}]"}
+    assert not FoodLog.objects.filter(user=user).exists()
+    assert not DailySummary.objects.filter(user=user, date=date(2024, 3, 1)).exists()
@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import orjson
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from ninja.testing import TestClient
+
+from apps.food.api import NDJSON_MAX_DAYS, get_food_logs_range, router
+from apps.food.models import FoodLog
+from apps.food.services import FoodLogService
+from apps.users.services import AuthService
+
+
+@pytest.fixture
+def client():
+    return TestClient(router)
+
+
+@pytest.fixture
+def headers(user):
+    return {'Authorization': f"Bearer {AuthService.create_tokens(user)['access_token']}"}
+
+
+def _create_logs(user, food, days, per_day):
+    FoodLog.objects.bulk_create([
+        FoodLog(
+            user=user, food=food, date=date(2024, 1, 1) + timedelta(days=day), meal_type='lunch',
+            serving_amount=Decimal('100'), calories=Decimal('370'), protein=Decimal('13'),
+            carbs=Decimal('60'), fat=Decimal('7'),
+        )
+        for day in range(days)
+        for _ in range(per_day)
+    ])
+
+
+def test_keyset_pages_cover_range_in_date_id_order(user, food):
+    _create_logs(user, food, days=5, per_day=3)
+    start, end = date(2024, 1, 1), date(2024, 1, 5)
+
+    rows, after = [], None
+    while True:
+        # A page size that does not divide a day's logs forces cursors in the middle of a date
+        page = FoodLogService.get_logs_page(user, start, end, after, limit=4)
+        rows.extend(page)
+        if len(page) < 4:
+            break
+        after = (page[-1]['date'], page[-1]['id'])
+
+    keys = [(row['date'], row['id']) for row in rows]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 15
+    assert keys == list(FoodLog.objects.filter(user=user).order_by('date', 'id').values_list('date', 'id'))
+
+
+def test_keyset_page_respects_range_after_cursor(user, food):
+    _create_logs(user, food, days=5, per_day=2)
+    first = FoodLogService.get_logs_page(user, date(2024, 1, 2), date(2024, 1, 3), None, limit=3)
+
+    rest = FoodLogService.get_logs_page(
+        user, date(2024, 1, 2), date(2024, 1, 3), (first[-1]['date'], first[-1]['id']), limit=10,
+    )
+
+    assert len(first) + len(rest) == 4
+    assert all(date(2024, 1, 2) <= row['date'] <= date(2024, 1, 3) for row in first + rest)
+
+
+@pytest.mark.parametrize('params, error', [
+    ({'start': '2024-01-05', 'end': '2024-01-01'}, 'end must not be before start'),
+    ({'start': '2024-01-01', 'end': '2024-01-05', 'cursor': '***'}, 'Invalid cursor'),
+    (
+        {'start': '2023-01-01', 'end': '2024-01-02', 'format': 'ndjson'},
+        f'ndjson range must not exceed {NDJSON_MAX_DAYS} days',
+    ),
+])
+def test_range_rejects_bad_requests(client, headers, params, error):
+    response = client.get('/logs/range', query_params=params, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json() == {'error': error}
+
+
+async def _drain(response):
+    return [line async for line in response.streaming_content]
+
+
+def test_range_pages_with_cursor_and_ndjson_streams_the_rest(client, headers, user, food):
+    _create_logs(user, food, days=3, per_day=2)
+    params = {'start': '2024-01-01', 'end': '2024-01-03', 'limit': 4}
+
+    page = client.get('/logs/range', query_params=params, headers=headers).json()
+    assert len(page['items']) == 4
+    assert page['next_cursor']
+
+    request = RequestFactory().get('/logs/range')
+    request.auth = user
+    response = get_food_logs_range(
+        request, date(2024, 1, 1), date(2024, 1, 3), page['next_cursor'], limit=4, format='ndjson',
+    )
+    rows = [orjson.loads(line) for line in async_to_sync(_drain)(response)]
+
+    assert [row['id'] for row in page['items'] + rows] == list(
+        FoodLog.objects.filter(user=user).order_by('date', 'id').values_list('id', flat=True)
+    )
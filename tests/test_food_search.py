@@ -0,0 +1,53 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from apps.food import services
+from apps.food.models import Food
+from apps.food.services import FoodService
+
+
+@pytest.fixture(autouse=True)
+def fresh_generation(db):
+    FoodService.invalidate_search_cache()
+
+
+def _food(name, **fields):
+    return Food.objects.create(
+        name=name, calories=Decimal('60'), protein=Decimal('3'), carbs=Decimal('5'), fat=Decimal('3'), **fields,
+    )
+
+
+def test_private_foods_are_merged_into_public_results_by_rank(user):
+    verified = _food('Milk', is_verified=True)
+    infix = _food('Chocolate milk')
+    own = _food('Milk homemade', created_by=user, is_public=False)
+
+    foods = FoodService.search_foods('milk', user)
+
+    assert [food.id for food in foods] == [verified.id, own.id, infix.id]
+
+
+def test_waiting_search_serves_the_previous_result_instead_of_sleeping(monkeypatch):
+    token = uuid.uuid4().hex[:12]
+    kefir = _food(f'Kefir {token}')
+    assert [food.id for food in FoodService.search_foods(token)] == [kefir.id]
+
+    # A new generation is being computed by another worker
+    FoodService.invalidate_search_cache()
+    monkeypatch.setattr(services.cache, 'add', lambda *args, **kwargs: False)
+    monkeypatch.setattr(services.time, 'sleep', lambda seconds: pytest.fail("slept while a stale result existed"))
+
+    assert [food.id for food in FoodService.search_foods(token)] == [kefir.id]
+
+
+def test_waiting_search_without_a_previous_result_waits_once(monkeypatch):
+    token = uuid.uuid4().hex[:12]
+    kefir = _food(f'Kefir {token}')
+    sleeps = []
+    monkeypatch.setattr(services.cache, 'add', lambda *args, **kwargs: False)
+    monkeypatch.setattr(services.time, 'sleep', sleeps.append)
+
+    assert [food.id for food in FoodService.search_foods(token)] == [kefir.id]
+    assert sleeps == [FoodService.SEARCH_LOCK_WAIT]
@@ -0,0 +1,108 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from ninja.testing import TestClient
+
+from apps.food.models import DailySummary
+from apps.goals.api import router
+from apps.goals.models import Goal
+from apps.goals.services import GoalProgressService
+from apps.users.models import User, UserProfile
+from apps.users.services import AuthService
+
+TODAY = date(2024, 3, 31)
+
+
+@pytest.fixture
+def other_user(db):
+    return User.objects.create_user(username='other', email='other@example.com', password='secret-pass')
+
+
+def _goal(user, goal_type, target, target_date, start_date=date(2024, 3, 1), **fields):
+    return Goal.objects.create(
+        user=user, goal_type=goal_type, title=f'{goal_type} goal', target_value=Decimal(target),
+        start_date=start_date, target_date=target_date, **fields,
+    )
+
+
+def _summary(user, day, **fields):
+    DailySummary.objects.create(user=user, date=date(2024, 3, day), **fields)
+
+
+def test_goals_complete_fail_or_stay_active(user, other_user):
+    _summary(user, 1, weight=Decimal('90.0'), total_calories=Decimal('1700'), water_intake_ml=1000)
+    _summary(user, 20, weight=Decimal('79.5'), total_calories=Decimal('1900'), water_intake_ml=1200)
+    _summary(other_user, 1, weight=Decimal('90.0'))
+    _summary(other_user, 20, weight=Decimal('85.0'))
+
+    weight_reached = _goal(user, 'weight', '80', date(2024, 6, 1))
+    calories_kept = _goal(user, 'calories', '2000', date(2024, 3, 30))
+    water_missed = _goal(user, 'water', '2000', date(2024, 3, 30))
+    weight_pending = _goal(other_user, 'weight', '80', date(2024, 6, 1))
+
+    result = GoalProgressService.evaluate(None, None, TODAY)
+
+    assert result == {'evaluated': 4, 'completed': 2, 'failed': 1}
+    for goal in (weight_reached, calories_kept, water_missed, weight_pending):
+        goal.refresh_from_db()
+
+    assert (weight_reached.status, weight_reached.completed_date) == ('completed', TODAY)
+    assert weight_reached.current_value == Decimal('79.5')
+    assert (calories_kept.status, calories_kept.completed_date) == ('completed', TODAY)
+    assert calories_kept.current_value == Decimal('1800')
+    assert (water_missed.status, water_missed.completed_date) == ('failed', None)
+    assert weight_pending.status == 'active'
+    assert weight_pending.current_value == Decimal('85.0')
+
+
+def test_weight_gain_goal_completes_upwards(user):
+    _summary(user, 1, weight=Decimal('60.0'))
+    _summary(user, 25, weight=Decimal('65.2'))
+    goal = _goal(user, 'weight', '65', date(2024, 6, 1))
+
+    GoalProgressService.evaluate(None, None, TODAY)
+
+    goal.refresh_from_db()
+    assert goal.status == 'completed'
+
+
+@pytest.mark.parametrize('start_value', [Decimal('80.0'), None])
+def test_weight_direction_comes_from_the_weight_at_the_start(user, start_value):
+    _summary(user, 1, weight=Decimal('80.0'))
+    _summary(user, 5, weight=Decimal('74.0'))
+    goal = _goal(user, 'weight', '75', date(2024, 6, 1), start_date=date(2024, 3, 3), start_value=start_value)
+
+    GoalProgressService.evaluate(None, None, TODAY)
+
+    goal.refresh_from_db()
+    assert goal.status == 'completed'
+
+
+def test_created_goal_stores_the_start_weight(user):
+    UserProfile.objects.create(user=user, gender='F', height=Decimal('170'), weight=Decimal('82'))
+    _summary(user, 1, weight=Decimal('80.0'))
+    _summary(user, 20, weight=Decimal('78.0'))
+    headers = {'Authorization': f"Bearer {AuthService.create_tokens(user)['access_token']}"}
+    payload = {'goal_type': 'weight', 'title': 'Cut', 'target_value': '75', 'target_date': '2024-06-01'}
+
+    client = TestClient(router)
+    client.post('/create', json={**payload, 'start_date': '2024-03-10'}, headers=headers)
+    client.post('/create', json={**payload, 'start_date': '2024-02-01'}, headers=headers)
+    client.post('/create', json={**payload, 'goal_type': 'water', 'start_date': '2024-03-10'}, headers=headers)
+
+    assert list(Goal.objects.order_by('id').values_list('start_value', flat=True)) == [
+        Decimal('80.0'), Decimal('82'), None,
+    ]
+
+
+def test_closed_goals_are_not_reevaluated(user):
+    _summary(user, 1, water_intake_ml=500)
+    goal = _goal(user, 'water', '2000', date(2024, 3, 30))
+
+    GoalProgressService.evaluate(None, None, TODAY)
+    result = GoalProgressService.evaluate(None, None, date(2024, 4, 1))
+
+    goal.refresh_from_db()
+    assert goal.status == 'failed'
+    assert result == {'evaluated': 0, 'completed': 0, 'failed': 0}
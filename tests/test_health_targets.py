@@ -0,0 +1,32 @@
+import random
+from datetime import date
+from decimal import Decimal
+
+from apps.users.models import User, UserProfile
+from apps.users.services import HealthCalculationService
+
+TARGET_FIELDS = ('bmr', 'tdee', 'daily_calorie_target', 'daily_protein_target', 'daily_carbs_target', 'daily_fat_target')
+
+
+def test_bulk_recalculate_matches_per_profile_calculation(db):
+    rng = random.Random(42)
+    for index in range(200):
+        user = User.objects.create_user(username=f'user{index}', email=f'user{index}@example.com', password='secret-pass')
+        UserProfile.objects.create(
+            user=user,
+            gender=rng.choice('MFO'),
+            date_of_birth=rng.choice([None, date(rng.randint(1950, 2008), rng.randint(1, 12), rng.randint(1, 28))]),
+            height=Decimal(rng.randint(14000, 21000)) / 100,
+            weight=Decimal(rng.randint(4000, 16000)) / 100,
+            activity_level=rng.choice([level for level, _ in UserProfile.ACTIVITY_LEVEL_CHOICES]),
+            goal=rng.choice([goal for goal, _ in UserProfile.GOAL_CHOICES]),
+        )
+    
+    assert HealthCalculationService.bulk_recalculate(UserProfile.objects.all()) == 200
+    bulk = {profile.id: profile for profile in UserProfile.objects.all()}
+    
+    for profile in UserProfile.objects.all():
+        HealthCalculationService.calculate_and_update_profile(profile)
+        profile.refresh_from_db()
+        for field in TARGET_FIELDS:
+            assert getattr(bulk[profile.id], field) == getattr(profile, field), (profile.id, field)
@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from apps.food.models import DailySummary, NutritionRollup
+from apps.food.services import DailySummaryService
+
+START = date(2024, 1, 1)
+END = date(2024, 2, 20)
+
+
+@pytest.fixture
+def summaries(user):
+    days = (END - START).days + 1
+    return DailySummary.objects.bulk_create([
+        DailySummary(
+            user=user,
+            date=START + timedelta(days=day),
+            # Every fifth day is empty and must not count towards days_logged
+            total_calories=Decimal(0 if day % 5 == 0 else 1500 + day * 10),
+            total_protein=Decimal(80 + day),
+            total_carbs=Decimal(200 + day),
+            total_fat=Decimal(60 + day),
+        )
+        for day in range(days)
+    ])
+
+
+def _raw_stats(summaries, start, end):
+    logged = [s for s in summaries if start <= s.date <= end and s.total_calories > 0]
+    return {
+        'days_logged': len(logged),
+        'avg_calories': float(sum(s.total_calories for s in logged)) / len(logged),
+        'avg_protein': float(sum(s.total_protein for s in logged)) / len(logged),
+    }
+
+
+@pytest.mark.parametrize('start,end', [
+    (START, END),
+    (date(2024, 1, 3), date(2024, 2, 14)),
+    (date(2024, 2, 5), date(2024, 2, 18)),
+])
+def test_rollup_stats_match_daily_sums(user, summaries, start, end):
+    DailySummaryService.refresh_rollups(user.id - 1, user.id, START, END)
+    assert NutritionRollup.objects.filter(user=user).exists()
+    
+    stats = DailySummaryService.get_period_stats(user, start, end)
+    expected = _raw_stats(summaries, start, end)
+    
+    assert stats['days_logged'] == expected['days_logged']
+    assert stats['avg_calories'] == pytest.approx(expected['avg_calories'])
+    assert stats['avg_protein'] == pytest.approx(expected['avg_protein'])
+
+
+def test_missing_rollups_fall_back_to_daily_rows(user, summaries):
+    stats = DailySummaryService.get_period_stats(user, START, END)
+    expected = _raw_stats(summaries, START, END)
+    
+    assert not NutritionRollup.objects.filter(user=user).exists()
+    assert stats['days_logged'] == expected['days_logged']
+    assert stats['avg_calories'] == pytest.approx(expected['avg_calories'])
@@ -0,0 +1,105 @@
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from apps.core import ratelimit
+from apps.core.ratelimit import Limit, RateLimiter
+
+
+@pytest.fixture
+def key():
+    # Unique per test, so state left in a shared Redis never leaks between runs
+    return f"test:{uuid.uuid4().hex}"
+
+
+@pytest.fixture
+def redis_limiter():
+    try:
+        get_redis_connection('default').ping()
+    except RedisError:
+        pytest.skip("Redis is not reachable")
+    return RateLimiter()
+
+
+@pytest.fixture
+def local_limiter(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ratelimit, 'time', SimpleNamespace(monotonic=lambda: clock[0]))
+
+    limiter = RateLimiter()
+    limiter._degraded = True
+    limiter._redis_retry_at = float('inf')
+    limiter.clock = clock
+    return limiter
+
+
+def test_allows_up_to_limit_then_denies(redis_limiter, key):
+    limiter = redis_limiter
+    limit = Limit(key, 3, 60)
+
+    assert [limiter.hit([limit])[0] for _ in range(3)] == [True, True, True]
+
+    allowed, exceeded, retry_after = limiter.hit([limit])
+    assert not allowed
+    assert exceeded == limit
+    assert 0 < retry_after <= 20
+
+
+def test_denied_hit_consumes_no_other_limit(redis_limiter, key):
+    limiter = redis_limiter
+    minute = Limit(f"{key}:minute", 1, 60)
+    hour = Limit(f"{key}:hour", 3, 3600)
+
+    assert limiter.hit([minute, hour])[0]
+    allowed, exceeded, _ = limiter.hit([minute, hour])
+    assert not allowed
+    assert exceeded == minute
+
+    # Only the first hit counted against the hourly limit
+    assert [limiter.hit([hour])[0] for _ in range(3)] == [True, True, False]
+
+
+def test_local_fallback_frees_capacity_as_time_passes(local_limiter, key):
+    limit = Limit(key, 2, 60)
+
+    assert local_limiter.hit([limit])[0]
+    assert local_limiter.hit([limit])[0]
+    allowed, _, retry_after = local_limiter.hit([limit])
+    assert not allowed
+    assert retry_after == pytest.approx(30)
+
+    local_limiter.clock[0] += 30
+    assert local_limiter.hit([limit])[0]
+    assert not local_limiter.hit([limit])[0]
+
+
+def test_non_redis_cache_falls_back_to_local_limits(monkeypatch, key):
+    def no_redis(alias):
+        raise NotImplementedError("This backend does not support this feature")
+
+    monkeypatch.setattr(ratelimit, 'get_redis_connection', no_redis)
+    limiter = RateLimiter()
+    limit = Limit(key, 1, 60)
+
+    assert limiter.hit([limit])[0]
+    assert not limiter.hit([limit])[0]
+    assert limiter._degraded
+
+
+@pytest.mark.parametrize('limits', [1, 3])
+def test_redis_hit_throughput(redis_limiter, key, limits):
+    hits = 2000
+    batch = [Limit(f"{key}:{i}", hits, 60) for i in range(limits)]
+
+    started = time.perf_counter()
+    results = [redis_limiter.hit(batch)[0] for _ in range(hits)]
+    elapsed = time.perf_counter() - started
+
+    print(f"{limits} limit(s): {hits / elapsed:.0f} hits/s, {elapsed / hits * 1e6:.0f}us per hit")
+    assert all(results)
+    # One round trip per hit regardless of how many limits it checks
+    assert hits / elapsed > 1000
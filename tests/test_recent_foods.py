@@ -0,0 +1,26 @@
+from decimal import Decimal
+
+from django.utils import timezone
+from redis.exceptions import ConnectionError
+
+from apps.food import services
+from apps.food.models import FoodLog
+from apps.food.services import RecentFoodsService
+
+
+def test_recent_foods_come_from_the_history_when_redis_is_down(user, food, monkeypatch):
+    FoodLog.objects.create(
+        user=user, food=food, date=timezone.now().date(), meal_type='breakfast', serving_amount=Decimal('100'),
+        calories=Decimal('370'), protein=Decimal('13'), carbs=Decimal('60'), fat=Decimal('7'),
+    )
+    connections = []
+
+    def unreachable(alias):
+        connections.append(alias)
+        raise ConnectionError("Redis is down")
+
+    monkeypatch.setattr(services, 'get_redis_connection', unreachable)
+
+    assert RecentFoodsService.get_recent_foods(user) == [food]
+    # Only the read went to Redis; the rebuilt history is not written back while it is down
+    assert connections == ['default']
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from apps.telegram_bot.db import run_db
+from apps.users.models import User
+
+CALLS = 200
+QUERY_SECONDS = 0.01
+
+
+def _backend_connections():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_db_bounds_concurrent_queries(user):
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+    threads = set()
+
+    def query():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            threads.add(threading.get_ident())
+        try:
+            time.sleep(QUERY_SECONDS)
+            return User.objects.filter(pk=user.pk).count()
+        finally:
+            with lock:
+                active[0] -= 1
+
+    async def load():
+        return await asyncio.gather(*(run_db(query) for _ in range(CALLS)))
+
+    started = time.perf_counter()
+    results = asyncio.run(load())
+    elapsed = time.perf_counter() - started
+
+    print(f"{CALLS} calls in {elapsed * 1000:.0f}ms, peak {peak[0]} threads")
+    assert results == [1] * CALLS
+    assert peak[0] == settings.TELEGRAM_BOT_DB_THREADS
+    assert len(threads) <= settings.TELEGRAM_BOT_DB_THREADS
+    # Queries overlap across the pool instead of queueing on one thread
+    assert elapsed < CALLS * QUERY_SECONDS / 2
+    # Each pool thread keeps at most one connection, plus the test's own
+    assert _backend_connections() <= settings.TELEGRAM_BOT_DB_THREADS + 1
@@ -0,0 +1,131 @@
+import asyncio
+import uuid
+
+import orjson
+import pytest
+import redis.asyncio as aioredis
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from apps.telegram_bot import updates
+from apps.telegram_bot.updates import CONSUMER_GROUP, UpdateDispatcher, lease_for, stream_for
+
+
+@pytest.fixture(autouse=True)
+def streams(monkeypatch):
+    try:
+        get_redis_connection('default').ping()
+    except RedisError:
+        pytest.skip("Redis is not reachable")
+
+    prefix = f"test:{uuid.uuid4().hex}"
+    monkeypatch.setattr(updates, 'UPDATE_STREAM', prefix)
+    monkeypatch.setattr(updates, 'DEAD_LETTER_STREAM', f"{prefix}:dead")
+    monkeypatch.setattr(updates, 'RETRY_BACKOFF_SECONDS', 0)
+    monkeypatch.setattr(updates, 'LEASE_RETRY_SECONDS', 0.05)
+    return prefix
+
+
+class FakeDispatcher:
+
+    def __init__(self, failures=None, delay=0.0):
+        self.failures = failures or {}
+        self.delay = delay
+        self.seen = []
+        self.cancelled = []
+
+    async def feed_update(self, bot, update):
+        self.seen.append(update.update_id)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(update.update_id)
+            raise
+        if self.failures.get(update.update_id, 0) > 0:
+            self.failures[update.update_id] -= 1
+            raise RuntimeError("handler failed")
+
+
+def _update(update_id, chat_id=7):
+    return orjson.dumps({
+        'update_id': update_id,
+        'message': {'message_id': update_id, 'date': 0, 'chat': {'id': chat_id, 'type': 'private'}, 'text': 'hi'},
+    })
+
+
+async def _run(dp, raws, until, timeout=5.0):
+    client = aioredis.from_url(settings.REDIS_URL)
+    for raw in raws:
+        await client.xadd(stream_for(0), {'update': raw})
+
+    dispatcher = UpdateDispatcher(None, dp, client, [0])
+    consumer = asyncio.create_task(dispatcher._consume(0))
+    try:
+        async with asyncio.timeout(timeout):
+            while not await until(client):
+                await asyncio.sleep(0.02)
+        return client, await client.xpending(stream_for(0), CONSUMER_GROUP)
+    finally:
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        await client.aclose()
+
+
+def test_failed_update_is_retried_before_the_next_one():
+    dp = FakeDispatcher(failures={1: 2})
+
+    async def done(client):
+        return dp.seen[-1:] == [2]
+
+    _, pending = asyncio.run(_run(dp, [_update(1), _update(2)], done))
+
+    assert dp.seen == [1, 1, 1, 2]
+    assert pending['pending'] == 0
+
+
+def test_update_is_dead_lettered_after_max_deliveries(streams):
+    dp = FakeDispatcher(failures={1: updates.MAX_DELIVERIES + 1})
+
+    async def done(client):
+        return 2 in dp.seen
+
+    async def scenario():
+        await _run(dp, [_update(1), _update(2)], done)
+        client = aioredis.from_url(settings.REDIS_URL)
+        try:
+            return await client.xlen(f"{streams}:dead")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(scenario()) == 1
+    assert dp.seen == [1] * updates.MAX_DELIVERIES + [2]
+
+
+def test_lease_is_renewed_while_a_slow_update_runs(monkeypatch):
+    monkeypatch.setattr(updates, 'SHARD_LEASE_MS', 300)
+    dp = FakeDispatcher(delay=1.0)
+
+    async def done(client):
+        return dp.seen == [1] and (await client.xpending(stream_for(0), CONSUMER_GROUP))['pending'] == 0
+
+    asyncio.run(_run(dp, [_update(1)], done))
+
+    assert dp.cancelled == []
+
+
+def test_lost_lease_stops_the_update_in_flight(monkeypatch):
+    monkeypatch.setattr(updates, 'SHARD_LEASE_MS', 300)
+    dp = FakeDispatcher(delay=5.0)
+
+    async def stolen(client):
+        if dp.seen and not await client.exists(f"{lease_for(0)}:stolen"):
+            await client.set(lease_for(0), 'other-process', px=10000)
+            await client.set(f"{lease_for(0)}:stolen", 1, px=10000)
+        return bool(dp.cancelled)
+
+    _, pending = asyncio.run(_run(dp, [_update(1)], stolen, timeout=2.0))
+
+    # Stopped by the lease keeper before it could be acked, so the next owner delivers it again
+    assert dp.cancelled == [1]
+    assert pending['pending'] == 1
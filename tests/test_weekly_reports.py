@@ -0,0 +1,65 @@
+from datetime import date, time
+from decimal import Decimal
+
+import pytest
+
+from apps.core.reports import WeeklyReportService
+from apps.food.models import DailySummary
+from apps.sleep.models import SleepLog
+from apps.users.models import User, UserProfile
+from apps.workouts.models import Workout, WorkoutLog
+
+WEEK_START = date(2024, 3, 4)
+WEEK_END = date(2024, 3, 10)
+
+
+@pytest.fixture
+def recipient(db):
+    user = User.objects.create_user(
+        username='reporter', email='reporter@example.com', password='secret-pass',
+        telegram_id=1001, telegram_first_name='Anna',
+    )
+    UserProfile.objects.create(user=user, gender='F', height=Decimal('170'), weight=Decimal('65'))
+    return user
+
+
+def _summary(user, day, calories, target=2000):
+    return DailySummary.objects.create(
+        user=user, date=date(2024, 3, day), total_calories=Decimal(calories), total_protein=Decimal('100'),
+        total_carbs=Decimal('200'), total_fat=Decimal('60'), target_calories=target, water_intake_ml=1500,
+    )
+
+
+def test_weekly_report_renders_from_collected_rows(recipient):
+    _summary(recipient, 4, '1900')
+    _summary(recipient, 5, '2150', target=2100)
+    _summary(recipient, 6, '2600')
+    _summary(recipient, 3, '1000')
+    workout = Workout.objects.create(name='Run', category='cardio', calories_per_hour=600)
+    WorkoutLog.objects.create(user=recipient, workout=workout, date=WEEK_START, duration_minutes=30, calories_burned=300)
+    SleepLog.objects.create(
+        user=recipient, date=WEEK_START, bedtime=time(23), wake_time=time(7), duration_hours=Decimal('8'), quality=4,
+    )
+
+    reports = WeeklyReportService.collect(None, None, WEEK_START, WEEK_END)
+    nutrition = reports[recipient.id]['nutrition']
+
+    assert nutrition['days_logged'] == 3
+    assert nutrition['days_on_target'] == 2
+
+    messages = WeeklyReportService.build_messages(reports, WEEK_START, WEEK_END)
+
+    assert len(messages) == 1
+    telegram_id, text = messages[0]
+    assert telegram_id == 1001
+    assert "Anna" in text
+    assert "3/7 дн., в среднем 2217 ккал" in text
+    assert "Норма 2033 ккал: в пределах ±10% — 2 дн." in text
+    assert "Тренировки: 1, 30 мин, 300 ккал" in text
+    assert "Сон: в среднем 8.0 ч, качество 4.0/5" in text
+
+
+def test_recipients_without_activity_get_no_message(recipient):
+    reports = WeeklyReportService.collect(None, None, WEEK_START, WEEK_END)
+
+    assert WeeklyReportService.build_messages(reports, WEEK_START, WEEK_END) == []